@@ -0,0 +1,289 @@
+"""Benchmark harness with JSON baselines.
+
+Run from ``PythonProcessor``:
+
+    python -m benchmarks.runner --sizes small,medium --output benchmarks/results.json
+    python -m benchmarks.runner --baseline benchmarks/baselines/reference.json
+
+Each case runs once untimed as a warm-up and is then timed ``repeat`` times; every run
+gets a fresh copy of the prepared mesh, so in-place stages and trimesh caches do not
+carry over between runs. The median is compared against the baseline and cases slower than
+``1 + tolerance`` times the baseline, by more than ``MIN_SLOWDOWN_SECONDS``, are
+reported as regressions (non-zero exit code).
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import click
+import trimesh
+from loguru import logger
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks.synthetic import make_building_ifc, make_building_mesh  # noqa: E402
+from bimto3dprint.pipeline import select_exporter  # noqa: E402
+from bimto3dprint.processors.mesh_optimizer import THICKEN_VOXELS_PER_WALL, MeshOptimizer  # noqa: E402
+from bimto3dprint.processors.planar_remesh import PLANAR_TOLERANCE_VOXELS, remesh_planar_regions  # noqa: E402
+from bimto3dprint.processors.shell_extractor import ShellExtractor  # noqa: E402
+from bimto3dprint.processors.thickness import ThicknessAnalyzer  # noqa: E402
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid  # noqa: E402
+
+RESULTS_VERSION = 1
+DEFAULT_TOLERANCE = 0.5
+MIN_SLOWDOWN_SECONDS = 0.01
+"""Slowdowns shorter than this are timer noise, whatever their ratio."""
+PRINT_SCALE = 10.0
+"""Meters to millimeters at 1:100, the scale the pipeline prints buildings at."""
+THICKEN_PITCH = 2.0 / THICKEN_VOXELS_PER_WALL
+"""Voxel pitch in mm that wall thickening uses for a 2 mm minimum wall."""
+
+SIZES: dict[str, tuple[int, int]] = {
+    "small": (2, 4),
+    "medium": (4, 16),
+    "large": (8, 36),
+}
+
+
+@dataclass
+class BenchmarkCase:
+    """Named benchmark: ``setup`` builds the input, ``run`` is timed."""
+
+    name: str
+    setup: Callable[[str], Any]
+    run: Callable[[Any], Any]
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one case at one size."""
+
+    name: str
+    size: str
+    median_seconds: float | None = None
+    min_seconds: float | None = None
+    runs: list[float] = field(default_factory=list)
+    faces: int | None = None
+    error: str | None = None
+
+
+def building_mesh(size: str) -> trimesh.Trimesh:
+    """Synthetic building mesh at print scale (mm, 1:100)."""
+    floors, rooms = SIZES[size]
+    mesh = make_building_mesh(floors, rooms)
+    mesh.apply_scale(PRINT_SCALE)
+    return mesh
+
+
+def envelope_mesh(size: str) -> trimesh.Trimesh:
+    """Closed envelope of the synthetic building, as seen by the optimizer stages."""
+    floors, rooms = SIZES[size]
+    mesh = make_building_mesh(floors, rooms)
+    envelope = ShellExtractor()._extract_envelope(mesh, {"voxel_pitch": 0.25})
+    envelope.apply_scale(PRINT_SCALE / envelope.extents.max() * mesh.extents.max())
+    return envelope
+
+
+def voxel_surface(size: str) -> trimesh.Trimesh:
+    """Raw marching-cubes surface of the synthetic building at the thickening pitch."""
+    grid = SparseVoxelGrid(THICKEN_PITCH)
+    grid.add_mesh(building_mesh(size))
+    return grid.envelope()
+
+
+@functools.lru_cache(maxsize=None)
+def _run_directory() -> Path:
+    # Generated inputs live only for this run, so a changed generator is never masked by a stale file.
+    directory = Path(tempfile.mkdtemp(prefix="bimto3dprint_bench_"))
+    atexit.register(shutil.rmtree, directory, ignore_errors=True)
+    return directory
+
+
+def _ifc_path(size: str) -> Path:
+    floors, rooms = SIZES[size]
+    path = _run_directory() / f"building_{floors}x{rooms}.ifc"
+    if not path.exists():
+        make_building_ifc(floors, rooms).write(str(path))
+    return path
+
+
+def _fresh(payload: Any) -> Any:
+    """Copy of a mesh payload without trimesh caches; other payloads are reused."""
+    return payload.copy() if isinstance(payload, trimesh.Trimesh) else payload
+
+
+def _export(fmt: str) -> BenchmarkCase:
+    def run(mesh: trimesh.Trimesh) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            select_exporter(fmt).export(mesh, Path(directory) / f"bench.{fmt}", metadata={})
+
+    return BenchmarkCase(f"export_{fmt}", envelope_mesh, run)
+
+
+CASES: list[BenchmarkCase] = [
+    BenchmarkCase(
+        "extract_from_ifc",
+        _ifc_path,
+        lambda path: ShellExtractor().extract_from_ifc(path, {"method": "convex_hull"}),
+    ),
+    BenchmarkCase(
+        "extract_envelope",
+        building_mesh,
+        lambda mesh: ShellExtractor()._extract_envelope(mesh, {"voxel_pitch": 2.5}),
+    ),
+    BenchmarkCase("thicken_walls", envelope_mesh, lambda mesh: MeshOptimizer().thicken_walls(mesh, 2.0)),
+    BenchmarkCase(
+        "remesh_planar_regions",
+        voxel_surface,
+        lambda mesh: remesh_planar_regions(mesh, PLANAR_TOLERANCE_VOXELS * THICKEN_PITCH),
+    ),
+    BenchmarkCase("smooth_surface", envelope_mesh, lambda mesh: MeshOptimizer().smooth_surface(mesh)),
+    BenchmarkCase("validate_for_printing", envelope_mesh, lambda mesh: MeshOptimizer().validate_for_printing(mesh)),
+    BenchmarkCase("thickness_bvh", envelope_mesh, lambda mesh: ThicknessAnalyzer(engine="numpy").analyze(mesh)),
+    _export("stl"),
+    _export("obj"),
+    # No FBX case: trimesh has no FBX writer, so it would only ever record an error.
+    _export("3mf"),
+    _export("glb"),
+]
+
+
+def run_benchmarks(sizes: list[str], repeat: int = 3, names: list[str] | None = None) -> list[BenchmarkResult]:
+    """Run benchmark cases.
+
+    Args:
+        sizes: Size names from ``SIZES``.
+        repeat: Timed runs per case.
+        names: Optional subset of case names.
+
+    Returns:
+        One result per case and size; failing cases carry ``error`` instead of timings.
+    """
+    results: list[BenchmarkResult] = []
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        for size in sizes:
+            result = BenchmarkResult(case.name, size)
+            try:
+                payload = case.setup(size)
+                if isinstance(payload, trimesh.Trimesh):
+                    result.faces = len(payload.faces)
+                # Untimed warm-up so lazy imports and first-call caches do not skew a single run.
+                case.run(_fresh(payload))
+                for _ in range(repeat):
+                    run_input = _fresh(payload)
+                    started = time.perf_counter()
+                    case.run(run_input)
+                    result.runs.append(round(time.perf_counter() - started, 6))
+            except Exception as exc:  # noqa: BLE001 - a failing case must not hide the others
+                result.error = f"{type(exc).__name__}: {exc}"
+                logger.warning("Benchmark {}[{}] failed: {}", case.name, size, result.error)
+            if result.runs:
+                result.median_seconds = round(statistics.median(result.runs), 6)
+                result.min_seconds = min(result.runs)
+            results.append(result)
+            logger.info("Benchmark {}[{}]: median={}s", case.name, size, result.median_seconds)
+    return results
+
+
+def compare_to_baseline(
+    results: list[BenchmarkResult],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_slowdown: float = MIN_SLOWDOWN_SECONDS,
+) -> list[str]:
+    """Return messages for cases slower than the baseline by more than ``tolerance`` and ``min_slowdown`` seconds."""
+    reference = {(item["name"], item["size"]): item for item in baseline.get("results", [])}
+    regressions: list[str] = []
+    for result in results:
+        base = reference.get((result.name, result.size))
+        if base is None or base.get("median_seconds") is None or result.median_seconds is None:
+            continue
+        ratio = result.median_seconds / max(base["median_seconds"], 1e-9)
+        if ratio > 1.0 + tolerance and result.median_seconds - base["median_seconds"] > min_slowdown:
+            regressions.append(
+                f"{result.name}[{result.size}]: {result.median_seconds:.4f}s vs "
+                f"baseline {base['median_seconds']:.4f}s (x{ratio:.2f})"
+            )
+    return regressions
+
+
+def results_to_dict(results: list[BenchmarkResult]) -> dict[str, Any]:
+    """Serialize results with machine information."""
+    return {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "trimesh": trimesh.__version__,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+@click.command()
+@click.option("--sizes", default="small,medium", show_default=True, help="Comma-separated sizes: small,medium,large.")
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--case", "names", multiple=True, help="Run only the named case (repeatable).")
+@click.option("--output", type=click.Path(path_type=Path, dir_okay=False), default=None, help="Write results JSON.")
+@click.option("--baseline", type=click.Path(path_type=Path, exists=True, dir_okay=False), default=None)
+@click.option("--tolerance", type=float, default=DEFAULT_TOLERANCE, show_default=True)
+def main(
+    sizes: str,
+    repeat: int,
+    names: tuple[str, ...],
+    output: Path | None,
+    baseline: Path | None,
+    tolerance: float,
+) -> None:
+    """Run the pipeline benchmarks and compare with a JSON baseline."""
+    size_list = [size.strip() for size in sizes.split(",") if size.strip()]
+    unknown = [size for size in size_list if size not in SIZES]
+    if unknown:
+        raise click.UsageError(f"Unknown sizes: {', '.join(unknown)}")
+    if repeat <= 0:
+        raise click.UsageError("--repeat must be positive")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    results = run_benchmarks(size_list, repeat=repeat, names=list(names) or None)
+    for result in results:
+        timing = f"{result.median_seconds:.4f}s" if result.median_seconds is not None else result.error
+        click.echo(f"{result.name:<24} {result.size:<8} {timing}")
+
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results_to_dict(results), indent=2), encoding="utf-8")
+        click.echo(f"Saved results: {output}")
+
+    if baseline is not None:
+        regressions = compare_to_baseline(
+            results,
+            json.loads(baseline.read_text(encoding="utf-8")),
+            tolerance=tolerance,
+        )
+        for message in regressions:
+            click.echo(f"REGRESSION {message}", err=True)
+        if regressions:
+            raise SystemExit(1)
+        click.echo("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Parametric synthetic buildings for benchmarks.
+
+Example:
+    mesh = make_building_mesh(floors=4, rooms_per_floor=9)
+    model = make_building_ifc(floors=2, rooms_per_floor=4)
+    model.write("building.ifc")
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import ifcopenshell
+import ifcopenshell.api
+import numpy as np
+import trimesh
+
+
+@dataclass(frozen=True)
+class BuildingSpec:
+    """Dimensions of a synthetic building in meters.
+
+    Rooms are laid out on a square grid per floor; every room gets four walls
+    and each floor gets a slab, so geometry size grows with floors * rooms.
+    """
+
+    floors: int
+    rooms_per_floor: int
+    room_size: float = 4.0
+    floor_height: float = 3.0
+    wall_thickness: float = 0.2
+    slab_thickness: float = 0.25
+
+    @property
+    def grid(self) -> int:
+        """Rooms per side of the floor grid."""
+        return max(int(math.ceil(math.sqrt(self.rooms_per_floor))), 1)
+
+    def rooms(self) -> list[tuple[int, int, int]]:
+        """Return (floor, row, column) of every room."""
+        return [
+            (floor, index // self.grid, index % self.grid)
+            for floor in range(self.floors)
+            for index in range(self.rooms_per_floor)
+        ]
+
+
+def make_building_mesh(floors: int, rooms_per_floor: int, subdivisions: int = 0) -> trimesh.Trimesh:
+    """Build a multi-floor building of wall and slab boxes.
+
+    Args:
+        floors: Number of floors.
+        rooms_per_floor: Rooms per floor.
+        subdivisions: Extra midpoint subdivisions per box to increase face counts.
+
+    Returns:
+        Concatenated mesh in meters (unwelded boxes, like tessellated IFC elements).
+    """
+    spec = BuildingSpec(floors, rooms_per_floor)
+    boxes: list[trimesh.Trimesh] = []
+    for floor, row, column in spec.rooms():
+        for extents, center in _room_boxes(spec, floor, row, column):
+            box = trimesh.creation.box(extents=extents)
+            for _ in range(subdivisions):
+                box = box.subdivide()
+            box.apply_translation(center)
+            boxes.append(box)
+
+    side = spec.grid * spec.room_size
+    for floor in range(floors + 1):
+        slab = trimesh.creation.box(extents=(side, side, spec.slab_thickness))
+        slab.apply_translation((side / 2, side / 2, floor * spec.floor_height))
+        boxes.append(slab)
+    return trimesh.util.concatenate(boxes)
+
+
+def make_building_ifc(floors: int, rooms_per_floor: int) -> ifcopenshell.file:
+    """Build an IFC4 model with one storey per floor and extruded walls and slabs.
+
+    Args:
+        floors: Number of floors.
+        rooms_per_floor: Rooms per floor.
+
+    Returns:
+        In-memory IFC model.
+    """
+    spec = BuildingSpec(floors, rooms_per_floor)
+    model = ifcopenshell.api.run("project.create_file", version="IFC4")
+    project = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcProject", name="Synthetic")
+    ifcopenshell.api.run("unit.assign_unit", model)
+    context = ifcopenshell.api.run("context.add_context", model, context_type="Model")
+    body = ifcopenshell.api.run(
+        "context.add_context",
+        model,
+        context_type="Model",
+        context_identifier="Body",
+        target_view="MODEL_VIEW",
+        parent=context,
+    )
+    building = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuilding", name="Building")
+    ifcopenshell.api.run("aggregate.assign_object", model, relating_object=project, products=[building])
+
+    side = spec.grid * spec.room_size
+    storeys = []
+    for floor in range(floors):
+        storey = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuildingStorey", name=f"L{floor}")
+        ifcopenshell.api.run("aggregate.assign_object", model, relating_object=building, products=[storey])
+        storeys.append(storey)
+
+        slab = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcSlab", name=f"S{floor}")
+        profile = model.createIfcRectangleProfileDef("AREA", None, None, side, side)
+        representation = ifcopenshell.api.run(
+            "geometry.add_profile_representation",
+            model,
+            context=body,
+            profile=profile,
+            depth=spec.slab_thickness,
+        )
+        _place(model, slab, representation, (side / 2, side / 2, floor * spec.floor_height), storey)
+
+    for floor, row, column in spec.rooms():
+        for index, (extents, center) in enumerate(_room_boxes(spec, floor, row, column)):
+            wall = ifcopenshell.api.run(
+                "root.create_entity",
+                model,
+                ifc_class="IfcWall",
+                name=f"W{floor}-{row}-{column}-{index}",
+            )
+            profile = model.createIfcRectangleProfileDef("AREA", None, None, extents[0], extents[1])
+            representation = ifcopenshell.api.run(
+                "geometry.add_profile_representation",
+                model,
+                context=body,
+                profile=profile,
+                depth=extents[2],
+            )
+            origin = (center[0], center[1], center[2] - extents[2] / 2)
+            _place(model, wall, representation, origin, storeys[floor])
+    return model
+
+
+def _room_boxes(
+    spec: BuildingSpec,
+    floor: int,
+    row: int,
+    column: int,
+) -> list[tuple[tuple[float, float, float], tuple[float, float, float]]]:
+    size = spec.room_size
+    height = spec.floor_height - spec.slab_thickness
+    base = floor * spec.floor_height + spec.slab_thickness / 2 + height / 2
+    x0, y0 = column * size, row * size
+    thickness = spec.wall_thickness
+    return [
+        ((size, thickness, height), (x0 + size / 2, y0, base)),
+        ((size, thickness, height), (x0 + size / 2, y0 + size, base)),
+        ((thickness, size, height), (x0, y0 + size / 2, base)),
+        ((thickness, size, height), (x0 + size, y0 + size / 2, base)),
+    ]
+
+
+def _place(
+    model: ifcopenshell.file,
+    product: ifcopenshell.entity_instance,
+    representation: ifcopenshell.entity_instance,
+    origin: tuple[float, float, float],
+    storey: ifcopenshell.entity_instance,
+) -> None:
+    ifcopenshell.api.run("geometry.assign_representation", model, product=product, representation=representation)
+    matrix = np.eye(4)
+    matrix[:3, 3] = origin
+    ifcopenshell.api.run("geometry.edit_object_placement", model, product=product, matrix=matrix)
+    ifcopenshell.api.run("spatial.assign_container", model, relating_structure=storey, products=[product])
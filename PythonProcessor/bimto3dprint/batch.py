@@ -0,0 +1,308 @@
+"""Batch processing of many IFC files on a process pool.
+
+Example:
+    from pathlib import Path
+
+    jobs = collect_jobs(Path("models"), Path("out"), ProcessOptions())
+    summary = BatchRunner(workers=4).run(jobs)
+    write_summary(summary, Path("out/batch_report.json"))
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from bimto3dprint.pipeline import ProcessOptions, run_pipeline
+from bimto3dprint.utils.logger import get_logger
+
+DEFAULT_MEMORY_FACTOR = 12.0
+MIN_JOB_MEMORY_MB = 256.0
+DEFAULT_MEMORY_FRACTION = 0.8
+
+
+@dataclass
+class BatchJob:
+    """Single IFC file to process with its resolved options."""
+
+    ifc_file: Path
+    output_path: Path
+    options: ProcessOptions
+
+    @property
+    def estimated_memory_mb(self) -> float:
+        """Rough peak memory estimate used for admission control."""
+        size_mb = self.ifc_file.stat().st_size / 1024 / 1024 if self.ifc_file.exists() else 0.0
+        return max(size_mb * DEFAULT_MEMORY_FACTOR, MIN_JOB_MEMORY_MB)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch job."""
+
+    ifc_file: str
+    output_path: str
+    status: str
+    seconds: float
+    error: str | None = None
+    report: dict[str, Any] | None = None
+
+
+@dataclass
+class BatchSummary:
+    """Aggregated results of a batch run."""
+
+    results: list[BatchResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        """Number of failed jobs."""
+        return sum(1 for result in self.results if result.status != "ok")
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the summary for the JSON report."""
+        return {
+            "total": len(self.results),
+            "succeeded": len(self.results) - self.failed,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+            "files": [asdict(result) for result in self.results],
+        }
+
+
+def collect_jobs(source: Path, output_dir: Path, options: ProcessOptions) -> list[BatchJob]:
+    """Build batch jobs from a directory of IFC files or a JSON manifest.
+
+    A manifest has the form ``{"defaults": {...}, "files": [{"ifc": "a.ifc", "output": "a.stl", ...}]}``.
+    Keys other than ``ifc`` and ``output`` override processing options for that file;
+    relative paths are resolved against the manifest directory.
+
+    Args:
+        source: Directory with ``*.ifc`` files or manifest JSON path.
+        output_dir: Directory for outputs without an explicit path.
+        options: Base processing options.
+
+    Returns:
+        Jobs in manifest or sorted file order.
+
+    Raises:
+        FileNotFoundError: If the source does not exist.
+        ValueError: If the manifest is malformed.
+    """
+    source = Path(source)
+    output_dir = Path(output_dir)
+    if source.is_dir():
+        files = sorted(source.glob("*.ifc")) + sorted(source.glob("*.IFC"))
+        return [
+            BatchJob(path, output_dir / f"{path.stem}.{options.output_format.lower()}", options)
+            for path in dict.fromkeys(files)
+        ]
+    if not source.is_file():
+        raise FileNotFoundError(f"Batch source not found: {source}")
+
+    with source.open("r", encoding="utf-8") as file:
+        manifest = json.load(file)
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("files"), list):
+        raise ValueError("Batch manifest must be a JSON object with a 'files' list.")
+
+    base_options = options.replace(manifest.get("defaults", {}))
+    jobs: list[BatchJob] = []
+    for entry in manifest["files"]:
+        if isinstance(entry, str):
+            entry = {"ifc": entry}
+        if not isinstance(entry, dict) or "ifc" not in entry:
+            raise ValueError(f"Batch manifest entry must define 'ifc': {entry}")
+
+        overrides = {key: value for key, value in entry.items() if key not in {"ifc", "output"}}
+        job_options = base_options.replace(overrides)
+        ifc_file = _resolve(source.parent, entry["ifc"])
+        if "output" in entry:
+            output_path = _resolve(source.parent, entry["output"])
+        else:
+            output_path = output_dir / f"{ifc_file.stem}.{job_options.output_format.lower()}"
+        jobs.append(BatchJob(ifc_file, output_path, job_options))
+    return jobs
+
+
+def write_summary(summary: BatchSummary, report_path: Path) -> None:
+    """Write the batch summary JSON report.
+
+    Args:
+        summary: Batch summary.
+        report_path: Output JSON path.
+    """
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with report_path.open("w", encoding="utf-8") as file:
+        json.dump(summary.to_dict(), file, indent=2, ensure_ascii=False, default=str)
+    logger.info("Saved batch report: {}", report_path)
+
+
+@dataclass
+class BatchRunner:
+    """Run batch jobs on a process pool with memory-aware admission."""
+
+    workers: int = 2
+    memory_budget_mb: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        if self.memory_budget_mb is not None and self.memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb must be positive.")
+
+    def run(self, jobs: list[BatchJob]) -> BatchSummary:
+        """Process all jobs; failures are recorded per file and never stop the batch.
+
+        Args:
+            jobs: Jobs to run.
+
+        Returns:
+            Batch summary with results in job order.
+        """
+        started = time.perf_counter()
+        budget = self.memory_budget_mb
+        if budget is None:
+            available = _available_memory_mb()
+            budget = None if available is None else available * DEFAULT_MEMORY_FRACTION
+        logger.info(
+            "Starting batch: jobs={}, workers={}, memory_budget_mb={}",
+            len(jobs),
+            self.workers,
+            "unlimited" if budget is None else round(budget),
+        )
+
+        results: dict[int, BatchResult] = {}
+        pending = deque(enumerate(jobs))
+        # Jobs that were in the pool when a worker crashed; each is rerun alone so only the culprit fails.
+        suspects: deque[tuple[int, BatchJob]] = deque()
+        running: dict[Future, tuple[int, BatchJob, float, bool]] = {}
+
+        def crashed(index: int, job: BatchJob, isolated: bool) -> None:
+            if isolated:
+                results[index] = _failed_result(job, "Worker process crashed (possibly out of memory)")
+                logger.info("Finished {}: {}", job.ifc_file, results[index].status)
+            else:
+                logger.warning("Worker pool broke while {} was running; retrying it alone", job.ifc_file)
+                suspects.append((index, job))
+
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        try:
+            while pending or suspects or running:
+                broken = False
+                while True:
+                    isolated = bool(suspects)
+                    queue = suspects if isolated else pending
+                    if (isolated and running) or not queue or len(running) >= self.workers:
+                        break
+                    index, job = queue[0]
+                    estimate = job.estimated_memory_mb
+                    reserved = sum(item[2] for item in running.values())
+                    if running and budget is not None and reserved + estimate > budget:
+                        break
+                    queue.popleft()
+                    logger.info("Submitting {} (estimated {:.0f} MB)", job.ifc_file, estimate)
+                    try:
+                        running[executor.submit(run_job, job)] = (index, job, estimate, isolated)
+                    except BrokenProcessPool:
+                        queue.appendleft((index, job))
+                        broken = True
+                        break
+
+                if not broken:
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, job, _, isolated = running.pop(future)
+                        try:
+                            results[index] = future.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            crashed(index, job, isolated)
+                            continue
+                        logger.info("Finished {}: {}", job.ifc_file, results[index].status)
+
+                if broken:
+                    for future, (index, job, _, isolated) in running.items():
+                        if future.done() and not future.cancelled() and future.exception() is None:
+                            results[index] = future.result()
+                        else:
+                            # Executor.shutdown(cancel_futures=True) needs Python 3.9.
+                            future.cancel()
+                            crashed(index, job, isolated)
+                    running.clear()
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        finally:
+            executor.shutdown()
+
+        summary = BatchSummary(
+            results=[results[index] for index in range(len(jobs))],
+            seconds=time.perf_counter() - started,
+        )
+        logger.info("Batch finished: {} ok, {} failed", len(jobs) - summary.failed, summary.failed)
+        return summary
+
+
+def run_job(job: BatchJob) -> BatchResult:
+    """Run one job, converting any failure into a result record."""
+    started = time.perf_counter()
+    try:
+        report = run_pipeline(job.ifc_file, job.output_path, job.options)
+    except Exception as exc:  # noqa: BLE001 - failures are isolated per file
+        logger.error("Batch job failed for {}: {}\n{}", job.ifc_file, exc, traceback.format_exc())
+        return _failed_result(job, f"{type(exc).__name__}: {exc}", time.perf_counter() - started)
+    return BatchResult(
+        ifc_file=str(job.ifc_file),
+        output_path=str(job.output_path),
+        status="ok",
+        seconds=round(time.perf_counter() - started, 3),
+        report=report,
+    )
+
+
+def _failed_result(job: BatchJob, error: str, seconds: float = 0.0) -> BatchResult:
+    return BatchResult(
+        ifc_file=str(job.ifc_file),
+        output_path=str(job.output_path),
+        status="failed",
+        seconds=round(seconds, 3),
+        error=error,
+    )
+
+
+def _init_worker() -> None:
+    get_logger()
+
+
+def _resolve(base: Path, value: str) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else base / path
+
+
+def _available_memory_mb() -> float | None:
+    try:
+        import psutil  # type: ignore[import-not-found]
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        return psutil.virtual_memory().available / 1024 / 1024
+
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        for line in meminfo.read_text(encoding="utf-8").splitlines():
+            if line.startswith("MemAvailable:"):
+                return float(line.split()[1]) / 1024
+    if hasattr(os, "sysconf") and "SC_AVPHYS_PAGES" in os.sysconf_names:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    return None
@@ -43,23 +43,28 @@ class ConfigManager:
 
     def load_preset(self, preset: str) -> Dict[str, Any]:
         """Load a preset by name, prefix, or path."""
+        preset_path = self.resolve_preset_path(preset)
+        logger.info("Loading preset: {}", preset_path)
+        config = load_config(preset_path)
+        self.validate_config(config)
+        return config
+
+    def resolve_preset_path(self, preset: str) -> Path:
+        """Return the file a preset name, prefix, or path refers to.
+
+        Raises:
+            FileNotFoundError: If no such preset exists.
+        """
         preset_path = Path(preset)
         if preset_path.exists():
-            logger.info("Loading preset from path: {}", preset_path)
-            config = load_config(preset_path)
-            self.validate_config(config)
-            return config
+            return preset_path
 
         preset_type, preset_name = self._split_preset_name(preset)
         directory = self.python_dir if preset_type == "python" else self.revit_dir
         preset_path = directory / f"{preset_name}.json"
         if not preset_path.exists():
             raise FileNotFoundError(f"Preset not found: {preset}")
-
-        logger.info("Loading {} preset: {}", preset_type, preset_path)
-        config = load_config(preset_path)
-        self.validate_config(config)
-        return config
+        return preset_path
 
     def get_available_presets(self) -> list[str]:
         """Return available preset names with prefixes."""
@@ -0,0 +1,602 @@
+"""Resident processing daemon with a localhost job API.
+
+The daemon keeps a pool of warm worker processes (modules imported, presets parsed)
+and accepts newline-delimited JSON requests over a TCP socket bound to localhost.
+Each request is one JSON object with an ``action`` key:
+
+* ``ping`` — liveness check.
+* ``submit`` — ``ifc_file``, ``output`` and optional ``options`` overrides; returns the job.
+* ``status`` — job by ``job_id`` or all jobs without it; finished jobs are kept
+  up to ``keep_finished`` of them and for ``finished_ttl`` seconds.
+* ``watch`` — streams progress events of ``job_id`` until it finishes.
+* ``cancel`` — cancels a queued job or stops a running one at the next stage boundary.
+* ``shutdown`` — stops the daemon.
+
+Example:
+    daemon = ProcessingDaemon(port=8765, workers=2)
+    daemon.serve_forever()
+
+    client = DaemonClient(port=8765)
+    job = client.submit("model.ifc", "out/model.stl", preset="python:shell_only")
+    for event in client.watch(job["job_id"]):
+        print(event)
+"""
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Sequence
+
+from loguru import logger
+
+from bimto3dprint.config import ConfigManager
+from bimto3dprint.pipeline import PipelineOptionsError, ProcessOptions, preload_presets, run_pipeline
+from bimto3dprint.utils.logger import get_logger
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+FINAL_STATES = frozenset({"succeeded", "failed", "cancelled"})
+DEFAULT_KEEP_FINISHED = 1000
+"""Finished jobs kept for ``status`` queries; older ones are forgotten."""
+DEFAULT_FINISHED_TTL = 24 * 3600.0
+"""Seconds a finished job stays queryable."""
+
+JobHandler = Callable[..., Dict[str, Any]]
+
+_EVENTS: Any = None
+_CANCELLED: Any = None
+
+
+class JobCancelled(RuntimeError):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+class DaemonError(RuntimeError):
+    """Raised by the client when the daemon rejects a request."""
+
+
+@dataclass
+class DaemonJob:
+    """State of a job submitted to the daemon."""
+
+    job_id: str
+    ifc_file: Path
+    output_path: Path
+    options: ProcessOptions
+    status: str = "queued"
+    stage: str | None = None
+    progress: float = 0.0
+    cancel_requested: bool = False
+    error: str | None = None
+    report: dict[str, Any] | None = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    events: list[dict[str, Any]] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the job for API responses."""
+        return {
+            "job_id": self.job_id,
+            "ifc_file": str(self.ifc_file),
+            "output_path": str(self.output_path),
+            "status": self.status,
+            "stage": self.stage,
+            "progress": round(self.progress, 3),
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+            "report": self.report,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ProcessingDaemon:
+    """Job queue served over localhost on top of a warm process pool."""
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        workers: int = 2,
+        presets: Sequence[str] | None = None,
+        handler: JobHandler = run_pipeline,
+        keep_finished: int = DEFAULT_KEEP_FINISHED,
+        finished_ttl: float = DEFAULT_FINISHED_TTL,
+    ) -> None:
+        if workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+        if keep_finished < 0 or finished_ttl < 0:
+            raise ValueError("keep_finished and finished_ttl must not be negative.")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.presets = list(presets) if presets is not None else ConfigManager().get_available_presets()
+        self.handler = handler
+        self.keep_finished = keep_finished
+        self.finished_ttl = finished_ttl
+
+        self._jobs: dict[str, DaemonJob] = {}
+        self._pending: deque[str] = deque()
+        # Finished job ids in the order they finished, evicted from the front.
+        self._finished: deque[str] = deque()
+        # Jobs that were in the pool when a worker crashed; each is rerun alone so only the culprit fails.
+        self._suspects: deque[str] = deque()
+        # Running job ids with the executor they were submitted to and whether they run alone.
+        self._running: dict[Future, tuple[str, ProcessPoolExecutor, bool]] = {}
+        self._changed = threading.Condition()
+        self._stopping = threading.Event()
+        self._stop_lock = threading.Lock()
+        self._stopped = False
+        self._threads: list[threading.Thread] = []
+        self._manager: Any = None
+        self._events: Any = None
+        self._cancelled: Any = None
+        self._executor: ProcessPoolExecutor | None = None
+        self._pool_broken = False
+        self._server: _JobServer | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Bound host and port (resolves ``port=0`` after ``start``)."""
+        if self._server is None:
+            return self.host, self.port
+        return self._server.server_address[:2]
+
+    def start(self) -> None:
+        """Start worker processes and the socket server in background threads."""
+        self._manager = multiprocessing.Manager()
+        self._events = self._manager.Queue()
+        self._cancelled = self._manager.dict()
+        self._executor = self._create_executor()
+
+        self._server = _JobServer((self.host, self.port), _RequestHandler, self)
+        for target in (self._server.serve_forever, self._dispatch_loop, self._event_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Processing daemon listening on {}:{} with {} workers", *self.address, self.workers)
+
+    def serve_forever(self) -> None:
+        """Start the daemon and block until a shutdown request arrives."""
+        self.start()
+        try:
+            self._stopping.wait()
+        except KeyboardInterrupt:
+            logger.info("Processing daemon interrupted")
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop serving, cancel queued jobs and release worker processes."""
+        with self._stop_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        self._stopping.set()
+        with self._changed:
+            for waiting in (self._suspects, self._pending):
+                while waiting:
+                    self._finish(self._jobs[waiting.popleft()], "cancelled")
+            self._changed.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        if self._manager is not None:
+            self._manager.shutdown()
+        logger.info("Processing daemon stopped")
+
+    def submit(self, ifc_file: Path | str, output_path: Path | str, overrides: dict[str, Any] | None = None) -> DaemonJob:
+        """Queue a processing job.
+
+        Args:
+            ifc_file: Input IFC path.
+            output_path: Export path.
+            overrides: Processing option overrides.
+
+        Returns:
+            Queued job.
+
+        Raises:
+            FileNotFoundError: If the IFC file does not exist.
+            PipelineOptionsError: If options are invalid.
+        """
+        ifc_path = Path(ifc_file)
+        if not ifc_path.exists():
+            raise FileNotFoundError(f"IFC file not found: {ifc_path}")
+        options = ProcessOptions().replace(overrides or {})
+        options.validate()
+
+        job = DaemonJob(job_id=uuid.uuid4().hex, ifc_file=ifc_path, output_path=Path(output_path), options=options)
+        with self._changed:
+            self._evict_finished()
+            self._jobs[job.job_id] = job
+            self._pending.append(job.job_id)
+            self._record(job, "queued")
+        logger.info("Queued daemon job {} for {}", job.job_id, ifc_path)
+        return job
+
+    def get_job(self, job_id: str) -> DaemonJob:
+        """Return a job by id.
+
+        Raises:
+            KeyError: If the job is unknown.
+        """
+        with self._changed:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown job: {job_id}")
+        return job
+
+    def jobs(self) -> list[DaemonJob]:
+        """Return all known jobs: queued, running and recently finished."""
+        with self._changed:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> DaemonJob:
+        """Cancel a queued job or request a running job to stop.
+
+        Args:
+            job_id: Job identifier.
+
+        Returns:
+            Job after the cancellation request.
+        """
+        with self._changed:
+            job = self.get_job(job_id)
+            if job.status == "queued":
+                (self._suspects if job_id in self._suspects else self._pending).remove(job_id)
+                self._finish(job, "cancelled")
+            elif job.status == "running":
+                job.cancel_requested = True
+                self._cancelled[job_id] = True
+                self._record(job, "cancel_requested")
+        logger.info("Cancel requested for daemon job {}", job_id)
+        return job
+
+    def watch(self, job_id: str, poll_seconds: float = 0.5) -> Iterator[dict[str, Any]]:
+        """Yield job events as they happen until the job finishes.
+
+        Args:
+            job_id: Job identifier.
+            poll_seconds: Maximum wait between checks for the stop flag.
+
+        Yields:
+            Event dictionaries followed by a final ``done`` message with the job.
+        """
+        job = self.get_job(job_id)
+        index = 0
+        while True:
+            with self._changed:
+                while index >= len(job.events) and job.status not in FINAL_STATES and not self._stopping.is_set():
+                    self._changed.wait(poll_seconds)
+                events = job.events[index:]
+                index = len(job.events)
+                finished = job.status in FINAL_STATES or self._stopping.is_set()
+            for event in events:
+                yield {"ok": True, "job_id": job_id, "event": event}
+            if finished:
+                yield {"ok": True, "done": True, "job": job.to_dict()}
+                return
+
+    def handle_request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Execute a single non-streaming API request.
+
+        Args:
+            message: Decoded request.
+
+        Returns:
+            Response dictionary with an ``ok`` flag.
+        """
+        action = message.get("action")
+        try:
+            if action == "ping":
+                return {"ok": True, "pid": os.getpid(), "workers": self.workers}
+            if action == "submit":
+                job = self.submit(message["ifc_file"], message["output"], message.get("options"))
+                return {"ok": True, "job": job.to_dict()}
+            if action == "status":
+                if message.get("job_id"):
+                    return {"ok": True, "job": self.get_job(message["job_id"]).to_dict()}
+                return {"ok": True, "jobs": [job.to_dict() for job in self.jobs()]}
+            if action == "cancel":
+                return {"ok": True, "job": self.cancel(message["job_id"]).to_dict()}
+            if action == "shutdown":
+                threading.Thread(target=self.stop, daemon=True).start()
+                return {"ok": True}
+        except KeyError as exc:
+            return {"ok": False, "error": f"Missing or unknown value: {exc.args[0]}"}
+        except (FileNotFoundError, PipelineOptionsError, ValueError) as exc:
+            return {"ok": False, "error": str(exc)}
+        except (TypeError, AttributeError) as exc:
+            # Malformed values from a client must get a reply, not drop the connection.
+            return {"ok": False, "error": f"Invalid request: {exc}"}
+        return {"ok": False, "error": f"Unknown action: {action}"}
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._events, self._cancelled, tuple(self.presets)),
+        )
+        for warm_up in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            warm_up.result()
+        return executor
+
+    def _dispatch_loop(self) -> None:
+        while not self._stopping.is_set():
+            if self._pool_broken:
+                logger.error("Daemon worker pool broke; restarting workers")
+                broken = self._executor
+                broken.shutdown(wait=False)
+                self._executor = self._create_executor()
+                self._pool_broken = False
+                # Executor.shutdown(cancel_futures=True) needs Python 3.9; cancelled jobs are requeued in _on_done.
+                with self._changed:
+                    stale = [future for future, (_, executor, _) in self._running.items() if executor is broken]
+                for future in stale:
+                    future.cancel()
+            with self._changed:
+                while True:
+                    isolated = bool(self._suspects)
+                    waiting = self._suspects if isolated else self._pending
+                    if (isolated and self._running) or not waiting or len(self._running) >= self.workers:
+                        break
+                    job = self._jobs[waiting.popleft()]
+                    try:
+                        future = self._executor.submit(
+                            _execute, self.handler, job.job_id, job.ifc_file, job.output_path, job.options
+                        )
+                    except BrokenProcessPool:
+                        waiting.appendleft(job.job_id)
+                        self._pool_broken = True
+                        break
+                    job.status = "running"
+                    job.started_at = time.time()
+                    self._record(job, "running")
+                    self._running[future] = (job.job_id, self._executor, isolated)
+                    future.add_done_callback(self._on_done)
+                if not self._pool_broken:
+                    self._changed.wait(0.2)
+
+    def _event_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                message = self._events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            with self._changed:
+                job = self._jobs.get(message["job_id"])
+                if job is None or job.status in FINAL_STATES:
+                    continue
+                job.stage = message["stage"]
+                job.progress = message["progress"]
+                self._record(job, "stage")
+
+    def _on_done(self, future: Future) -> None:
+        with self._changed:
+            job_id, executor, isolated = self._running.pop(future)
+            job = self._jobs[job_id]
+            if job.cancel_requested and not self._stopping.is_set():
+                self._cancelled.pop(job.job_id, None)
+            try:
+                job.report = future.result()
+            except JobCancelled:
+                self._finish(job, "cancelled")
+                return
+            except (BrokenProcessPool, CancelledError):
+                # Futures of an already replaced pool must not break the new one again.
+                if executor is self._executor:
+                    self._pool_broken = True
+                if job.cancel_requested or self._stopping.is_set():
+                    self._finish(job, "cancelled")
+                elif isolated:
+                    self._finish(job, "failed", "Worker process crashed (possibly out of memory)")
+                else:
+                    logger.warning("Worker pool broke while daemon job {} was running; retrying it alone", job_id)
+                    job.status = "queued"
+                    job.stage = None
+                    job.progress = 0.0
+                    self._suspects.append(job_id)
+                    self._record(job, "requeued")
+                return
+            except Exception as exc:  # noqa: BLE001 - job failures are reported, not raised
+                self._finish(job, "failed", f"{type(exc).__name__}: {exc}")
+                return
+            job.progress = 1.0
+            self._finish(job, "succeeded")
+
+    def _finish(self, job: DaemonJob, status: str, error: str | None = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        self._record(job, status)
+        logger.info("Daemon job {} {}{}", job.job_id, status, f": {error}" if error else "")
+        self._finished.append(job.job_id)
+        self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        # Jobs finish in order, so the oldest and first expired job is at the front.
+        expired = time.time() - self.finished_ttl
+        while self._finished and (
+            len(self._finished) > self.keep_finished or self._jobs[self._finished[0]].finished_at < expired
+        ):
+            self._jobs.pop(self._finished.popleft())
+
+    def _record(self, job: DaemonJob, event_type: str) -> None:
+        job.events.append(
+            {
+                "type": event_type,
+                "status": job.status,
+                "stage": job.stage,
+                "progress": round(job.progress, 3),
+                "time": time.time(),
+            }
+        )
+        self._changed.notify_all()
+
+
+class DaemonClient:
+    """Minimal client for the daemon job API."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = 30.0) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def ping(self) -> dict[str, Any]:
+        """Check that the daemon is alive."""
+        return self.request({"action": "ping"})
+
+    def submit(self, ifc_file: Path | str, output_path: Path | str, **options: Any) -> dict[str, Any]:
+        """Submit a job and return its state."""
+        message = {"action": "submit", "ifc_file": str(ifc_file), "output": str(output_path), "options": options}
+        return self.request(message)["job"]
+
+    def status(self, job_id: str) -> dict[str, Any]:
+        """Return the state of a job."""
+        return self.request({"action": "status", "job_id": job_id})["job"]
+
+    def jobs(self) -> list[dict[str, Any]]:
+        """Return the state of all jobs."""
+        return self.request({"action": "status"})["jobs"]
+
+    def cancel(self, job_id: str) -> dict[str, Any]:
+        """Cancel a job and return its state."""
+        return self.request({"action": "cancel", "job_id": job_id})["job"]
+
+    def shutdown(self) -> None:
+        """Ask the daemon to stop."""
+        self.request({"action": "shutdown"})
+
+    def watch(self, job_id: str) -> Iterator[dict[str, Any]]:
+        """Stream job events; the last item has ``done`` set and carries the final job state."""
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as connection:
+            stream = connection.makefile("rwb")
+            stream.write(_encode({"action": "watch", "job_id": job_id}))
+            stream.flush()
+            for line in stream:
+                response = _decode(line)
+                yield response
+                if response.get("done"):
+                    return
+
+    def request(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Send one request and return the response.
+
+        Raises:
+            DaemonError: If the daemon rejects the request.
+        """
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as connection:
+            stream = connection.makefile("rwb")
+            stream.write(_encode(message))
+            stream.flush()
+            return _decode(stream.readline())
+
+
+class _JobServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], handler: type, processor: ProcessingDaemon) -> None:
+        self.processor = processor
+        super().__init__(address, handler)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        processor: ProcessingDaemon = self.server.processor
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError as exc:
+                self._send({"ok": False, "error": f"Invalid JSON: {exc}"})
+                continue
+            if not isinstance(message, dict):
+                self._send({"ok": False, "error": "Request must be a JSON object"})
+                continue
+
+            if message.get("action") == "watch":
+                try:
+                    for event in processor.watch(str(message.get("job_id"))):
+                        self._send(event)
+                except KeyError as exc:
+                    self._send({"ok": False, "done": True, "error": str(exc.args[0])})
+                continue
+            self._send(processor.handle_request(message))
+
+    def _send(self, payload: dict[str, Any]) -> None:
+        try:
+            self.wfile.write(_encode(payload))
+            self.wfile.flush()
+        except OSError:
+            logger.debug("Daemon client disconnected")
+
+
+def _encode(payload: dict[str, Any]) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def _decode(line: bytes) -> dict[str, Any]:
+    if not line:
+        raise DaemonError("Daemon closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error", "Request failed"))
+    return response
+
+
+def _init_worker(events: Any, cancelled: Any, presets: Sequence[str]) -> None:
+    global _EVENTS, _CANCELLED
+    _EVENTS = events
+    _CANCELLED = cancelled
+    get_logger()
+    preload_presets(presets)
+
+
+def _execute(
+    handler: JobHandler,
+    job_id: str,
+    ifc_file: Path,
+    output_path: Path,
+    options: ProcessOptions,
+) -> dict[str, Any]:
+    def progress(stage: str, fraction: float) -> None:
+        if _CANCELLED is not None and _CANCELLED.get(job_id):
+            raise JobCancelled(f"Job {job_id} cancelled before stage {stage}")
+        if _EVENTS is not None:
+            _EVENTS.put({"job_id": job_id, "stage": stage, "progress": fraction})
+
+    try:
+        return handler(ifc_file, output_path, options, progress=progress)
+    except JobCancelled:
+        raise
+    except Exception:
+        logger.error("Daemon job {} failed:\n{}", job_id, traceback.format_exc())
+        raise
@@ -0,0 +1,252 @@
+"""Binary glTF (GLB) export utilities.
+
+The JSON header is built from array shapes alone and the vertex and index
+arrays are written straight from their NumPy buffers into the binary chunk,
+without assembling the chunk in memory. Indices use 16 bits when the vertex
+count allows it. With ``quantize`` positions are stored as 16-bit integers and
+normals as 8-bit integers (``KHR_mesh_quantization``), with the dequantization
+folded into the node transform; the compact preview mode also drops normals,
+which viewers then derive from the faces. ``FaceGroups`` passed as
+``metadata["face_groups"]`` become one named node, mesh and material per group.
+
+Example:
+    GLBExporter.compact().export(mesh, Path("out/model.preview.glb"), metadata={})
+"""
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, List
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.exporters.threemf_exporter import GROUP_COLORS
+from bimto3dprint.processors.provenance import FaceGroups
+from bimto3dprint.utils.file_utils import atomic_write
+
+GLB_MAGIC = 0x46546C67
+"""``glTF`` in little-endian byte order."""
+QUANTIZATION_EXTENSION = "KHR_mesh_quantization"
+MILLIMETERS_TO_METERS = 0.001
+"""glTF scenes are in meters; the exported mesh stays in millimeters under a scaled node."""
+_JSON_CHUNK = 0x4E4F534A
+_BIN_CHUNK = 0x004E4942
+_FLOAT, _INT8, _UINT16, _UINT32 = 5126, 5120, 5123, 5125
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+_QUANTIZED_MAX = 0xFFFF
+
+
+@dataclass
+class GLBExporter:
+    """Export trimesh meshes to binary glTF.
+
+    Attributes:
+        quantize: Store positions as 16-bit and normals as 8-bit integers.
+        normals: Write vertex normals.
+    """
+
+    quantize: bool = False
+    normals: bool = True
+
+    @classmethod
+    def compact(cls) -> "GLBExporter":
+        """Smallest preview output: quantized positions and no normals."""
+        return cls(quantize=True, normals=False)
+
+    def export(self, mesh: trimesh.Trimesh, output_path: str | Path, metadata: dict[str, Any]) -> None:
+        """Export mesh to GLB.
+
+        Args:
+            mesh: Trimesh mesh to export, in millimeters.
+            output_path: Output GLB path.
+            metadata: Export metadata; ``mesh_units``, ``unit_scale_factor``,
+                ``user_scale_factor`` and ``report`` become scene extras and
+                ``face_groups`` (:class:`FaceGroups`) separate meshes.
+
+        Raises:
+            FileNotFoundError: If the output file was not created.
+            ValueError: If the mesh or the exported file is empty.
+        """
+        output_path = Path(output_path)
+        if len(mesh.faces) == 0:
+            raise ValueError("GLB export produced empty data.")
+        groups: FaceGroups | None = metadata.get("face_groups")
+        if groups is not None and len(groups.labels) != len(mesh.faces):
+            raise ValueError("face_groups must have one label per face.")
+
+        buffers = self._buffers(mesh, groups)
+        document = self._document(mesh, buffers, groups, metadata)
+        header = json.dumps(document, separators=(",", ":"), default=str).encode("utf-8")
+        header += b" " * (-len(header) % 4)
+        binary_length = sum(_padded(array.nbytes) for array, _ in buffers.values())
+
+        logger.info("Exporting GLB to {}", output_path)
+        with atomic_write(output_path) as file:
+            file.write(struct.pack("<III", GLB_MAGIC, 2, 12 + 8 + len(header) + 8 + binary_length))
+            file.write(struct.pack("<II", len(header), _JSON_CHUNK))
+            file.write(header)
+            file.write(struct.pack("<II", binary_length, _BIN_CHUNK))
+            for array, _ in buffers.values():
+                _write_array(file, array)
+
+        if not output_path.exists():
+            raise FileNotFoundError(f"GLB file was not created: {output_path}")
+        if output_path.stat().st_size <= 0:
+            raise ValueError(f"GLB file is empty: {output_path}")
+        logger.info("GLB export completed ({} bytes)", output_path.stat().st_size)
+
+    def _buffers(self, mesh: trimesh.Trimesh, groups: FaceGroups | None) -> Dict[str, tuple[np.ndarray, int]]:
+        """Binary arrays by attribute, with the byte stride of their buffer view (0 for tightly packed)."""
+        vertices = np.asarray(mesh.vertices)
+        buffers: Dict[str, tuple[np.ndarray, int]] = {}
+        if self.quantize:
+            lower, step = _quantization(vertices)
+            # Vertex attribute strides must be multiples of 4 bytes, so the xyz triples are padded to four.
+            positions = np.zeros((len(vertices), 4), dtype="<u2")
+            positions[:, :3] = np.rint((vertices - lower) / step)
+            buffers["POSITION"] = (positions, 8)
+        else:
+            buffers["POSITION"] = (np.ascontiguousarray(vertices, dtype="<f4"), 0)
+        if self.normals:
+            normals = np.asarray(mesh.vertex_normals)
+            if self.quantize:
+                packed = np.zeros((len(normals), 4), dtype="i1")
+                packed[:, :3] = np.rint(np.clip(normals, -1.0, 1.0) * 127.0)
+                buffers["NORMAL"] = (packed, 4)
+            else:
+                buffers["NORMAL"] = (np.ascontiguousarray(normals, dtype="<f4"), 0)
+
+        faces = np.asarray(mesh.faces)
+        if groups is not None:
+            faces = faces[np.concatenate([members for _, members in groups.runs()])]
+        # 0xFFFF is the primitive restart value of 16-bit indices and must not be used as a vertex index.
+        index_type = "<u2" if len(vertices) < 0xFFFF else "<u4"
+        buffers["indices"] = (np.ascontiguousarray(faces, dtype=index_type), 0)
+        return buffers
+
+    def _document(
+        self,
+        mesh: trimesh.Trimesh,
+        buffers: Dict[str, tuple[np.ndarray, int]],
+        groups: FaceGroups | None,
+        metadata: dict[str, Any],
+    ) -> Dict[str, Any]:
+        vertices = np.asarray(mesh.vertices)
+        views: List[Dict[str, Any]] = []
+        offset = 0
+        for name, (array, stride) in buffers.items():
+            view = {"buffer": 0, "byteOffset": offset, "byteLength": array.nbytes}
+            view["target"] = _ELEMENT_ARRAY_BUFFER if name == "indices" else _ARRAY_BUFFER
+            if stride:
+                view["byteStride"] = stride
+            views.append(view)
+            offset += _padded(array.nbytes)
+
+        # The root node carries the millimeter-to-meter scale and the dequantization; each part is a child.
+        root: Dict[str, Any] = {"name": "model"}
+        accessors: List[Dict[str, Any]] = []
+        if self.quantize:
+            lower, step = _quantization(vertices)
+            positions = buffers["POSITION"][0][:, :3]
+            accessors.append(
+                {
+                    "bufferView": 0,
+                    "componentType": _UINT16,
+                    "count": len(vertices),
+                    "type": "VEC3",
+                    "min": positions.min(axis=0).tolist(),
+                    "max": positions.max(axis=0).tolist(),
+                }
+            )
+            root["translation"] = (lower * MILLIMETERS_TO_METERS).tolist()
+            root["scale"] = (step * MILLIMETERS_TO_METERS).tolist()
+        else:
+            accessors.append(
+                {
+                    "bufferView": 0,
+                    "componentType": _FLOAT,
+                    "count": len(vertices),
+                    "type": "VEC3",
+                    "min": vertices.min(axis=0).astype(np.float32).tolist(),
+                    "max": vertices.max(axis=0).astype(np.float32).tolist(),
+                }
+            )
+            root["scale"] = [MILLIMETERS_TO_METERS] * 3
+        attributes = {"POSITION": 0}
+        if self.normals:
+            normal = {"bufferView": 1, "componentType": _FLOAT, "count": len(vertices), "type": "VEC3"}
+            if self.quantize:
+                normal.update(componentType=_INT8, normalized=True)
+            attributes["NORMAL"] = len(accessors)
+            accessors.append(normal)
+
+        indices, _ = buffers["indices"]
+        index_view = len(views) - 1
+        index_type = _UINT16 if indices.dtype.itemsize == 2 else _UINT32
+        parts = [("mesh", len(indices))] if groups is None else [(name, len(faces)) for name, faces in groups.runs()]
+        nodes, meshes, materials = [root], [], []
+        start = 0
+        for number, (name, count) in enumerate(parts):
+            accessors.append(
+                {
+                    "bufferView": index_view,
+                    "byteOffset": start * 3 * indices.dtype.itemsize,
+                    "componentType": index_type,
+                    "count": count * 3,
+                    "type": "SCALAR",
+                }
+            )
+            color = GROUP_COLORS[number % len(GROUP_COLORS)]
+            materials.append(
+                {
+                    "name": name,
+                    "pbrMetallicRoughness": {
+                        "baseColorFactor": [int(color[i : i + 2], 16) / 255.0 for i in (1, 3, 5)] + [1.0],
+                        "metallicFactor": 0.0,
+                        "roughnessFactor": 0.9,
+                    },
+                }
+            )
+            primitive = {"attributes": attributes, "indices": len(accessors) - 1, "material": number}
+            meshes.append({"name": name, "primitives": [primitive]})
+            nodes.append({"name": name, "mesh": number})
+            start += count
+        root["children"] = list(range(1, len(nodes)))
+
+        extras = {key: metadata.get(key) for key in ("mesh_units", "unit_scale_factor", "user_scale_factor", "report")}
+        document: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": "Bimto3dPrint"},
+            "scene": 0,
+            "scenes": [{"nodes": [0], "extras": {key: value for key, value in extras.items() if value is not None}}],
+            "nodes": nodes,
+            "meshes": meshes,
+            "materials": materials,
+            "accessors": accessors,
+            "bufferViews": views,
+            "buffers": [{"byteLength": offset}],
+        }
+        if self.quantize:
+            document["extensionsUsed"] = [QUANTIZATION_EXTENSION]
+            document["extensionsRequired"] = [QUANTIZATION_EXTENSION]
+        return document
+
+
+def _quantization(vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Origin and per-axis step of the 16-bit position grid over the mesh bounds."""
+    lower = vertices.min(axis=0)
+    extent = vertices.max(axis=0) - lower
+    return lower, np.where(extent > 0, extent / _QUANTIZED_MAX, 1.0)
+
+
+def _padded(length: int) -> int:
+    """Chunk and buffer view lengths are aligned to 4 bytes."""
+    return length + (-length % 4)
+
+
+def _write_array(file: IO[bytes], array: np.ndarray) -> None:
+    file.write(memoryview(array).cast("B"))
+    file.write(b"\0" * (-array.nbytes % 4))
@@ -1,15 +1,47 @@
-"""OBJ export utilities."""
+"""OBJ export utilities.
+
+Vertices, vertex normals and faces are formatted with one string operation per
+chunk and streamed to a temporary file that is renamed into place when
+complete, so memory stays bounded by the chunk size. ``FaceGroups`` passed as
+``metadata["face_groups"]`` split the faces into named ``o``/``g`` sections.
+
+Example:
+    OBJExporter().export(mesh, Path("out/model.obj"), metadata={"face_groups": groups})
+"""
 from __future__ import annotations
 
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import numpy as np
 import trimesh
 from loguru import logger
 
+from bimto3dprint.processors.provenance import FaceGroups
+from bimto3dprint.utils.file_utils import atomic_write
+
+OBJ_CHUNK_ROWS = 1 << 16
+"""Vertices or faces formatted per chunk."""
+_VERTEX = "v %.6f %.6f %.6f\n"
+_NORMAL = "vn %.6f %.6f %.6f\n"
+_FACE = "f %d//%d %d//%d %d//%d\n"
+
 
+@dataclass
 class OBJExporter:
-    """Export trimesh meshes to OBJ format."""
+    """Export trimesh meshes to OBJ format.
+
+    Attributes:
+        chunk_rows: Vertices or faces formatted and written per chunk.
+    """
+
+    chunk_rows: int = OBJ_CHUNK_ROWS
+
+    def __post_init__(self) -> None:
+        if self.chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive.")
 
     def export(self, mesh: trimesh.Trimesh, output_path: str | Path, metadata: dict[str, Any]) -> None:
         """Export mesh to OBJ.
@@ -17,32 +49,58 @@ class OBJExporter:
         Args:
             mesh: Trimesh mesh to export.
             output_path: Output OBJ path.
-            metadata: Export metadata (unused, reserved for future use).
+            metadata: Export metadata; optional ``face_groups`` (:class:`FaceGroups`)
+                with one label per face.
 
         Raises:
             FileNotFoundError: If the output file was not created.
-            ValueError: If the exported file is empty.
+            ValueError: If the mesh or the exported file is empty.
         """
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        logger.info("Exporting OBJ to {}", output_path)
-        export_data = trimesh.exchange.export.export_mesh(
-            mesh,
-            file_type="obj",
-            include_normals=True,
-        )
-        if not export_data:
+        if len(mesh.faces) == 0:
             raise ValueError("OBJ export produced empty data.")
+        groups: FaceGroups | None = metadata.get("face_groups")
+        if groups is not None and len(groups.labels) != len(mesh.faces):
+            raise ValueError("face_groups must have one label per face.")
 
-        if isinstance(export_data, bytes):
-            export_text = export_data.decode("utf-8")
-        else:
-            export_text = export_data
+        logger.info("Exporting OBJ to {}", output_path)
+        with atomic_write(output_path, "w", encoding="utf-8") as file:
+            file.write("# Bimto3dPrint OBJ\n")
+            self._write_rows(file, _VERTEX, np.asarray(mesh.vertices, dtype=np.float64))
+            self._write_rows(file, _NORMAL, np.asarray(mesh.vertex_normals, dtype=np.float64))
+            faces = np.asarray(mesh.faces, dtype=np.int64)
+            if groups is None:
+                self._write_faces(file, faces)
+            else:
+                for name, members in groups.runs():
+                    # Slicers split objects on ``o``, viewers toggle ``g`` groups; both name the group.
+                    file.write("o {0}\ng {0}\n".format(_group_name(name)))
+                    self._write_faces(file, faces, members)
 
-        output_path.write_text(export_text, encoding="utf-8")
         if not output_path.exists():
             raise FileNotFoundError(f"OBJ file was not created: {output_path}")
         if output_path.stat().st_size <= 0:
             raise ValueError(f"OBJ file is empty: {output_path}")
         logger.info("OBJ export completed ({} bytes)", output_path.stat().st_size)
+
+    def _write_faces(self, file: IO[str], faces: np.ndarray, members: np.ndarray | None = None) -> None:
+        # Faces are selected and offset per chunk, so no full-size copy of the face array is made.
+        count = len(faces) if members is None else len(members)
+        for start in range(0, count, self.chunk_rows):
+            window = slice(start, start + self.chunk_rows)
+            chunk = faces[window] if members is None else faces[members[window]]
+            # OBJ indices are 1-based; every corner references its vertex and the normal of the same index.
+            self._write_chunk(file, _FACE, np.repeat(chunk + 1, 2, axis=1))
+
+    def _write_rows(self, file: IO[str], template: str, rows: np.ndarray) -> None:
+        for start in range(0, len(rows), self.chunk_rows):
+            self._write_chunk(file, template, rows[start : start + self.chunk_rows])
+
+    @staticmethod
+    def _write_chunk(file: IO[str], template: str, chunk: np.ndarray) -> None:
+        file.write((template * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def _group_name(name: str) -> str:
+    """Group names end at whitespace in OBJ, so runs of it become underscores."""
+    return re.sub(r"\s+", "_", name.strip()) or "unnamed"
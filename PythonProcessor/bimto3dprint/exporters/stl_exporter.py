@@ -1,18 +1,58 @@
-"""STL export utilities."""
+"""STL export utilities.
+
+Faces are written in chunks straight from the vertex and face arrays: binary
+STL as packed 50-byte records, ASCII STL as one formatted block per chunk. The
+file is written to a temporary file and renamed into place when complete.
+
+Example:
+    STLExporter().export(mesh, Path("out/model.stl"), metadata={})
+"""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Iterator
 
+import numpy as np
 import trimesh
 from loguru import logger
 
+from bimto3dprint.utils.file_utils import atomic_write
+
+STL_CHUNK_FACES = 1 << 16
+"""Faces converted per chunk; about 3 MB of binary records."""
+STL_HEADER = b"Bimto3dPrint binary STL".ljust(80, b"\0")
+"""Binary header; it must not start with ``solid``, which marks ASCII files."""
+STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")])
+_ASCII_FACET = (
+    "facet normal %.7e %.7e %.7e\n"
+    "  outer loop\n"
+    "    vertex %.7e %.7e %.7e\n"
+    "    vertex %.7e %.7e %.7e\n"
+    "    vertex %.7e %.7e %.7e\n"
+    "  endloop\n"
+    "endfacet\n"
+)
+
 
+@dataclass
 class STLExporter:
-    """Export trimesh meshes to binary STL."""
+    """Export trimesh meshes to STL.
+
+    Attributes:
+        ascii: Write ASCII STL instead of binary.
+        chunk_faces: Faces converted and written per chunk.
+    """
+
+    ascii: bool = False
+    chunk_faces: int = STL_CHUNK_FACES
+
+    def __post_init__(self) -> None:
+        if self.chunk_faces <= 0:
+            raise ValueError("chunk_faces must be positive.")
 
     def export(self, mesh: trimesh.Trimesh, output_path: str | Path, metadata: dict[str, Any]) -> None:
-        """Export mesh to binary STL.
+        """Export mesh to STL.
 
         Args:
             mesh: Trimesh mesh to export.
@@ -21,24 +61,59 @@ class STLExporter:
 
         Raises:
             FileNotFoundError: If the output file was not created.
-            ValueError: If the exported file is empty.
+            ValueError: If the mesh or the exported file is empty.
         """
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        logger.info("Exporting STL to {}", output_path)
-        export_data = trimesh.exchange.export.export_mesh(mesh, file_type="stl")
-        if not export_data:
+        if len(mesh.faces) == 0:
             raise ValueError("STL export produced empty data.")
 
-        if isinstance(export_data, str):
-            export_bytes = export_data.encode("utf-8")
+        logger.info("Exporting {} STL to {}", "ASCII" if self.ascii else "binary", output_path)
+        if self.ascii:
+            with atomic_write(output_path, "w", encoding="ascii") as file:
+                self._write_ascii(file, mesh)
         else:
-            export_bytes = export_data
+            with atomic_write(output_path) as file:
+                self._write_binary(file, mesh)
 
-        output_path.write_bytes(export_bytes)
         if not output_path.exists():
             raise FileNotFoundError(f"STL file was not created: {output_path}")
         if output_path.stat().st_size <= 0:
             raise ValueError(f"STL file is empty: {output_path}")
         logger.info("STL export completed ({} bytes)", output_path.stat().st_size)
+
+    def _write_binary(self, file: IO[bytes], mesh: trimesh.Trimesh) -> None:
+        file.write(STL_HEADER)
+        file.write(np.uint32(len(mesh.faces)).tobytes())
+        records = np.zeros(min(self.chunk_faces, len(mesh.faces)), dtype=STL_RECORD)
+        for triangles, normals in self._chunks(mesh):
+            chunk = records[: len(triangles)]
+            chunk["normal"] = normals
+            chunk["vertices"] = triangles
+            chunk.tofile(file)
+
+    def _write_ascii(self, file: IO[str], mesh: trimesh.Trimesh) -> None:
+        file.write("solid mesh\n")
+        for triangles, normals in self._chunks(mesh):
+            values = np.concatenate([normals, triangles.reshape(-1, 9)], axis=1)
+            file.write((_ASCII_FACET * len(values)) % tuple(values.ravel()))
+        file.write("endsolid mesh\n")
+
+    def _chunks(self, mesh: trimesh.Trimesh) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Triangles of shape (n, 3, 3) and unit normals of shape (n, 3) per chunk of faces."""
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        faces = np.asarray(mesh.faces)
+        for start in range(0, len(faces), self.chunk_faces):
+            triangles = vertices[faces[start : start + self.chunk_faces]]
+            normals = _cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+            yield triangles, normals
+
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise cross product; several times faster than ``np.cross`` on (n, 3) arrays."""
+    result = np.empty_like(a)
+    result[:, 0] = a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1]
+    result[:, 1] = a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2]
+    result[:, 2] = a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+    return result
@@ -0,0 +1,160 @@
+"""3MF export utilities.
+
+The model XML is streamed into a deflate-compressed zip part chunk by chunk,
+with indexed vertices, so the package is a fraction of the size of a binary
+STL. The mesh stays one closed object, as the 3MF core specification requires
+of model objects; ``FaceGroups`` passed as ``metadata["face_groups"]`` become
+one base material per group, assigned per triangle for multi-material printing.
+Units and scale factors are written as model metadata and the validation
+report as a JSON part.
+
+Example:
+    ThreeMFExporter().export(mesh, Path("out/model.3mf"), metadata={"face_groups": groups})
+"""
+from __future__ import annotations
+
+import json
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.processors.provenance import FaceGroups
+from bimto3dprint.utils.file_utils import atomic_write
+
+THREEMF_CHUNK_ROWS = 1 << 16
+"""Vertices or triangles formatted per chunk."""
+MODEL_PATH = "3D/3dmodel.model"
+REPORT_PATH = "Metadata/bimto3dprint_report.json"
+CORE_NAMESPACE = "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"
+METADATA_NAMESPACE = "urn:bimto3dprint:metadata"
+GROUP_COLORS = ("#B0B0B0", "#D9534F", "#5BC0DE", "#5CB85C", "#F0AD4E", "#8E6CC0", "#4A7FB5", "#C9A66B")
+"""Display colors of the base materials, cycled over groups."""
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>'
+    '<Default Extension="json" ContentType="application/json"/>'
+    "</Types>"
+)
+_RELATIONSHIPS = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Target="/{MODEL_PATH}" Id="rel0" '
+    'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+    "</Relationships>"
+)
+_VERTEX = '<vertex x="%.4f" y="%.4f" z="%.4f"/>\n'
+_TRIANGLE = '<triangle v1="%d" v2="%d" v3="%d"/>\n'
+_MATERIAL_TRIANGLE = '<triangle v1="%d" v2="%d" v3="%d" p1="%d"/>\n'
+_METADATA_KEYS = ("mesh_units", "unit_scale_factor", "user_scale_factor")
+
+
+@dataclass
+class ThreeMFExporter:
+    """Export trimesh meshes to 3MF packages.
+
+    Attributes:
+        compresslevel: Deflate level of the zip parts (1 fastest, 9 smallest).
+        chunk_rows: Vertices or triangles formatted and written per chunk.
+    """
+
+    compresslevel: int = 6
+    chunk_rows: int = THREEMF_CHUNK_ROWS
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.compresslevel <= 9:
+            raise ValueError("compresslevel must be in [0, 9].")
+        if self.chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive.")
+
+    def export(self, mesh: trimesh.Trimesh, output_path: str | Path, metadata: dict[str, Any]) -> None:
+        """Export mesh to 3MF.
+
+        Args:
+            mesh: Trimesh mesh to export, in millimeters.
+            output_path: Output 3MF path.
+            metadata: Export metadata; ``mesh_units``, ``unit_scale_factor`` and
+                ``user_scale_factor`` become model metadata, ``report`` a JSON
+                part and ``face_groups`` (:class:`FaceGroups`) per-triangle materials.
+
+        Raises:
+            FileNotFoundError: If the output file was not created.
+            ValueError: If the mesh or the exported file is empty.
+        """
+        output_path = Path(output_path)
+        if len(mesh.faces) == 0:
+            raise ValueError("3MF export produced empty data.")
+        groups: FaceGroups | None = metadata.get("face_groups")
+        if groups is not None and len(groups.labels) != len(mesh.faces):
+            raise ValueError("face_groups must have one label per face.")
+
+        logger.info("Exporting 3MF to {}", output_path)
+        with atomic_write(output_path) as file:
+            with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel) as package:
+                package.writestr("[Content_Types].xml", _CONTENT_TYPES)
+                package.writestr("_rels/.rels", _RELATIONSHIPS)
+                with package.open(MODEL_PATH, "w", force_zip64=True) as model:
+                    self._write_model(model, mesh, groups, metadata)
+                if metadata.get("report") is not None:
+                    package.writestr(REPORT_PATH, json.dumps(metadata["report"], indent=2, default=str))
+
+        if not output_path.exists():
+            raise FileNotFoundError(f"3MF file was not created: {output_path}")
+        if output_path.stat().st_size <= 0:
+            raise ValueError(f"3MF file is empty: {output_path}")
+        logger.info("3MF export completed ({} bytes)", output_path.stat().st_size)
+
+    def _write_model(
+        self,
+        model: IO[bytes],
+        mesh: trimesh.Trimesh,
+        groups: FaceGroups | None,
+        metadata: dict[str, Any],
+    ) -> None:
+        model.write(
+            (
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<model unit="millimeter" xml:lang="en-US" xmlns="{CORE_NAMESPACE}" '
+                f'xmlns:b3p="{METADATA_NAMESPACE}">\n'
+                '<metadata name="Application">Bimto3dPrint</metadata>\n'
+            ).encode("utf-8")
+        )
+        for key in _METADATA_KEYS:
+            if metadata.get(key) is not None:
+                model.write(f'<metadata name="b3p:{key}">{escape(str(metadata[key]))}</metadata>\n'.encode("utf-8"))
+
+        names = ["mesh"] if groups is None else groups.names
+        model.write(b"<resources>\n")
+        # Resource ids: 1 is the material group, 2 the object.
+        model.write(b'<basematerials id="1">\n')
+        for index, name in enumerate(names):
+            color = GROUP_COLORS[index % len(GROUP_COLORS)]
+            model.write(f"<base name={quoteattr(name)} displaycolor={quoteattr(color)}/>\n".encode("utf-8"))
+        model.write(b"</basematerials>\n")
+
+        # Splitting a closed shell by group would leave every object an open
+        # surface, so groups only select the material of each triangle.
+        faces = np.asarray(mesh.faces, dtype=np.int64)
+        model.write(b'<object id="2" type="model" name="mesh" pid="1" pindex="0">\n<mesh>\n<vertices>\n')
+        self._write_rows(model, _VERTEX, np.asarray(mesh.vertices, dtype=np.float64))
+        model.write(b"</vertices>\n<triangles>\n")
+        if groups is None:
+            self._write_rows(model, _TRIANGLE, faces)
+        else:
+            labels = np.asarray(groups.labels, dtype=np.int64)
+            self._write_rows(model, _MATERIAL_TRIANGLE, np.column_stack([faces, labels]))
+        model.write(b"</triangles>\n</mesh>\n</object>\n</resources>\n")
+        model.write(b'<build>\n<item objectid="2"/>\n</build>\n</model>\n')
+
+    def _write_rows(self, stream: IO[bytes], template: str, rows: np.ndarray) -> None:
+        for start in range(0, len(rows), self.chunk_rows):
+            chunk = rows[start : start + self.chunk_rows]
+            stream.write(((template * len(chunk)) % tuple(chunk.ravel().tolist())).encode("ascii"))
+
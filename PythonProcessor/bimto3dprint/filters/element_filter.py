@@ -1,22 +1,435 @@
 """Element filtering logic.
 
+Filters select IFC elements by storey, property set values, ``IsExternal``,
+spatial zone and placement bounding box before any geometry is tessellated.
+They read an :class:`ElementIndex` of inverse attributes that is built once per
+model by walking each relationship type a single time, so a filter costs a few
+dictionary lookups per element.
+
 Example:
     filtered = filter_elements(elements, config)
 """
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import ifcopenshell
+import ifcopenshell.util.placement
+import ifcopenshell.util.unit
+import numpy as np
+from loguru import logger
+
+EXTERNAL_PROPERTY = "IsExternal"
+_MISSING = object()
+_Transform = Tuple[Optional[np.ndarray], Tuple[float, ...]]
+"""Rotation (``None`` for identity) and translation of a placement."""
+
+
+@dataclass
+class ElementIndex:
+    """Inverse-attribute lookups for one IFC model.
+
+    Each lookup is built on first use from one pass over its relationship type
+    and reused by every later filter.
+
+    Attributes:
+        model: Indexed IFC model.
+    """
+
+    model: ifcopenshell.file
+    _storeys: Optional[Dict[int, str]] = field(default=None, init=False, repr=False)
+    _properties: Optional[Dict[int, Dict[str, Dict[str, Any]]]] = field(default=None, init=False, repr=False)
+    _zones: Optional[Dict[int, Set[str]]] = field(default=None, init=False, repr=False)
+    _containers: Optional[Dict[int, Tuple[int, ...]]] = field(default=None, init=False, repr=False)
+    _placements: Dict[int, _Transform] = field(default_factory=dict, init=False, repr=False)
+    _unit_scale: Optional[float] = field(default=None, init=False, repr=False)
+
+    def storey(self, element: ifcopenshell.entity_instance) -> Optional[str]:
+        """Name of the storey containing the element, if any."""
+        if self._storeys is None:
+            self._storeys = self._build_storeys()
+        return self._storeys.get(element.id())
+
+    def properties(self, element: ifcopenshell.entity_instance) -> Dict[str, Dict[str, Any]]:
+        """Property set values of the element, with occurrence values overriding type values."""
+        if self._properties is None:
+            self._properties = self._build_properties()
+        return self._properties.get(element.id(), {})
+
+    def property_value(self, element: ifcopenshell.entity_instance, name: str, pset: Optional[str] = None) -> Any:
+        """Value of a property, searched in ``pset`` or in every property set.
+
+        Returns:
+            The value, or ``None`` when the element has no such property.
+        """
+        psets = self.properties(element)
+        if pset is not None:
+            return psets.get(pset, {}).get(name)
+        for values in psets.values():
+            if name in values:
+                return values[name]
+        return None
+
+    def is_external(self, element: ifcopenshell.entity_instance) -> Optional[bool]:
+        """``IsExternal`` from the element's ``Pset_*Common``, or ``None`` when it is not set."""
+        for pset, values in self.properties(element).items():
+            if pset.startswith("Pset_") and pset.endswith("Common") and EXTERNAL_PROPERTY in values:
+                value = values[EXTERNAL_PROPERTY]
+                return None if value is None else bool(value)
+        return None
+
+    def zones(self, element: ifcopenshell.entity_instance) -> Set[str]:
+        """Names of the zones the element, or a space containing it, is assigned to."""
+        if self._zones is None:
+            self._zones = self._build_zones()
+        found = set(self._zones.get(element.id(), ()))
+        for container in self._container_chain(element.id()):
+            found.update(self._zones.get(container, ()))
+        return found
+
+    def origin(self, element: ifcopenshell.entity_instance, default: Any = None) -> Any:
+        """World position (x, y, z) of the element's placement origin in meters, or ``default``."""
+        placement = getattr(element, "ObjectPlacement", None)
+        if placement is None:
+            return default
+        return self._placement(placement)[1]
+
+    def placement(self, element: ifcopenshell.entity_instance) -> _Transform:
+        """World rotation (``None`` for identity) and translation in meters of the element's placement."""
+        placement = getattr(element, "ObjectPlacement", None)
+        if placement is None:
+            return None, (0.0, 0.0, 0.0)
+        return self._placement(placement)
+
+    @property
+    def unit_scale(self) -> float:
+        """Meters per project length unit."""
+        if self._unit_scale is None:
+            self._unit_scale = float(ifcopenshell.util.unit.calculate_unit_scale(self.model))
+        return self._unit_scale
+
+    def _build_storeys(self) -> Dict[int, str]:
+        storeys: Dict[int, str] = {}
+        for storey in self.model.by_type("IfcBuildingStorey"):
+            storeys[storey.id()] = storey.Name or storey.LongName or ""
+
+        resolved: Dict[int, str] = {}
+        for element_id in self._containment_index():
+            for container in self._container_chain(element_id):
+                if container in storeys:
+                    resolved[element_id] = storeys[container]
+                    break
+        logger.info("Indexed storeys of {} elements", len(resolved))
+        return resolved
+
+    def _containment_index(self) -> Dict[int, Tuple[int, ...]]:
+        """Direct parent of every object: its spatial container or aggregating whole."""
+        if self._containers is not None:
+            return self._containers
+        parents: Dict[int, Tuple[int, ...]] = {}
+        for relation in self.model.by_type("IfcRelAggregates"):
+            whole = relation.RelatingObject.id()
+            for part in relation.RelatedObjects or ():
+                parents[part.id()] = (whole,)
+        for relation in self.model.by_type("IfcRelContainedInSpatialStructure"):
+            structure = relation.RelatingStructure.id()
+            for element in relation.RelatedElements or ():
+                parents.setdefault(element.id(), (structure,))
+        self._containers = parents
+        return parents
+
+    def _container_chain(self, element_id: int) -> Iterable[int]:
+        """Spatial containers and wholes above an object, nearest first."""
+        parents = self._containment_index()
+        seen = {element_id}
+        current = parents.get(element_id)
+        while current is not None and current[0] not in seen:
+            seen.add(current[0])
+            yield current[0]
+            current = parents.get(current[0])
+
+    def _build_properties(self) -> Dict[int, Dict[str, Dict[str, Any]]]:
+        # Property sets are shared between objects, so their values are read once each.
+        cache: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+
+        def read(definition: ifcopenshell.entity_instance) -> Optional[Tuple[str, Dict[str, Any]]]:
+            if definition.id() not in cache:
+                if not definition.is_a("IfcPropertySet"):
+                    return None
+                values = {prop.Name: _property_value(prop) for prop in definition.HasProperties or ()}
+                cache[definition.id()] = (definition.Name or "", values)
+            return cache[definition.id()]
+
+        properties: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for relation in self.model.by_type("IfcRelDefinesByType"):
+            definitions = getattr(relation.RelatingType, "HasPropertySets", None) or ()
+            type_psets = [pset for pset in (read(definition) for definition in definitions) if pset is not None]
+            if not type_psets:
+                continue
+            for element in relation.RelatedObjects or ():
+                properties.setdefault(element.id(), {}).update(type_psets)
+
+        for relation in self.model.by_type("IfcRelDefinesByProperties"):
+            definitions = relation.RelatingPropertyDefinition
+            if not isinstance(definitions, (list, tuple)):
+                definitions = (definitions,)
+            psets = [pset for pset in (read(definition) for definition in definitions) if pset is not None]
+            for element in relation.RelatedObjects or ():
+                target = properties.setdefault(element.id(), {})
+                for name, values in psets:
+                    # Value dictionaries are shared; merge into a copy when a type set has the same name.
+                    target[name] = {**target[name], **values} if name in target else values
+        logger.info("Indexed property sets of {} objects", len(properties))
+        return properties
+
+    def _build_zones(self) -> Dict[int, Set[str]]:
+        members: Dict[int, List[int]] = {}
+        names: Dict[int, str] = {}
+        for relation in self.model.by_type("IfcRelAssignsToGroup"):
+            group = relation.RelatingGroup
+            if not group.is_a("IfcZone"):
+                continue
+            names[group.id()] = group.Name or ""
+            members.setdefault(group.id(), []).extend(obj.id() for obj in relation.RelatedObjects or ())
+
+        zones: Dict[int, Set[str]] = {}
+        for zone_id, name in names.items():
+            # Zones may contain zones; members inherit the names of every enclosing zone.
+            pending, seen = list(members.get(zone_id, ())), {zone_id}
+            while pending:
+                member = pending.pop()
+                if member in seen:
+                    continue
+                seen.add(member)
+                zones.setdefault(member, set()).add(name)
+                pending.extend(members.get(member, ()))
+        logger.info("Indexed {} zones over {} objects", len(names), len(zones))
+        return zones
 
+    def _placement(self, placement: ifcopenshell.entity_instance) -> _Transform:
+        cached = self._placements.get(placement.id())
+        if cached is not None:
+            return cached
+        # Attributes are read by position: named access costs several times more per call.
+        relative = placement[1] if placement.is_a() == "IfcLocalPlacement" else None
+        if relative is not None and relative.is_a() == "IfcAxis2Placement3D":
+            rotation, translation = _axis_placement(relative, self.unit_scale)
+            if placement[0] is not None:
+                parent_rotation, parent_translation = self._placement(placement[0])
+                if parent_rotation is not None:
+                    translation = tuple(parent_rotation @ translation)
+                    rotation = parent_rotation if rotation is None else parent_rotation @ rotation
+                translation = tuple(a + b for a, b in zip(parent_translation, translation))
+        else:
+            matrix = np.array(ifcopenshell.util.placement.get_local_placement(placement), dtype=float)
+            rotation, translation = matrix[:3, :3], tuple(matrix[:3, 3] * self.unit_scale)
+        transform = (rotation, translation)
+        self._placements[placement.id()] = transform
+        return transform
 
-def filter_elements(elements: Iterable[Any], config: Dict[str, Any]) -> List[Any]:
+
+@dataclass
+class PropertyRule:
+    """Condition on one property value.
+
+    Attributes:
+        name: Property name.
+        pset: Property set name; ``None`` searches every property set.
+        value: Required value.
+        values: Allowed values.
+        min: Smallest allowed numeric value.
+        max: Largest allowed numeric value.
+    """
+
+    name: str
+    pset: Optional[str] = None
+    value: Any = _MISSING
+    values: Optional[Sequence[Any]] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.value is _MISSING and self.values is None and self.min is None and self.max is None:
+            raise ValueError(f"Property rule for {self.name} needs value, values, min or max.")
+
+    def matches(self, value: Any) -> bool:
+        """Whether a property value satisfies the rule; missing properties never do."""
+        if value is None:
+            return False
+        if self.value is not _MISSING and value != self.value:
+            return False
+        if self.values is not None and value not in self.values:
+            return False
+        if self.min is not None or self.max is not None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False
+            if self.min is not None and value < self.min:
+                return False
+            if self.max is not None and value > self.max:
+                return False
+        return True
+
+
+@dataclass
+class ElementFilter:
+    """Conjunction of element conditions read from the ``filters`` preset section.
+
+    Attributes:
+        storeys: Allowed storey names.
+        is_external: Required ``IsExternal`` value; elements without the
+            property are kept.
+        properties: Property conditions, all of which must hold.
+        zones: Allowed zone names; elements in any of them are kept.
+        bbox_min: Lower corner of the box containing placement origins, in meters.
+        bbox_max: Upper corner of that box, in meters.
+    """
+
+    storeys: Optional[Set[str]] = None
+    is_external: Optional[bool] = None
+    properties: List[PropertyRule] = field(default_factory=list)
+    zones: Optional[Set[str]] = None
+    bbox_min: Optional[Tuple[float, float, float]] = None
+    bbox_max: Optional[Tuple[float, float, float]] = None
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "ElementFilter":
+        """Read conditions from the ``filters`` section of a configuration.
+
+        Args:
+            config: Configuration dictionary.
+
+        Raises:
+            ValueError: If the section has unknown keys or invalid values.
+        """
+        section = dict(config.get("filters") or {})
+        unknown = sorted(set(section) - {"storeys", "is_external", "properties", "zones", "bbox"})
+        if unknown:
+            raise ValueError(f"Unknown element filters: {', '.join(unknown)}")
+
+        bbox = section.get("bbox") or {}
+        if set(bbox) - {"min", "max"}:
+            raise ValueError("bbox accepts only min and max corners.")
+        corners = {}
+        for key in ("min", "max"):
+            if bbox.get(key) is not None:
+                corner = tuple(float(value) for value in bbox[key])
+                if len(corner) != 3:
+                    raise ValueError(f"bbox {key} must have three coordinates.")
+                corners[key] = corner
+
+        rules = []
+        for rule in section.get("properties") or ():
+            unknown = sorted(set(rule) - set(PropertyRule.__dataclass_fields__))
+            if unknown or "name" not in rule:
+                raise ValueError(f"Invalid property rule: {rule}")
+            rules.append(PropertyRule(**rule))
+
+        is_external = section.get("is_external")
+        return cls(
+            storeys=set(section["storeys"]) if section.get("storeys") is not None else None,
+            is_external=None if is_external is None else bool(is_external),
+            properties=rules,
+            zones=set(section["zones"]) if section.get("zones") is not None else None,
+            bbox_min=corners.get("min"),
+            bbox_max=corners.get("max"),
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        """True when no condition is set."""
+        return (
+            self.storeys is None
+            and self.is_external is None
+            and not self.properties
+            and self.zones is None
+            and self.bbox_min is None
+            and self.bbox_max is None
+        )
+
+    def apply(
+        self,
+        elements: Iterable[ifcopenshell.entity_instance],
+        index: ElementIndex,
+    ) -> List[ifcopenshell.entity_instance]:
+        """Keep the elements that satisfy every condition.
+
+        Args:
+            elements: IFC elements.
+            index: Inverse-attribute index of their model.
+
+        Returns:
+            Matching elements in input order.
+        """
+        kept = list(elements)
+        # Cheap lookups run first so later conditions see fewer elements.
+        if self.storeys is not None:
+            kept = [element for element in kept if index.storey(element) in self.storeys]
+        if self.is_external is not None:
+            kept = [element for element in kept if index.is_external(element) in (None, self.is_external)]
+        for rule in self.properties:
+            kept = [element for element in kept if rule.matches(index.property_value(element, rule.name, rule.pset))]
+        if self.zones is not None:
+            kept = [element for element in kept if index.zones(element) & self.zones]
+        if self.bbox_min is not None or self.bbox_max is not None:
+            lower = np.array(self.bbox_min if self.bbox_min is not None else (-np.inf,) * 3)
+            upper = np.array(self.bbox_max if self.bbox_max is not None else (np.inf,) * 3)
+            missing = (np.nan,) * 3
+            origins = np.array([index.origin(element, missing) for element in kept], dtype=float).reshape(-1, 3)
+            inside = np.all((origins >= lower) & (origins <= upper), axis=1)
+            kept = [element for element, keep in zip(kept, inside) if keep]
+        return kept
+
+
+def filter_elements(
+    elements: Iterable[Any],
+    config: Dict[str, Any],
+    index: ElementIndex | None = None,
+) -> List[Any]:
     """Filter elements based on config rules.
 
     Args:
         elements: IFC elements iterable.
-        config: Configuration dictionary.
+        config: Configuration dictionary; conditions are read from ``filters``.
+        index: Index of the elements' model; built from the first element when omitted.
 
     Returns:
         Filtered list of elements.
     """
-    # TODO: Apply category and parameter filters.
-    return list(elements)
+    elements = list(elements)
+    element_filter = ElementFilter.from_config(config)
+    if element_filter.is_empty or not elements:
+        return elements
+    if index is None:
+        index = ElementIndex(elements[0].file)
+    filtered = element_filter.apply(elements, index)
+    logger.info("Element filters kept {} of {} elements", len(filtered), len(elements))
+    return filtered
+
+
+def _axis_placement(placement: ifcopenshell.entity_instance, unit_scale: float) -> _Transform:
+    """Transform of an ``IfcAxis2Placement3D`` with its location in meters."""
+    location, axis, reference = placement[0], placement[1], placement[2]
+    translation = tuple(float(value) * unit_scale for value in location[0])
+    translation = (translation + (0.0, 0.0))[:3]
+    if axis is None and reference is None:
+        return None, translation
+    z = np.asarray(axis[0] if axis is not None else (0.0, 0.0, 1.0), dtype=float)
+    x = np.asarray(reference[0] if reference is not None else (1.0, 0.0, 0.0), dtype=float)
+    z /= np.linalg.norm(z)
+    x -= np.dot(x, z) * z
+    x /= np.linalg.norm(x)
+    return np.column_stack([x, np.cross(z, x), z]), translation
+
+
+def _property_value(prop: ifcopenshell.entity_instance) -> Any:
+    if prop.is_a("IfcPropertySingleValue"):
+        value = prop.NominalValue
+    elif prop.is_a("IfcPropertyEnumeratedValue"):
+        values = prop.EnumerationValues or ()
+        value = values[0] if len(values) == 1 else None
+        if len(values) > 1:
+            return tuple(getattr(item, "wrappedValue", item) for item in values)
+    else:
+        return None
+    return getattr(value, "wrappedValue", value)
@@ -0,0 +1,224 @@
+"""Exterior pre-filter that skips interior elements before tessellation.
+
+Element bounds are estimated from representation parameters (extrusion
+profiles and depths, face set coordinates, mapped items) without building any
+geometry. The boxes are rasterized into a coarse occupancy grid, the air
+connected to the grid border is the exterior, and elements whose box does not
+touch it are interior. ``Pset_*Common.IsExternal = true`` always keeps an
+element; elements whose bounds cannot be estimated are kept as well.
+
+Example:
+    exterior = ExteriorFilter().apply(elements, ElementIndex(model))
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import ifcopenshell
+import ifcopenshell.util.placement
+import numpy as np
+from loguru import logger
+from scipy import ndimage
+
+from bimto3dprint.filters.element_filter import ElementIndex
+
+DEFAULT_CELL_SIZE_M = 0.5
+MAX_GRID_CELLS = 256
+"""Cells along the longest axis; coarser cells are used for larger models."""
+BODY_IDENTIFIERS = ("Body", "Facetation")
+
+
+@dataclass
+class ExteriorFilter:
+    """Keep elements exposed to the air around the building.
+
+    Attributes:
+        cell_size: Occupancy grid cell size in meters; gaps narrower than a cell
+            count as closed, and elements within one cell of the outside air
+            (for example resting on a slab thinner than a cell) are kept.
+    """
+
+    cell_size: float = DEFAULT_CELL_SIZE_M
+
+    def __post_init__(self) -> None:
+        if self.cell_size <= 0:
+            raise ValueError("cell_size must be positive.")
+
+    def apply(
+        self,
+        elements: Sequence[ifcopenshell.entity_instance],
+        index: ElementIndex,
+    ) -> List[ifcopenshell.entity_instance]:
+        """Drop interior elements.
+
+        Args:
+            elements: Candidate elements; all of them occupy the grid.
+            index: Inverse-attribute index of their model.
+
+        Returns:
+            Exterior elements in input order.
+        """
+        elements = list(elements)
+        bounds = np.full((len(elements), 2, 3), np.nan)
+        for position, element in enumerate(elements):
+            box = element_bounds(element, index)
+            if box is not None:
+                bounds[position] = box
+        known = np.flatnonzero(np.isfinite(bounds).all(axis=(1, 2)))
+        if len(known) == 0:
+            logger.info("Exterior pre-filter skipped: no element bounds could be estimated")
+            return elements
+
+        exposed = np.ones(len(elements), dtype=bool)
+        exposed[known] = self._exposed(bounds[known])
+        for position in np.flatnonzero(~exposed):
+            if index.is_external(elements[position]):
+                exposed[position] = True
+
+        kept = [element for element, keep in zip(elements, exposed) if keep]
+        logger.info(
+            "Exterior pre-filter kept {} of {} elements ({} without estimated bounds)",
+            len(kept),
+            len(elements),
+            len(elements) - len(known),
+        )
+        return kept
+
+    def _exposed(self, bounds: np.ndarray) -> np.ndarray:
+        """Whether each box touches the exterior air of the occupancy grid."""
+        lower = bounds[:, 0].min(axis=0)
+        extent = float((bounds[:, 1].max(axis=0) - lower).max())
+        cell = max(self.cell_size, extent / (MAX_GRID_CELLS - 2))
+        # One air cell of padding on every side joins all of the outside into one region.
+        first = np.floor((bounds[:, 0] - lower) / cell).astype(np.int64) + 1
+        last = np.floor((bounds[:, 1] - lower) / cell).astype(np.int64) + 1
+        shape = tuple(last.max(axis=0) + 2)
+
+        # Box coverage from a difference array: +-1 at the eight corners, then prefix sums.
+        difference = np.zeros(tuple(size + 1 for size in shape), dtype=np.int32)
+        for corner in range(8):
+            picks = [(corner >> axis) & 1 for axis in range(3)]
+            coordinates = tuple(np.where(pick, last[:, axis] + 1, first[:, axis]) for axis, pick in enumerate(picks))
+            np.add.at(difference, coordinates, (-1) ** sum(picks))
+        occupied = difference.cumsum(0).cumsum(1).cumsum(2)[:-1, :-1, :-1] > 0
+
+        labels, _ = ndimage.label(~occupied)
+        exterior = labels == labels[0, 0, 0]
+        # A box touches the exterior when its one-cell neighbourhood contains exterior air.
+        total = np.zeros(tuple(size + 1 for size in shape), dtype=np.int32)
+        total[1:, 1:, 1:] = exterior.cumsum(0).cumsum(1).cumsum(2)
+        low = first - 1
+        high = last + 2
+        count = np.zeros(len(bounds), dtype=np.int64)
+        for corner in range(8):
+            picks = [(corner >> axis) & 1 for axis in range(3)]
+            coordinates = tuple(np.where(pick, high[:, axis], low[:, axis]) for axis, pick in enumerate(picks))
+            count += (-1) ** (3 - sum(picks)) * total[coordinates]
+        return count > 0
+
+
+def element_bounds(element: ifcopenshell.entity_instance, index: ElementIndex) -> Optional[np.ndarray]:
+    """Estimate the world bounding box of an element without tessellating it.
+
+    Args:
+        element: IFC element.
+        index: Inverse-attribute index of its model.
+
+    Returns:
+        Array of shape (2, 3) with the lower and upper corner in meters, or
+        ``None`` when the representation is not supported.
+    """
+    representation = getattr(element, "Representation", None)
+    if representation is None:
+        return None
+    items = [
+        item
+        for shape in representation.Representations
+        if shape.RepresentationIdentifier in BODY_IDENTIFIERS
+        for item in shape.Items
+    ]
+    if not items:
+        return None
+    points = []
+    for item in items:
+        item_points = _item_points(item, index.model)
+        if item_points is None:
+            return None
+        points.append(item_points)
+
+    rotation, translation = index.placement(element)
+    world = np.concatenate(points) * index.unit_scale
+    if rotation is not None:
+        world = world @ rotation.T
+    world += translation
+    return np.stack([world.min(axis=0), world.max(axis=0)])
+
+
+def _item_points(item: ifcopenshell.entity_instance, model: ifcopenshell.file) -> Optional[np.ndarray]:
+    """Points bounding a representation item, in its representation's coordinates."""
+    if item.is_a("IfcMappedItem"):
+        matrix = ifcopenshell.util.placement.get_mappeditem_transformation(item)
+        source = [_item_points(part, model) for part in item.MappingSource.MappedRepresentation.Items]
+        if matrix is None or not source or any(points is None for points in source):
+            return None
+        return _transform(np.concatenate(source), np.asarray(matrix, dtype=float))
+    if item.is_a("IfcExtrudedAreaSolid"):
+        profile = _profile_points(item.SweptArea)
+        if profile is None:
+            return None
+        base = np.column_stack([profile, np.zeros(len(profile))])
+        direction = np.asarray(item.ExtrudedDirection.DirectionRatios, dtype=float) * float(item.Depth)
+        points = np.concatenate([base, base + direction])
+        if item.Position is None:
+            return points
+        return _transform(points, np.asarray(ifcopenshell.util.placement.get_axis2placement(item.Position)))
+    if item.is_a("IfcBooleanResult"):
+        # Differences and clippings only remove material from the first operand.
+        if item.Operator != "UNION":
+            return _item_points(item.FirstOperand, model)
+        first, second = _item_points(item.FirstOperand, model), _item_points(item.SecondOperand, model)
+        return None if first is None or second is None else np.concatenate([first, second])
+    if item.is_a("IfcTessellatedFaceSet"):
+        return np.asarray(item.Coordinates.CoordList, dtype=float)
+    # Boundary representations and other explicit geometry: every point they reference.
+    coordinates = [point.Coordinates for point in model.traverse(item) if point.is_a("IfcCartesianPoint")]
+    if not coordinates or any(len(point) != 3 for point in coordinates):
+        return None
+    return np.asarray(coordinates, dtype=float)
+
+
+def _profile_points(profile: ifcopenshell.entity_instance) -> Optional[np.ndarray]:
+    """Points bounding a profile in its XY plane."""
+    if profile.is_a("IfcArbitraryClosedProfileDef"):
+        curve = profile.OuterCurve
+        if curve.is_a("IfcPolyline"):
+            points = [point.Coordinates for point in curve.Points]
+        elif curve.is_a("IfcIndexedPolyCurve"):
+            points = curve.Points.CoordList
+        else:
+            points = [point.Coordinates for point in curve.file.traverse(curve) if point.is_a("IfcCartesianPoint")]
+        points = np.asarray(points, dtype=float)
+        return points[:, :2] if points.ndim == 2 and len(points) else None
+
+    if profile.is_a("IfcCircleProfileDef"):
+        half = np.array([profile.Radius, profile.Radius], dtype=float)
+    else:
+        # Parameterized profiles give their overall size under one of these attribute pairs.
+        half = None
+        for width, depth in (("XDim", "YDim"), ("OverallWidth", "OverallDepth"), ("Width", "Depth")):
+            if hasattr(profile, width) and hasattr(profile, depth):
+                half = np.array([getattr(profile, width), getattr(profile, depth)], dtype=float) / 2.0
+                break
+        if half is None:
+            return None
+    corners = np.array([[-1.0, -1.0], [1.0, -1.0], [1.0, 1.0], [-1.0, 1.0]]) * half
+    position = getattr(profile, "Position", None)
+    if position is None:
+        return corners
+    matrix = np.asarray(ifcopenshell.util.placement.get_axis2placement(position), dtype=float)
+    return corners @ matrix[:2, :2].T + matrix[:2, 3]
+
+
+def _transform(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
@@ -2,36 +2,98 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import click
 import trimesh
 from loguru import logger
 
+from bimto3dprint.batch import BatchRunner, collect_jobs, write_summary
 from bimto3dprint.config import ConfigManager
-from bimto3dprint.exporters.fbx_exporter import FBXExporter
-from bimto3dprint.exporters.obj_exporter import OBJExporter
-from bimto3dprint.exporters.stl_exporter import STLExporter
-from bimto3dprint.processors.mesh_optimizer import MeshOptimizer
-from bimto3dprint.processors.shell_extractor import ShellExtractor
+from bimto3dprint.daemon import DEFAULT_HOST, DEFAULT_PORT, ProcessingDaemon
+from bimto3dprint.pipeline import PipelineOptionsError, ProcessOptions, run_pipeline
+from bimto3dprint.processors.tessellation_cache import DEFAULT_CACHE_DIR
+from bimto3dprint.processors.thickness import ThicknessAnalyzer
 from bimto3dprint.utils.logger import get_logger
-from bimto3dprint.utils.units import normalize_to_millimeters
-
-PRESET_ERROR_MESSAGE = (
-    "Revit preset contains BuiltInCategory.* and cannot be used with internal IFC extractor. "
-    "Use --use-tudelft-extractor or choose a python preset."
+from bimto3dprint.validators.mesh_validator import MeshValidator
+
+_PIPELINE_OPTIONS: tuple[Callable[[Callable[..., Any]], Callable[..., Any]], ...] = (
+    click.option("--preset", default="shell_only", show_default=True, help="Preset name or path"),
+    click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(["3mf", "fbx", "glb", "obj", "stl"], case_sensitive=False),
+        default="stl",
+        show_default=True,
+    ),
+    click.option("--scale", type=float, default=1.0, show_default=True),
+    click.option("--simplify", type=str, default=None),
+    click.option(
+        "--lods",
+        type=str,
+        default=None,
+        help="Also export a decimation pyramid, e.g. 'high,medium,low' or '0.5,0.2,0.05', as <output>.lod<N>.",
+    ),
+    click.option("--use-tudelft-extractor", is_flag=True, help="Use TU Delft envelope extractor"),
+    click.option(
+        "--extractor-path",
+        type=click.Path(path_type=Path),
+        help="Path to TU Delft extractor exe or directory with multiple schema builds.",
+    ),
+    click.option("--lod", type=float, default=2.2, show_default=True),
+    click.option("--voxel", "voxel_size", type=float, default=1.0, show_default=True),
+    click.option(
+        "--threads",
+        type=int,
+        default=8,
+        show_default=True,
+        help="Worker threads for IFC tessellation and the TU Delft extractor.",
+    ),
+    click.option("--no-thicken", is_flag=True, help="Skip wall thickening step"),
+    click.option("--min-wall-mm", type=float, default=2.0, show_default=True),
+    click.option(
+        "--cache-dir",
+        type=click.Path(path_type=Path, file_okay=False),
+        default=DEFAULT_CACHE_DIR,
+        show_default=True,
+        help="Directory of the persistent tessellation cache.",
+    ),
+    click.option("--no-cache", is_flag=True, help="Disable the tessellation cache"),
+    click.option(
+        "--chunk-faces",
+        type=int,
+        default=None,
+        help="Stream element geometry to the envelope stage in chunks of this many faces.",
+    ),
+    click.option(
+        "--groups",
+        type=click.Choice(["ifc_class", "storey"]),
+        default=None,
+        help=(
+            "Group exported faces by the IFC class or storey of the elements they cover "
+            "(OBJ groups, 3MF base materials, GLB nodes)."
+        ),
+    ),
+    click.option(
+        "--profile-report",
+        is_flag=True,
+        help="Write per-stage timings, CPU time, peak RSS and mesh sizes to <output>.profile.json.",
+    ),
+    click.option("--profile-dump", is_flag=True, help="Write a cProfile dump per stage next to the output."),
+    click.option(
+        "--thickness-map",
+        is_flag=True,
+        help="Write per-face wall thickness to <output>.thickness.npy and a colored <output>.thickness.ply.",
+    ),
+    click.option("--preview", is_flag=True, help="Also write a compact quantized <output>.preview.glb for viewers."),
 )
 
 
-def _select_exporter(fmt: str):
-    fmt = fmt.lower()
-    if fmt == "stl":
-        return STLExporter()
-    if fmt == "obj":
-        return OBJExporter()
-    if fmt == "fbx":
-        return FBXExporter()
-    raise ValueError(f"Unsupported export format: {fmt}")
+def pipeline_options(command: Callable[..., Any]) -> Callable[..., Any]:
+    """Attach the shared processing options to a click command."""
+    for option in reversed(_PIPELINE_OPTIONS):
+        command = option(command)
+    return command
 
 
 @click.group()
@@ -42,121 +104,109 @@ def cli() -> None:
 
 @cli.command("process")
 @click.argument("ifc_file", type=click.Path(path_type=Path, exists=True))
-@click.option("--preset", default="shell_only", show_default=True, help="Preset name or path")
 @click.option("--output", "output_path", type=click.Path(path_type=Path), required=True)
+@pipeline_options
+def process_command(ifc_file: Path, output_path: Path, **option_values: Any) -> None:
+    """Process an IFC file and export a printable mesh."""
+    options = ProcessOptions(**option_values)
+    try:
+        run_pipeline(ifc_file, output_path, options)
+    except PipelineOptionsError as exc:
+        raise click.UsageError(str(exc)) from exc
+
+
+@cli.command("batch")
+@click.argument("source", type=click.Path(path_type=Path, exists=True))
 @click.option(
-    "--format",
-    "output_format",
-    type=click.Choice(["fbx", "obj", "stl"], case_sensitive=False),
-    default="stl",
+    "--output-dir",
+    type=click.Path(path_type=Path, file_okay=False),
+    default=Path("output"),
     show_default=True,
+    help="Directory for outputs of files without an explicit manifest output.",
+)
+@click.option("--jobs", type=int, default=2, show_default=True, help="Maximum concurrent worker processes.")
+@click.option(
+    "--max-memory-mb",
+    type=float,
+    default=None,
+    help="Memory budget for admitting jobs (default: 80% of available memory).",
 )
-@click.option("--scale", type=float, default=1.0, show_default=True)
-@click.option("--simplify", type=str, default=None)
-@click.option("--use-tudelft-extractor", is_flag=True, help="Use TU Delft envelope extractor")
 @click.option(
-    "--extractor-path",
-    type=click.Path(path_type=Path),
-    help="Path to TU Delft extractor exe or directory with multiple schema builds.",
+    "--report",
+    "report_path",
+    type=click.Path(path_type=Path, dir_okay=False),
+    default=None,
+    help="Summary report path (default: <output-dir>/batch_report.json).",
 )
-@click.option("--lod", type=float, default=2.2, show_default=True)
-@click.option("--voxel", "voxel_size", type=float, default=1.0, show_default=True)
-@click.option("--threads", type=int, default=8, show_default=True)
-@click.option("--no-thicken", is_flag=True, help="Skip wall thickening step")
-@click.option("--min-wall-mm", type=float, default=2.0, show_default=True)
-def process_command(
-    ifc_file: Path,
-    preset: str,
-    output_path: Path,
-    output_format: str,
-    scale: float,
-    simplify: str | None,
-    use_tudelft_extractor: bool,
-    extractor_path: Path | None,
-    lod: float,
-    voxel_size: float,
-    threads: int,
-    no_thicken: bool,
-    min_wall_mm: float,
+@pipeline_options
+def batch_command(
+    source: Path,
+    output_dir: Path,
+    jobs: int,
+    max_memory_mb: float | None,
+    report_path: Path | None,
+    **option_values: Any,
 ) -> None:
-    """Process an IFC file and export a printable mesh."""
-    logger.info("Starting IFC processing for {}", ifc_file)
-
-    manager = ConfigManager()
-    preset_type = _resolve_preset_type(preset)
-    config = manager.load_preset(preset)
-    if not use_tudelft_extractor and _contains_revit_categories(config):
-        raise click.UsageError(PRESET_ERROR_MESSAGE)
-    if preset_type == "revit" and not use_tudelft_extractor:
-        raise click.UsageError(PRESET_ERROR_MESSAGE)
-
-    if use_tudelft_extractor:
-        if extractor_path is None:
-            raise click.UsageError("--extractor-path is required with --use-tudelft-extractor")
-
-        config["tudelft_extractor"] = {
-            "extractor_path": str(extractor_path),
-            "lod": lod,
-            "voxel_size": voxel_size,
-            "threads": threads,
-        }
-        logger.info("Configured TU Delft extractor: {}", extractor_path)
-
-    extractor = ShellExtractor()
-    mesh = extractor.extract_from_ifc(ifc_file, config)
-    mesh, unit_scale_factor = normalize_to_millimeters(mesh)
-    mesh_units = "meters" if unit_scale_factor == 1000.0 else "millimeters"
-
-    if simplify:
-        logger.info("Applying simplification level: {}", simplify)
-        mesh = extractor.simplify_shell(mesh, simplify)
-
-    if scale <= 0:
-        raise click.UsageError("--scale must be positive")
-    if scale != 1.0:
-        logger.info("Scaling mesh by factor {:.3f}", scale)
-        mesh.apply_scale(scale)
-
-    if min_wall_mm <= 0:
-        raise click.UsageError("--min-wall-mm must be positive")
-
-    optimizer = MeshOptimizer()
-    mesh = optimizer.ensure_watertight(mesh)
-    if no_thicken:
-        logger.info("Wall thickening skipped")
-    else:
-        logger.info("Wall thickening applied: {:.2f} mm", min_wall_mm)
-        mesh = optimizer.thicken_walls(mesh, min_thickness_mm=min_wall_mm)
-    mesh = optimizer.smooth_surface(mesh)
-    report = optimizer.validate_for_printing(mesh)
-
-    exporter = _select_exporter(output_format)
-    exporter.export(
-        mesh,
-        output_path,
-        metadata={
-            "report": report,
-            "mesh_units": mesh_units,
-            "unit_scale_factor": unit_scale_factor,
-            "user_scale_factor": scale,
-        },
-    )
-
-    logger.info("Validation report: {}", report)
-    logger.info("Processing completed")
+    """Process a directory of IFC files or a JSON manifest on a process pool."""
+    if jobs <= 0:
+        raise click.UsageError("--jobs must be positive")
+    if max_memory_mb is not None and max_memory_mb <= 0:
+        raise click.UsageError("--max-memory-mb must be positive")
+
+    options = ProcessOptions(**option_values)
+    try:
+        batch_jobs = collect_jobs(source, output_dir, options)
+        for job in batch_jobs:
+            job.options.validate()
+    except (ValueError, FileNotFoundError) as exc:
+        raise click.UsageError(str(exc)) from exc
+    if not batch_jobs:
+        raise click.UsageError(f"No IFC files found in {source}")
+
+    summary = BatchRunner(workers=jobs, memory_budget_mb=max_memory_mb).run(batch_jobs)
+    write_summary(summary, report_path or output_dir / "batch_report.json")
+    if summary.failed:
+        raise SystemExit(1)
+
+
+@cli.command("serve")
+@click.option("--host", default=DEFAULT_HOST, show_default=True, help="Interface to bind the job API to.")
+@click.option("--port", type=int, default=DEFAULT_PORT, show_default=True)
+@click.option("--workers", type=int, default=2, show_default=True, help="Warm worker processes.")
+@click.option(
+    "--preload",
+    "presets",
+    multiple=True,
+    help="Preset to parse at worker start (repeatable; default: all available presets).",
+)
+def serve_command(host: str, port: int, workers: int, presets: tuple[str, ...]) -> None:
+    """Run the resident processing daemon with a localhost job API."""
+    if workers <= 0:
+        raise click.UsageError("--workers must be positive")
+    if host not in {"127.0.0.1", "localhost", "::1"}:
+        logger.warning("Daemon job API bound to non-loopback host {}; it has no authentication", host)
+    daemon = ProcessingDaemon(host=host, port=port, workers=workers, presets=list(presets) or None)
+    daemon.serve_forever()
 
 
 @cli.command("validate")
 @click.argument("mesh_file", type=click.Path(path_type=Path, exists=True))
-def validate_command(mesh_file: Path) -> None:
+@click.option(
+    "--thickness",
+    "with_thickness",
+    is_flag=True,
+    help="Also measure wall thickness on every face (much slower than the topology checks).",
+)
+def validate_command(mesh_file: Path, with_thickness: bool) -> None:
     """Validate a mesh file for 3D printing."""
     logger.info("Loading mesh for validation: {}", mesh_file)
     mesh = trimesh.load(mesh_file, force="mesh")
     if not isinstance(mesh, trimesh.Trimesh):
         raise click.UsageError("Provided file could not be loaded as a mesh")
 
-    optimizer = MeshOptimizer()
-    report = optimizer.validate_for_printing(mesh)
+    report = MeshValidator().validate(mesh)
+    if with_thickness:
+        report["thickness"] = ThicknessAnalyzer().analyze(mesh).to_dict()
     logger.info("Validation report: {}", report)
 
 
@@ -173,22 +223,5 @@ def list_presets_command() -> None:
         click.echo(preset)
 
 
-def _resolve_preset_type(preset: str) -> str:
-    preset_path = Path(preset)
-    if preset_path.exists():
-        return "path"
-    if ":" in preset:
-        prefix, _ = preset.split(":", 1)
-        if prefix in {"python", "revit"}:
-            return prefix
-    return "python"
-
-
-def _contains_revit_categories(config: dict[str, Any]) -> bool:
-    categories = config.get("categories", {})
-    include = categories.get("include", [])
-    return any(str(item).startswith("BuiltInCategory.") for item in include)
-
-
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,422 @@
+"""IFC processing pipeline shared by the CLI commands.
+
+Example:
+    from pathlib import Path
+
+    options = ProcessOptions(preset="python:shell_only", output_format="stl")
+    report = run_pipeline(Path("model.ifc"), Path("out/model.stl"), options)
+"""
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Iterable, Mapping
+
+import trimesh
+from loguru import logger
+
+from bimto3dprint.config import ConfigManager
+from bimto3dprint.exporters.fbx_exporter import FBXExporter
+from bimto3dprint.exporters.glb_exporter import GLBExporter
+from bimto3dprint.exporters.obj_exporter import OBJExporter
+from bimto3dprint.exporters.stl_exporter import STLExporter
+from bimto3dprint.exporters.threemf_exporter import ThreeMFExporter
+from bimto3dprint.filters.element_filter import ElementFilter
+from bimto3dprint.processors.lod import LodPyramid, parse_lod_levels
+from bimto3dprint.processors.mesh_optimizer import MeshOptimizer
+from bimto3dprint.processors.planar_remesh import PLANAR_TOLERANCE_VOXELS
+from bimto3dprint.processors.provenance import GROUP_KEYS, PROVENANCE_KEY
+from bimto3dprint.processors.shell_extractor import ShellExtractor
+from bimto3dprint.processors.smoothing import VOXEL_PITCH_KEY
+from bimto3dprint.processors.tessellation_cache import DEFAULT_CACHE_DIR, TessellationCache
+from bimto3dprint.processors.thickness import ThicknessAnalyzer
+from bimto3dprint.utils.profiling import StageProfiler, StageRecord
+from bimto3dprint.utils.units import normalize_to_millimeters
+from bimto3dprint.validators.print_validator import PrintSettings, PrintValidator
+
+PRESET_ERROR_MESSAGE = (
+    "Revit preset contains BuiltInCategory.* and cannot be used with internal IFC extractor. "
+    "Use --use-tudelft-extractor or choose a python preset."
+)
+
+PIPELINE_STAGES: tuple[str, ...] = (
+    "extract",
+    "normalize",
+    "simplify",
+    "watertight",
+    "thicken",
+    "smooth",
+    "validate",
+    "lods",
+    "export",
+)
+
+ProgressCallback = Callable[[str, float], None]
+
+_PRESET_CACHE: dict[Path, tuple[int, dict[str, Any]]] = {}
+"""Parsed presets by resolved file, with the file mtime they were parsed at."""
+
+
+class PipelineOptionsError(ValueError):
+    """Raised when pipeline options are invalid."""
+
+
+@dataclass
+class ProcessOptions:
+    """Options of a single IFC processing run."""
+
+    preset: str = "shell_only"
+    output_format: str = "stl"
+    scale: float = 1.0
+    simplify: str | None = None
+    lods: str | None = None
+    use_tudelft_extractor: bool = False
+    extractor_path: Path | None = None
+    lod: float = 2.2
+    voxel_size: float = 1.0
+    threads: int = 8
+    no_thicken: bool = False
+    min_wall_mm: float = 2.0
+    cache_dir: Path = DEFAULT_CACHE_DIR
+    no_cache: bool = False
+    chunk_faces: int | None = None
+    groups: str | None = None
+    profile_report: bool = False
+    profile_dump: bool = False
+    thickness_map: bool = False
+    preview: bool = False
+
+    def replace(self, overrides: Mapping[str, Any]) -> "ProcessOptions":
+        """Return a copy with overridden fields.
+
+        Args:
+            overrides: Field values keyed by option name (``format`` is accepted for ``output_format``).
+
+        Raises:
+            PipelineOptionsError: If ``overrides`` is not a mapping, or an override names
+                an unknown option or has the wrong type.
+        """
+        if not isinstance(overrides, Mapping):
+            raise PipelineOptionsError(f"Option overrides must be an object, got {type(overrides).__name__}")
+        annotations = {item.name: item.type for item in fields(self)}
+        values = {item.name: getattr(self, item.name) for item in fields(self)}
+        for key, value in overrides.items():
+            name = "output_format" if key == "format" else str(key).replace("-", "_")
+            if name not in annotations:
+                raise PipelineOptionsError(f"Unknown option override: {key}")
+            values[name] = _coerce_option(key, str(annotations[name]), value)
+        return ProcessOptions(**values)
+
+    def validate(self) -> None:
+        """Validate option values.
+
+        Raises:
+            PipelineOptionsError: If a value is out of range.
+        """
+        if self.scale <= 0:
+            raise PipelineOptionsError("--scale must be positive")
+        if self.min_wall_mm <= 0:
+            raise PipelineOptionsError("--min-wall-mm must be positive")
+        if self.threads <= 0:
+            raise PipelineOptionsError("--threads must be positive")
+        if self.chunk_faces is not None and self.chunk_faces <= 0:
+            raise PipelineOptionsError("--chunk-faces must be positive")
+        if self.lods is not None:
+            try:
+                parse_lod_levels(self.lods)
+            except ValueError as exc:
+                raise PipelineOptionsError(f"--lods: {exc}") from exc
+        if self.groups is not None and self.groups not in GROUP_KEYS:
+            raise PipelineOptionsError(f"--groups must be one of: {', '.join(GROUP_KEYS)}")
+        if self.use_tudelft_extractor and self.groups is not None:
+            raise PipelineOptionsError("--groups requires the internal extractor")
+        if self.output_format.lower() not in {"3mf", "fbx", "glb", "obj", "stl"}:
+            raise PipelineOptionsError(f"Unsupported export format: {self.output_format}")
+        if self.use_tudelft_extractor and self.extractor_path is None:
+            raise PipelineOptionsError("--extractor-path is required with --use-tudelft-extractor")
+
+
+def _coerce_option(key: str, annotation: str, value: Any) -> Any:
+    """Check an override from JSON against its field annotation (``float``, ``Path | None``, ...)."""
+    base, _, optional = annotation.partition(" | ")
+    if value is None:
+        if optional == "None":
+            return None
+    elif base == "bool":
+        if isinstance(value, bool):
+            return value
+    elif base == "int":
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif base == "float":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    elif base == "str":
+        if isinstance(value, str):
+            return value
+    elif base == "Path":
+        if isinstance(value, (str, Path)):
+            return Path(value)
+    expected = f"{base} or null" if optional == "None" else base
+    raise PipelineOptionsError(f"Option {key} must be {expected}, got {type(value).__name__}")
+
+
+def select_exporter(fmt: str):
+    """Return the exporter instance for a format name."""
+    fmt = fmt.lower()
+    if fmt == "stl":
+        return STLExporter()
+    if fmt == "obj":
+        return OBJExporter()
+    if fmt == "fbx":
+        return FBXExporter()
+    if fmt == "3mf":
+        return ThreeMFExporter()
+    if fmt == "glb":
+        return GLBExporter()
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def load_pipeline_config(options: ProcessOptions, manager: ConfigManager | None = None) -> dict[str, Any]:
+    """Load and validate the preset configuration for a run.
+
+    Parsed presets are memoized per process, so repeated runs in one interpreter
+    (batch workers, the daemon) do not re-read preset files; a preset is parsed
+    again once its file changes.
+
+    Args:
+        options: Processing options.
+        manager: Optional preset manager.
+
+    Returns:
+        Configuration dictionary owned by the caller.
+
+    Raises:
+        PipelineOptionsError: If the preset does not match the selected extractor or
+            has invalid element filters or printer settings.
+    """
+    config = copy.deepcopy(_load_preset_cached(options.preset, manager))
+
+    preset_type = resolve_preset_type(options.preset)
+    if not options.use_tudelft_extractor and contains_revit_categories(config):
+        raise PipelineOptionsError(PRESET_ERROR_MESSAGE)
+    if preset_type == "revit" and not options.use_tudelft_extractor:
+        raise PipelineOptionsError(PRESET_ERROR_MESSAGE)
+
+    if options.use_tudelft_extractor:
+        config["tudelft_extractor"] = {
+            "extractor_path": str(options.extractor_path),
+            "lod": options.lod,
+            "voxel_size": options.voxel_size,
+            "threads": options.threads,
+        }
+        logger.info("Configured TU Delft extractor: {}", options.extractor_path)
+
+    if options.chunk_faces is not None:
+        config["chunk_faces"] = options.chunk_faces
+    if options.groups is not None:
+        config["face_groups"] = options.groups
+    try:
+        ElementFilter.from_config(config)
+        PrintSettings.from_config(config)
+    except (TypeError, ValueError) as exc:
+        raise PipelineOptionsError(str(exc)) from exc
+    return config
+
+
+def preload_presets(presets: Iterable[str], manager: ConfigManager | None = None) -> None:
+    """Parse presets ahead of time so later runs in this process skip preset I/O.
+
+    Args:
+        presets: Preset names or paths.
+        manager: Optional preset manager.
+    """
+    manager = manager or ConfigManager()
+    for preset in presets:
+        try:
+            _load_preset_cached(preset, manager)
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not preload preset {}: {}", preset, exc)
+
+
+def run_pipeline(
+    ifc_file: Path,
+    output_path: Path,
+    options: ProcessOptions,
+    manager: ConfigManager | None = None,
+    progress: ProgressCallback | None = None,
+) -> dict[str, Any]:
+    """Process an IFC file and export a printable mesh.
+
+    Args:
+        ifc_file: Input IFC path.
+        output_path: Export path.
+        options: Processing options.
+        manager: Optional preset manager.
+        progress: Optional callback invoked with the stage name and completed fraction
+            before each stage of ``PIPELINE_STAGES``. It may raise to abort the run.
+
+    Returns:
+        Validation report of the exported mesh.
+
+    Raises:
+        PipelineOptionsError: If options or preset are invalid.
+    """
+    logger.info("Starting IFC processing for {}", ifc_file)
+    options.validate()
+    config = load_pipeline_config(options, manager)
+
+    profiler = StageProfiler(dump_prefix=Path(output_path).with_suffix("") if options.profile_dump else None)
+
+    def stage(name: str, mesh: trimesh.Trimesh | None = None) -> ContextManager[StageRecord]:
+        if progress is not None:
+            progress(name, PIPELINE_STAGES.index(name) / len(PIPELINE_STAGES))
+        return profiler.stage(name, mesh)
+
+    try:
+        cache = None if options.no_cache else TessellationCache(options.cache_dir)
+        extractor = ShellExtractor(threads=options.threads, cache=cache)
+        with stage("extract") as record:
+            mesh = extractor.extract_from_ifc(ifc_file, config)
+            record.output(mesh)
+        # Voxel envelopes carry their pitch, which is rescaled along with the mesh for smoothing.
+        voxel_pitch = mesh.metadata.pop(VOXEL_PITCH_KEY, None)
+        provenance = mesh.metadata.pop(PROVENANCE_KEY, None)
+        with stage("normalize", mesh):
+            mesh, unit_scale_factor = normalize_to_millimeters(mesh)
+        if voxel_pitch is not None:
+            voxel_pitch *= unit_scale_factor
+        if provenance is not None:
+            provenance.apply_scale(unit_scale_factor)
+        mesh_units = "meters" if unit_scale_factor == 1000.0 else "millimeters"
+
+        with stage("simplify", mesh) as record:
+            if options.simplify:
+                logger.info("Applying simplification level: {}", options.simplify)
+                mesh = extractor.simplify_shell(mesh, options.simplify)
+                record.output(mesh)
+
+            if options.scale != 1.0:
+                logger.info("Scaling mesh by factor {:.3f}", options.scale)
+                mesh.apply_scale(options.scale)
+                if voxel_pitch is not None:
+                    voxel_pitch *= options.scale
+                if provenance is not None:
+                    provenance.apply_scale(options.scale)
+
+        optimizer = MeshOptimizer()
+        with stage("watertight", mesh) as record:
+            mesh = optimizer.ensure_watertight(mesh)
+            record.output(mesh)
+        with stage("thicken", mesh) as record:
+            if options.no_thicken:
+                logger.info("Wall thickening skipped")
+            else:
+                logger.info("Wall thickening applied: {:.2f} mm", options.min_wall_mm)
+                mesh = optimizer.thicken_walls(
+                    mesh,
+                    min_thickness_mm=options.min_wall_mm,
+                    planar_tolerance=config.get("planar_tolerance", PLANAR_TOLERANCE_VOXELS),
+                )
+                voxel_pitch = mesh.metadata.get(VOXEL_PITCH_KEY, voxel_pitch)
+                record.output(mesh)
+        with stage("smooth", mesh) as record:
+            mesh = optimizer.smooth_surface(mesh, voxel_pitch=voxel_pitch)
+            record.output(mesh)
+        with stage("validate", mesh):
+            thickness = ThicknessAnalyzer().analyze(mesh)
+            report = optimizer.validate_for_printing(mesh, thickness=thickness)
+            report["printability"] = PrintValidator(PrintSettings.from_config(config)).validate(mesh, thickness)
+            if options.thickness_map:
+                heatmap_path = thickness_map_path(output_path)
+                thickness.save(heatmap_path.with_suffix(".npy"))
+                thickness.export_ply(mesh, heatmap_path, min_thickness=options.min_wall_mm)
+
+        levels = []
+        with stage("lods", mesh):
+            if options.lods:
+                levels = LodPyramid(extractor.decimate).build(mesh, parse_lod_levels(options.lods))
+                report["lods"] = [
+                    {**level.summary(), "path": str(lod_path(output_path, level.index))} for level in levels
+                ]
+
+        with stage("export", mesh):
+            exporter = select_exporter(options.output_format)
+            metadata = {
+                "report": report,
+                "mesh_units": mesh_units,
+                "unit_scale_factor": unit_scale_factor,
+                "user_scale_factor": options.scale,
+            }
+            outputs = [(mesh, Path(output_path), exporter)]
+            if options.preview:
+                outputs.append((mesh, preview_path(output_path), GLBExporter.compact()))
+            outputs += [(level.mesh, lod_path(output_path, level.index), exporter) for level in levels]
+            grouped = None
+            for output_mesh, path, output_exporter in outputs:
+                if provenance is not None and output_mesh is not grouped:
+                    metadata["face_groups"] = provenance.assign(output_mesh)
+                    grouped = output_mesh
+                output_exporter.export(output_mesh, path, metadata=metadata)
+    finally:
+        if options.profile_report:
+            profiler.write(profile_report_path(output_path))
+
+    logger.info("Validation report: {}", report)
+    logger.info("Processing completed")
+    return report
+
+
+def profile_report_path(output_path: Path) -> Path:
+    """Return the timing report path written next to an export."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.profile.json")
+
+
+def preview_path(output_path: Path) -> Path:
+    """Return the compact GLB preview path written next to an export."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.preview.glb")
+
+
+def lod_path(output_path: Path, level: int) -> Path:
+    """Return the export path of a detail level written next to the full-resolution export."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.lod{level}{output_path.suffix}")
+
+
+def thickness_map_path(output_path: Path) -> Path:
+    """Return the thickness heatmap path written next to an export."""
+    output_path = Path(output_path)
+    return output_path.with_name(f"{output_path.stem}.thickness.ply")
+
+
+def _load_preset_cached(preset: str, manager: ConfigManager | None) -> dict[str, Any]:
+    manager = manager or ConfigManager()
+    # Names resolve to files so a long-lived process (the daemon) picks up edited presets by mtime.
+    preset_path = manager.resolve_preset_path(preset).resolve()
+    mtime = preset_path.stat().st_mtime_ns
+    cached = _PRESET_CACHE.get(preset_path)
+    if cached is None or cached[0] != mtime:
+        cached = _PRESET_CACHE[preset_path] = (mtime, manager.load_preset(str(preset_path)))
+    return cached[1]
+
+
+def resolve_preset_type(preset: str) -> str:
+    """Classify a preset reference as ``path``, ``python`` or ``revit``."""
+    preset_path = Path(preset)
+    if preset_path.exists():
+        return "path"
+    if ":" in preset:
+        prefix, _ = preset.split(":", 1)
+        if prefix in {"python", "revit"}:
+            return prefix
+    return "python"
+
+
+def contains_revit_categories(config: dict[str, Any]) -> bool:
+    """Return True when the preset lists Revit ``BuiltInCategory.*`` categories."""
+    categories = config.get("categories", {})
+    include = categories.get("include", [])
+    return any(str(item).startswith("BuiltInCategory.") for item in include)
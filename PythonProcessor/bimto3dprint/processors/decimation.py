@@ -0,0 +1,349 @@
+"""Vectorized quadric edge-collapse decimation.
+
+Every vertex carries the area-weighted quadric of its face planes. Each pass
+ranks all edges by collapse error and gathers, in a few greedy rounds, edges that
+are the cheapest within two rings of their endpoints, so no face sees two
+collapses. The link condition and face flips are checked for a whole round at
+once and the survivors of all rounds are applied in one NumPy step.
+
+Coplanar regions cost nothing and collapse first, so the flat walls of
+marching-cubes envelopes merge into a few large triangles; voxel staircases
+cost about one voxel pitch and collapse next into planar slopes, while corners
+and creases, where quadrics of different planes meet, stay put. Vertices on
+boundary and non-manifold edges never move; interior vertices may collapse onto
+them.
+
+Example:
+    decimated = QuadricDecimator().decimate(mesh, target_faces=20000)
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.utils.topology import EdgeIndex
+
+QUADRIC_SIZE = 10
+"""Stored quadric entries: aa ab ac ad bb bc bd cc cd dd of the plane ax + by + cz + d = 0."""
+SELECTION_ROUNDS = 8
+"""Greedy selection rounds per collapse pass."""
+_RANK_NONE = np.iinfo(np.int64).max
+
+
+@dataclass
+class QuadricDecimator:
+    """Reduce triangle meshes with batched quadric edge collapses.
+
+    Attributes:
+        min_normal_cos: Smallest cosine between a face normal before and after a
+            collapse; collapses turning any face further are rejected.
+        max_passes: Upper bound on collapse passes.
+        seed: Seed of the tie-breaking order, so results are reproducible.
+    """
+
+    min_normal_cos: float = 0.2
+    max_passes: int = 500
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if not -1.0 <= self.min_normal_cos < 1.0:
+            raise ValueError("min_normal_cos must be in [-1, 1).")
+        if self.max_passes <= 0:
+            raise ValueError("max_passes must be positive.")
+
+    def decimate(self, mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+        """Collapse edges until the mesh has at most ``target_faces`` faces.
+
+        Stops early when no valid collapse is left.
+
+        Args:
+            mesh: Input mesh.
+            target_faces: Face count to reach.
+
+        Returns:
+            Decimated mesh without unreferenced vertices.
+        """
+        start = time.perf_counter()
+        random = np.random.default_rng(self.seed)
+        vertices = np.array(mesh.vertices, dtype=np.float64)
+        faces = np.array(mesh.faces, dtype=np.int64)
+        quadrics = _vertex_quadrics(vertices, faces)
+        index = EdgeIndex.build(faces)
+        locked = np.zeros(len(vertices), dtype=bool)
+        locked[index.edges[index.counts != 2].ravel()] = True
+
+        passes = 0
+        while len(faces) > target_faces and passes < self.max_passes:
+            collapsed, faces = self._collapse_pass(
+                vertices, faces, quadrics, locked, len(faces) - target_faces, random
+            )
+            passes += 1
+            if collapsed == 0:
+                break
+
+        result = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+        result.remove_unreferenced_vertices()
+        logger.info(
+            "Quadric decimation: {} -> {} faces in {} passes ({:.2f} s)",
+            len(mesh.faces),
+            len(result.faces),
+            passes,
+            time.perf_counter() - start,
+        )
+        return result
+
+    def _collapse_pass(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        quadrics: np.ndarray,
+        locked: np.ndarray,
+        excess: int,
+        random: np.random.Generator,
+    ) -> Tuple[int, np.ndarray]:
+        """Apply one batch of independent collapses in place; returns the count and new faces."""
+        index = EdgeIndex.build(faces)
+        edges = index.edges
+        first, second = edges[:, 0], edges[:, 1]
+        valid = np.flatnonzero((index.counts == 2) & ~(locked[first] & locked[second]))
+        edge_quadrics = quadrics[:, first[valid]] + quadrics[:, second[valid]]
+        positions, costs = _best_endpoint(vertices[first[valid]], vertices[second[valid]], edge_quadrics)
+        # An edge reaching a boundary vertex may only collapse onto it.
+        anchor = np.where(locked[first[valid]], first[valid], second[valid])
+        anchored = locked[first[valid]] | locked[second[valid]]
+        positions[anchored] = vertices[anchor[anchored]]
+        costs[anchored] = np.maximum(_quadric_error(edge_quadrics[:, anchored], positions[anchored]), 0.0)
+
+        # Rank edges by cost; ties (coplanar regions cost nothing) are broken randomly so that
+        # they collapse in many places at once instead of along the vertex order.
+        shuffled = random.permutation(len(valid))
+        rank = np.full(len(edges), _RANK_NONE, dtype=np.int64)
+        rank[valid[shuffled[np.argsort(costs[shuffled], kind="stable")]]] = np.arange(len(valid))
+        order = rank.copy()
+        slot = np.full(len(edges), -1, dtype=np.int64)
+        slot[valid] = np.arange(len(valid))
+        neighbours = _Neighbours(edges, len(vertices))
+        corners = _Corners(faces, len(vertices))
+
+        # Greedy rounds grow the batch towards a maximal set: collapses accepted in earlier rounds
+        # block the one rings of their endpoints, and rejected ones stop shadowing their neighbours.
+        accepted = []
+        blocked = np.zeros(len(vertices), dtype=bool)
+        for _ in range(SELECTION_ROUNDS):
+            selected = _local_minima(rank, index, corners)
+            if len(selected) == 0:
+                break
+            rank[selected] = _RANK_NONE
+            selected = selected[neighbours.link_condition(edges[selected])]
+            rows = slot[selected]
+            free = rows[~anchored[rows]]
+            positions[free] = _optimal_positions(
+                vertices[first[valid[free]]], vertices[second[valid[free]]], edge_quadrics[:, free], positions[free]
+            )
+            selected = selected[self._keeps_orientation(vertices, corners, edges, selected, positions[rows])]
+            accepted.append(selected)
+            _, ring = corners.faces_around(edges[selected].ravel())
+            blocked[faces[ring].ravel()] = True
+            rank[blocked[first] | blocked[second]] = _RANK_NONE
+        selected = np.concatenate(accepted) if accepted else np.empty(0, dtype=np.int64)
+        # Each collapse removes the two faces on its edge.
+        selected = selected[np.argsort(order[selected], kind="stable")][: max((excess + 1) // 2, 1)]
+        if len(selected) == 0:
+            return 0, faces
+
+        keep = np.where(locked[second[selected]], second[selected], first[selected])
+        drop = first[selected] + second[selected] - keep
+        vertices[keep] = positions[slot[selected]]
+        quadrics[:, keep] += quadrics[:, drop]
+        remap = np.arange(len(vertices))
+        remap[drop] = keep
+        faces = remap[faces]
+        faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])]
+        return len(selected), faces
+
+    def _keeps_orientation(
+        self,
+        vertices: np.ndarray,
+        corners: "_Corners",
+        edges: np.ndarray,
+        selected: np.ndarray,
+        positions: np.ndarray,
+    ) -> np.ndarray:
+        """Mask of selected collapses that turn no surviving face past ``min_normal_cos``."""
+        ends = edges[selected]
+        owner, touched = corners.faces_around(ends.ravel())
+        collapse = owner // 2
+        triangles = corners.faces[touched]
+        first, second = ends[collapse, 0], ends[collapse, 1]
+        # Faces on the collapsed edge disappear and need no check; other faces hold one endpoint.
+        hits_first = triangles == first[:, None]
+        hits_second = triangles == second[:, None]
+        on_edge = _row_any(hits_first) & _row_any(hits_second)
+        before = vertices[triangles]
+        after = before.copy()
+        rows, columns = np.nonzero(hits_first | hits_second)
+        after[rows, columns] = positions[collapse[rows]]
+
+        before_normals = _face_normals(before)
+        after_normals = _face_normals(after)
+        before_length = np.linalg.norm(before_normals, axis=1)
+        length = before_length * np.linalg.norm(after_normals, axis=1)
+        # Faces that are already degenerate have no orientation to lose; faces becoming degenerate count as flipped.
+        flipped = (
+            ~on_edge
+            & (before_length > 0)
+            & ((before_normals * after_normals).sum(axis=1) <= self.min_normal_cos * length)
+        )
+        keep = np.ones(len(selected), dtype=bool)
+        keep[collapse[flipped]] = False
+        return keep
+
+
+def _local_minima(rank: np.ndarray, index: EdgeIndex, corners: "_Corners") -> np.ndarray:
+    """Ranked edges that are the lowest within two rings of both endpoints; no face touches two of them."""
+    face_rank = _row_min(rank[index.slot_edge].reshape(-1, 3))
+    for _ in range(2):
+        vertex_rank = corners.vertex_min(face_rank)
+        face_rank = _row_min(vertex_rank[corners.faces])
+    first, second = index.edges[:, 0], index.edges[:, 1]
+    return np.flatnonzero((rank != _RANK_NONE) & (vertex_rank[first] == rank) & (vertex_rank[second] == rank))
+
+
+def _vertex_quadrics(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Area-weighted plane quadrics summed per vertex, shape (10, V)."""
+    normals = _face_normals(vertices[faces])
+    doubled_area = np.linalg.norm(normals, axis=1)
+    valid = doubled_area > 0
+    unit = np.zeros_like(normals)
+    unit[valid] = normals[valid] / doubled_area[valid, None]
+    planes = np.column_stack([unit, -(unit * vertices[faces[:, 0]]).sum(axis=1)])
+    rows, cols = np.triu_indices(4)
+    face_quadrics = planes[:, rows] * planes[:, cols] * (doubled_area / 2.0)[:, None]
+    quadrics = np.empty((QUADRIC_SIZE, len(vertices)))
+    for entry in range(QUADRIC_SIZE):
+        quadrics[entry] = np.bincount(
+            faces.ravel(), weights=np.repeat(face_quadrics[:, entry], 3), minlength=len(vertices)
+        )
+    return quadrics
+
+
+def _quadric_error(quadrics: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Error of quadrics of shape (10, N) at points of shape (N, 3)."""
+    x, y, z = points.T
+    aa, ab, ac, ad, bb, bc, bd, cc, cd, dd = quadrics
+    return (
+        x * (aa * x + 2.0 * (ab * y + ac * z + ad))
+        + y * (bb * y + 2.0 * (bc * z + bd))
+        + z * (cc * z + 2.0 * cd)
+        + dd
+    )
+
+
+def _best_endpoint(
+    start: np.ndarray, end: np.ndarray, quadrics: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Cheapest of the two endpoints and the midpoint of every edge."""
+    options = np.stack([start, end, (start + end) / 2.0])
+    errors = np.stack([_quadric_error(quadrics, option) for option in options])
+    best = errors.argmin(axis=0)
+    rows = np.arange(len(start))
+    return options[best, rows], np.maximum(errors[best, rows], 0.0)
+
+
+def _optimal_positions(
+    start: np.ndarray, end: np.ndarray, quadrics: np.ndarray, fallback: np.ndarray
+) -> np.ndarray:
+    """Quadric minimizers where they are well defined and near the edge, else ``fallback``."""
+    aa, ab, ac, ad, bb, bc, bd, cc, cd, _ = quadrics
+    matrices = np.stack([np.stack([aa, ab, ac], -1), np.stack([ab, bb, bc], -1), np.stack([ac, bc, cc], -1)], 1)
+    rhs = -np.stack([ad, bd, cd], -1)
+    scale = np.trace(matrices, axis1=1, axis2=2)
+    # Planes meeting at a point: the determinant is not negligible next to the cube of the trace.
+    solvable = np.abs(np.linalg.det(matrices)) > 1e-6 * np.maximum(scale, 1e-300) ** 3
+    positions = fallback.copy()
+    if np.any(solvable):
+        solved = np.linalg.solve(matrices[solvable], rhs[solvable][..., None])[..., 0]
+        midpoint = (start[solvable] + end[solvable]) / 2.0
+        length = np.linalg.norm(end[solvable] - start[solvable], axis=1)
+        near = np.linalg.norm(solved - midpoint, axis=1) <= length
+        better = near & (
+            _quadric_error(quadrics[:, solvable], solved) < _quadric_error(quadrics[:, solvable], fallback[solvable])
+        )
+        rows = np.flatnonzero(solvable)[better]
+        positions[rows] = solved[better]
+    return positions
+
+
+class _Neighbours:
+    """Vertex adjacency in compressed rows, for link-condition checks."""
+
+    def __init__(self, edges: np.ndarray, vertex_count: int) -> None:
+        self._vertex_count = vertex_count
+        self._keys = edges[:, 0] * vertex_count + edges[:, 1]
+        sources = np.concatenate([edges[:, 0], edges[:, 1]])
+        order = np.argsort(sources, kind="stable")
+        self._targets = np.concatenate([edges[:, 1], edges[:, 0]])[order]
+        self._offsets = np.searchsorted(sources[order], np.arange(vertex_count + 1))
+
+    def link_condition(self, edges: np.ndarray) -> np.ndarray:
+        """Mask of manifold edges whose endpoints share exactly two neighbours."""
+        owner, rows = _expand(self._offsets, edges[:, 0])
+        neighbours = self._targets[rows]
+        other = edges[owner, 1]
+        lookup = np.minimum(neighbours, other) * self._vertex_count + np.maximum(neighbours, other)
+        found = np.minimum(np.searchsorted(self._keys, lookup), len(self._keys) - 1)
+        shared = self._keys[found] == lookup
+        degree = np.diff(self._offsets)
+        # Collapsing an edge of a tetrahedron would fold it into two coincident faces.
+        tetrahedron = (degree[edges[:, 0]] == 3) & (degree[edges[:, 1]] == 3)
+        return (np.bincount(owner[shared], minlength=len(edges)) == 2) & ~tetrahedron
+
+
+class _Corners:
+    """Face corners grouped by vertex."""
+
+    def __init__(self, faces: np.ndarray, vertex_count: int) -> None:
+        self.faces = faces
+        corner_vertices = faces.ravel()
+        self._order = np.argsort(corner_vertices, kind="stable")
+        self._offsets = np.searchsorted(corner_vertices[self._order], np.arange(vertex_count + 1))
+        self._used = np.flatnonzero(np.diff(self._offsets))
+        self._corner_faces = self._order // 3
+
+    def faces_around(self, vertices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Faces incident to each vertex, as (position in ``vertices``, face) pairs."""
+        owner, rows = _expand(self._offsets, vertices)
+        return owner, self._corner_faces[rows]
+
+    def vertex_min(self, face_values: np.ndarray) -> np.ndarray:
+        """Minimum of ``face_values`` over the faces around every vertex."""
+        result = np.full(len(self._offsets) - 1, _RANK_NONE, dtype=face_values.dtype)
+        if len(self._used):
+            result[self._used] = np.minimum.reduceat(face_values[self._corner_faces], self._offsets[self._used])
+        return result
+
+
+def _expand(offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Entries of compressed ``rows``: the position of each row and the entry index."""
+    counts = offsets[rows + 1] - offsets[rows]
+    owner = np.repeat(np.arange(len(rows)), counts)
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, offsets[rows][owner] + within
+
+
+def _row_min(values: np.ndarray) -> np.ndarray:
+    return np.minimum(np.minimum(values[:, 0], values[:, 1]), values[:, 2])
+
+
+def _row_any(values: np.ndarray) -> np.ndarray:
+    return values[:, 0] | values[:, 1] | values[:, 2]
+
+
+def _face_normals(triangles: np.ndarray) -> np.ndarray:
+    """Unnormalized normals of triangles of shape (N, 3, 3)."""
+    return np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
@@ -12,7 +12,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Mapping, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 import ifcopenshell
 import ifcopenshell.geom
@@ -20,6 +20,11 @@ import numpy as np
 import trimesh
 from loguru import logger
 
+from bimto3dprint.filters.element_filter import ElementIndex, filter_elements
+from bimto3dprint.processors.tessellation_cache import TessellationCache, settings_signature
+from bimto3dprint.processors.tessellator import Tessellator, create_geom_settings
+from bimto3dprint.utils.mesh_buffer import MeshBuffer
+
 
 DEFAULT_CATEGORY_MAP: Mapping[str, Sequence[str]] = {
     "BuiltInCategory.OST_Walls": ("IfcWall", "IfcWallStandardCase"),
@@ -41,11 +46,10 @@ class IFCLoader:
 
     category_map: Mapping[str, Sequence[str]] = field(default_factory=lambda: DEFAULT_CATEGORY_MAP)
     model: ifcopenshell.file | None = None
-    _settings: ifcopenshell.geom.settings = field(default_factory=ifcopenshell.geom.settings)
-
-    def __post_init__(self) -> None:
-        self._settings.set(self._settings.USE_WORLD_COORDS, True)
-        self._settings.set(self._settings.INCLUDE_CURVES, False)
+    threads: int = 1
+    cache: TessellationCache | None = None
+    _settings: ifcopenshell.geom.settings = field(default_factory=create_geom_settings)
+    _index: ElementIndex | None = field(default=None, init=False, repr=False)
 
     def load_ifc(self, path: Path | str) -> ifcopenshell.file:
         """Load an IFC file from disk.
@@ -65,16 +69,20 @@ class IFCLoader:
 
         logger.info("Opening IFC file: {}", ifc_path)
         self.model = ifcopenshell.open(str(ifc_path))
+        self._index = None
         return self.model
 
     def get_elements_by_categories(
         self,
         categories: Iterable[str] | Mapping[str, Sequence[str]],
+        filters: Mapping[str, Any] | None = None,
     ) -> list[ifcopenshell.entity_instance]:
         """Collect IFC elements by category names.
 
         Args:
             categories: Category labels from configuration or IFC class names.
+            filters: Optional element conditions in the format of the preset
+                ``filters`` section, evaluated on an index built once per model.
 
         Returns:
             List of IFC elements to process.
@@ -87,18 +95,22 @@ class IFCLoader:
 
         include, exclude = self._normalize_categories(categories)
         included = self._collect_elements(include)
-        if not exclude:
+        if exclude:
+            excluded_ids = {element.id() for element in self._collect_elements(exclude)}
+            filtered = [element for element in included if element.id() not in excluded_ids]
+            logger.info(
+                "Filtered elements: included={}, excluded={}, result={}",
+                len(included),
+                len(excluded_ids),
+                len(filtered),
+            )
+            included = filtered
+        if not filters:
             return included
 
-        excluded_ids = {element.id() for element in self._collect_elements(exclude)}
-        filtered = [element for element in included if element.id() not in excluded_ids]
-        logger.info(
-            "Filtered elements: included={}, excluded={}, result={}",
-            len(included),
-            len(excluded_ids),
-            len(filtered),
-        )
-        return filtered
+        if self._index is None or self._index.model is not self.model:
+            self._index = ElementIndex(self.model)
+        return filter_elements(included, {"filters": filters}, self._index)
 
     def _collect_elements(self, categories: Iterable[str]) -> list[ifcopenshell.entity_instance]:
         elements: list[ifcopenshell.entity_instance] = []
@@ -122,6 +134,14 @@ class IFCLoader:
         Returns:
             trimesh.Trimesh or None if geometry could not be created.
         """
+        cache_key = None
+        if self.cache is not None and self.model is not None:
+            cache_key = self.cache.element_key(self.model, element, settings_signature(self._settings))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                vertices, faces = cached
+                return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
         try:
             shape = ifcopenshell.geom.create_shape(self._settings, element)
         except Exception as exc:  # noqa: BLE001 - IFC geometry failures are expected
@@ -139,6 +159,8 @@ class IFCLoader:
 
         mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
         mesh.remove_unreferenced_vertices()
+        if cache_key is not None:
+            self.cache.put(cache_key, np.asarray(mesh.vertices), np.asarray(mesh.faces))
         return mesh
 
     def to_trimesh(self, elements: Iterable[ifcopenshell.entity_instance]) -> trimesh.Trimesh:
@@ -151,19 +173,20 @@ class IFCLoader:
             Combined mesh.
 
         Raises:
-            ValueError: If no geometry was produced.
+            ValueError: If IFC model is not loaded or no geometry was produced.
         """
-        meshes: list[trimesh.Trimesh] = []
-        for element in elements:
-            mesh = self.extract_geometry(element)
-            if mesh is None:
-                continue
-            meshes.append(mesh)
-
-        if not meshes:
+        if self.model is None:
+            raise ValueError("IFC model is not loaded. Call load_ifc() first.")
+
+        tessellator = Tessellator(threads=self.threads, cache=self.cache)
+        buffer = MeshBuffer()
+        for element_mesh in tessellator.iter_tessellate(self.model, list(elements)):
+            buffer.append(element_mesh.vertices, element_mesh.faces)
+
+        if buffer.face_count == 0:
             raise ValueError("No geometry could be extracted from IFC elements.")
 
-        combined = trimesh.util.concatenate(meshes)
+        combined = buffer.to_trimesh()
         logger.info("Combined mesh: vertices={}, faces={}", len(combined.vertices), len(combined.faces))
         return combined
 
@@ -0,0 +1,154 @@
+"""Level-of-detail pyramid built from one repaired mesh.
+
+Every level is decimated from the previous one, so the pyramid costs little more
+than its first level. The deviation of each level from the full-resolution mesh
+is measured in both directions on seeded surface samples: ``hausdorff`` is the
+largest sample distance (a sampled Hausdorff distance) and ``mean_deviation``
+the average.
+
+Example:
+    extractor = ShellExtractor()
+    levels = LodPyramid(extractor.decimate).build(mesh, parse_lod_levels("high,medium,low"))
+    print([level.summary() for level in levels])
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Sequence
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.processors.shell_extractor import SIMPLIFY_LEVELS
+from bimto3dprint.utils.proximity import SurfaceDistance
+
+DEFAULT_ERROR_SAMPLES = 20000
+MIN_LOD_FACES = 100
+
+
+@dataclass
+class LodLevel:
+    """One level of a detail pyramid.
+
+    Attributes:
+        index: Level number; level 0 is the full-resolution mesh.
+        ratio: Requested face ratio relative to level 0.
+        mesh: Decimated mesh.
+        hausdorff: Largest sampled distance between this level and level 0.
+        mean_deviation: Mean sampled distance between this level and level 0.
+    """
+
+    index: int
+    ratio: float
+    mesh: trimesh.Trimesh
+    hausdorff: float
+    mean_deviation: float
+
+    def summary(self) -> dict[str, Any]:
+        """Face counts and error metrics for reports."""
+        return {
+            "level": self.index,
+            "ratio": self.ratio,
+            "faces": int(len(self.mesh.faces)),
+            "vertices": int(len(self.mesh.vertices)),
+            "watertight": bool(self.mesh.is_watertight),
+            "hausdorff": self.hausdorff,
+            "mean_deviation": self.mean_deviation,
+        }
+
+
+@dataclass
+class LodPyramid:
+    """Build progressively decimated levels of a mesh.
+
+    Attributes:
+        decimate: Callable reducing a mesh to about the given face count.
+        samples: Surface samples per direction for the error metrics.
+        seed: Sampling seed, so repeated runs report the same errors.
+    """
+
+    decimate: Callable[[trimesh.Trimesh, int], trimesh.Trimesh]
+    samples: int = DEFAULT_ERROR_SAMPLES
+    seed: int = 0
+
+    def build(self, mesh: trimesh.Trimesh, ratios: Sequence[float]) -> List[LodLevel]:
+        """Decimate ``mesh`` into one level per ratio.
+
+        Args:
+            mesh: Full-resolution mesh (level 0, not included in the result).
+            ratios: Face ratios relative to ``mesh`` in decreasing order.
+
+        Returns:
+            Levels 1..N in the order of ``ratios``.
+        """
+        reference = SurfaceDistance(mesh)
+        reference_points = _sample(mesh, self.samples, self.seed)
+        levels: List[LodLevel] = []
+        current = mesh
+        for index, ratio in enumerate(ratios, start=1):
+            target = max(int(len(mesh.faces) * ratio), MIN_LOD_FACES)
+            if target < len(current.faces):
+                current = self.decimate(current, target)
+
+            forward, _ = reference.query(_sample(current, self.samples, self.seed))
+            backward, _ = SurfaceDistance(current).query(reference_points)
+            distances = np.concatenate([forward, backward])
+            level = LodLevel(
+                index=index,
+                ratio=float(ratio),
+                mesh=current,
+                hausdorff=float(distances.max()),
+                mean_deviation=float(distances.mean()),
+            )
+            logger.info(
+                "LOD {}: faces={}, hausdorff={:.4f}, mean deviation={:.4f}",
+                index,
+                len(current.faces),
+                level.hausdorff,
+                level.mean_deviation,
+            )
+            levels.append(level)
+        return levels
+
+
+def parse_lod_levels(spec: str) -> List[float]:
+    """Parse a ``--lods`` value into decreasing face ratios.
+
+    Args:
+        spec: Comma separated level names (``high``, ``medium``, ``low``) or
+            ratios in (0, 1).
+
+    Returns:
+        Unique ratios, largest first.
+
+    Raises:
+        ValueError: If a level is unknown or a ratio is out of range.
+    """
+    ratios = set()
+    for token in (part.strip().lower() for part in spec.split(",")):
+        if not token:
+            continue
+        if token in SIMPLIFY_LEVELS:
+            ratios.add(SIMPLIFY_LEVELS[token])
+            continue
+        try:
+            ratio = float(token)
+        except ValueError:
+            raise ValueError(f"Unsupported LOD level: {token}") from None
+        if not 0.0 < ratio < 1.0:
+            raise ValueError(f"LOD ratio must be in (0, 1): {token}")
+        ratios.add(ratio)
+    if not ratios:
+        raise ValueError("At least one LOD level is required.")
+    return sorted(ratios, reverse=True)
+
+
+def _sample(mesh: trimesh.Trimesh, samples: int, seed: int) -> np.ndarray:
+    points, _ = trimesh.sample.sample_surface(mesh, samples, seed=seed)
+    # Vertices carry the largest deviations of a decimated surface, so they are measured as well.
+    vertices = mesh.vertices
+    if len(vertices) > samples:
+        vertices = vertices[np.random.default_rng(seed).choice(len(vertices), samples, replace=False)]
+    return np.concatenate([points, vertices])
+
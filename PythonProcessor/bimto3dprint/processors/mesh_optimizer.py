@@ -11,6 +11,7 @@ Example:
 """
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
 from typing import Any
 
@@ -18,17 +19,37 @@ import numpy as np
 import trimesh
 from loguru import logger
 
+from bimto3dprint.filters.geometry_cleaner import GeometryCleaner
+from bimto3dprint.processors.planar_remesh import PLANAR_TOLERANCE_VOXELS, remesh_planar_regions
+from bimto3dprint.processors.smoothing import DEFAULT_FEATURE_ANGLE, VOXEL_PITCH_KEY, SurfaceSmoother, staircase_mask
+from bimto3dprint.processors.thickness import ThicknessAnalysis, ThicknessAnalyzer
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid
+from bimto3dprint.validators.mesh_validator import MeshValidator
+
+THICKEN_VOXELS_PER_WALL = 4
+"""Voxels across the minimum wall thickness used to resolve thin walls."""
+DEFAULT_THICKEN_SURFACE_VOXELS = 8_000_000
+"""Surface voxel budget that caps the thickening resolution on large meshes."""
+
 
 @dataclass
 class MeshOptimizer:
     """Optimize meshes for 3D printing workflows."""
 
-    def remove_internal_geometry(self, mesh: trimesh.Trimesh, voxel_pitch: float | None = None) -> trimesh.Trimesh:
+    def remove_internal_geometry(
+        self,
+        mesh: trimesh.Trimesh,
+        voxel_pitch: float | None = None,
+        planar_tolerance: float | None = PLANAR_TOLERANCE_VOXELS,
+    ) -> trimesh.Trimesh:
         """Remove internal faces, keeping only the outer shell.
 
         Args:
             mesh: Input mesh.
             voxel_pitch: Optional voxel pitch in mesh units.
+            planar_tolerance: Deviation in voxels allowed when re-triangulating the
+                planar regions of the voxel shell; ``None`` keeps the raw
+                marching-cubes surface.
 
         Returns:
             Mesh approximating the external shell.
@@ -38,29 +59,42 @@ class MeshOptimizer:
 
         if voxel_pitch is not None and voxel_pitch <= 0:
             raise ValueError("voxel_pitch must be positive.")
+        if planar_tolerance is not None and planar_tolerance < 0:
+            raise ValueError("planar_tolerance must not be negative.")
 
         max_extent = float(np.max(mesh.extents))
         pitch = voxel_pitch or max(max_extent / 200.0, 1.0)
         logger.info("Removing internal geometry via voxel shell (pitch={:.3f})", pitch)
 
-        voxel_grid = mesh.voxelized(pitch)
-        voxel_grid = voxel_grid.fill()
-        shell = voxel_grid.marching_cubes
-        shell.remove_unreferenced_vertices()
-        return shell
+        grid = SparseVoxelGrid(pitch)
+        grid.add_mesh(mesh)
+        return self._voxel_surface(grid.envelope(), pitch, planar_tolerance)
 
     def thicken_walls(
         self,
         mesh: trimesh.Trimesh,
         min_thickness_mm: float = 2.0,
         voxel_pitch: float | None = None,
+        max_surface_voxels: int = DEFAULT_THICKEN_SURFACE_VOXELS,
+        planar_tolerance: float | None = PLANAR_TOLERANCE_VOXELS,
     ) -> trimesh.Trimesh:
-        """Thicken thin walls using voxel dilation.
+        """Thicken walls thinner than the minimum using a sparse distance field.
+
+        The mesh is expected in millimeters at print scale, so the default pitch of
+        ``min_thickness_mm / THICKEN_VOXELS_PER_WALL`` follows the printer scale.
+        The pitch is coarsened when the surface would need more than
+        ``max_surface_voxels`` voxels. Only thin parts are offset; a mesh without
+        thin parts is returned unchanged, as is any mesh whose pitch ends up above
+        half the minimum wall, since no thin wall is detectable at that resolution.
 
         Args:
             mesh: Input mesh.
             min_thickness_mm: Minimum wall thickness in millimeters.
             voxel_pitch: Optional voxel pitch in mesh units.
+            max_surface_voxels: Surface voxel budget for the automatic pitch.
+            planar_tolerance: Deviation in voxels allowed when re-triangulating the
+                planar regions of the thickened surface; ``None`` keeps the raw
+                marching-cubes surface.
 
         Returns:
             Thickened mesh.
@@ -73,38 +107,70 @@ class MeshOptimizer:
 
         if voxel_pitch is not None and voxel_pitch <= 0:
             raise ValueError("voxel_pitch must be positive.")
+        if planar_tolerance is not None and planar_tolerance < 0:
+            raise ValueError("planar_tolerance must not be negative.")
 
         logger.info("Thickening in mm, units verified")
-        pitch = voxel_pitch or max(min_thickness_mm / 2.0, 0.5)
-        steps = max(int(np.ceil(min_thickness_mm / pitch)), 1)
-        logger.info("Thickening walls via voxel dilation (pitch={:.3f}, steps={})", pitch, steps)
-
-        voxel_grid = mesh.voxelized(pitch)
-        voxel_grid = voxel_grid.fill()
-        voxel_grid = voxel_grid.dilate(steps)
-        thickened = voxel_grid.marching_cubes
-        thickened.remove_unreferenced_vertices()
-        return thickened
-
-    def smooth_surface(self, mesh: trimesh.Trimesh, iterations: int = 3) -> trimesh.Trimesh:
-        """Apply Laplacian smoothing for cleaner surfaces.
+        pitch = voxel_pitch or self._thickening_pitch(mesh, min_thickness_mm, max_surface_voxels)
+        if pitch > min_thickness_mm / 2.0:
+            logger.warning(
+                "Thickening skipped: pitch {:.3f} mm is coarser than half the minimum wall, so thin walls "
+                "cannot be detected. Use a smaller print scale or raise the voxel budget.",
+                pitch,
+            )
+            return mesh.copy()
+        logger.info("Thickening walls via distance field (pitch={:.3f})", pitch)
+
+        grid = SparseVoxelGrid(pitch)
+        grid.add_mesh(mesh)
+        thickened = grid.thicken(min_thickness_mm)
+        if thickened is None:
+            logger.info("No walls thinner than {:.2f} mm; mesh left unchanged", min_thickness_mm)
+            return mesh.copy()
+        return self._voxel_surface(thickened, pitch, planar_tolerance)
+
+    def _voxel_surface(self, mesh: trimesh.Trimesh, pitch: float, planar_tolerance: float | None) -> trimesh.Trimesh:
+        """Remesh a marching-cubes surface and record its voxel pitch."""
+        if planar_tolerance is not None:
+            mesh = remesh_planar_regions(mesh, planar_tolerance * pitch)
+        mesh.metadata[VOXEL_PITCH_KEY] = pitch
+        return mesh
+
+    def _thickening_pitch(self, mesh: trimesh.Trimesh, min_thickness_mm: float, max_surface_voxels: int) -> float:
+        if max_surface_voxels <= 0:
+            raise ValueError("max_surface_voxels must be positive.")
+        pitch = min_thickness_mm / THICKEN_VOXELS_PER_WALL
+        budget_pitch = float(np.sqrt(mesh.area / max_surface_voxels))
+        return max(pitch, budget_pitch)
+
+    def smooth_surface(
+        self,
+        mesh: trimesh.Trimesh,
+        iterations: int = 3,
+        method: str = "taubin",
+        feature_angle: float | None = DEFAULT_FEATURE_ANGLE,
+        voxel_pitch: float | None = None,
+    ) -> trimesh.Trimesh:
+        """Smooth the surface in place while keeping sharp edges.
 
         Args:
-            mesh: Input mesh.
+            mesh: Input mesh; its vertices are modified.
             iterations: Number of smoothing iterations.
+            method: ``"taubin"`` (volume preserving) or ``"laplacian"``.
+            feature_angle: Dihedral angle in degrees above which edges stay
+                pinned; ``None`` smooths across all edges.
+            voxel_pitch: Pitch of a voxel-derived mesh; when given, only the
+                voxel staircases of the surface are smoothed.
 
         Returns:
-            Smoothed mesh.
+            The smoothed input mesh.
         """
-        if iterations <= 0:
-            raise ValueError("iterations must be a positive integer.")
-
+        smoother = SurfaceSmoother(iterations=iterations, method=method, feature_angle=feature_angle)
         if mesh.is_empty:
             raise ValueError("Input mesh is empty.")
 
-        smoothed = mesh.copy()
-        trimesh.smoothing.filter_laplacian(smoothed, iterations=iterations)
-        return smoothed
+        mask = None if voxel_pitch is None else staircase_mask(mesh, voxel_pitch)
+        return smoother.smooth(mesh, mask=mask)
 
     def ensure_watertight(self, mesh: trimesh.Trimesh) -> trimesh.Trimesh:
         """Attempt to repair mesh to become watertight.
@@ -115,79 +181,53 @@ class MeshOptimizer:
         Returns:
             Repaired mesh.
         """
-        repaired = mesh.copy()
-        repaired.remove_degenerate_faces()
-        repaired.remove_duplicate_faces()
-        repaired.remove_infinite_values()
-        repaired.remove_unreferenced_vertices()
-        repaired.fix_normals()
-
-        holes_filled = trimesh.repair.fill_holes(repaired)
-        logger.info("Filled {} holes during watertight repair", holes_filled)
-
-        if not repaired.is_watertight:
+        repaired, report = GeometryCleaner(detect_self_intersections=False).clean(mesh)
+        if not report.is_watertight:
             logger.warning("Mesh is still not watertight after repair")
 
         return repaired
 
-    def validate_for_printing(self, mesh: trimesh.Trimesh, sample_count: int = 250) -> dict[str, Any]:
+    def validate_for_printing(
+        self,
+        mesh: trimesh.Trimesh,
+        sample_count: int | None = None,
+        thickness: ThicknessAnalysis | None = None,
+    ) -> dict[str, Any]:
         """Validate mesh readiness for printing.
 
         Args:
             mesh: Input mesh.
-            sample_count: Number of samples for wall thickness estimation.
+            sample_count: Deprecated and ignored; wall thickness is measured on every face.
+            thickness: Precomputed thickness analysis; computed for every face when omitted.
 
         Returns:
             Dictionary with validation metrics.
         """
         if mesh.is_empty:
             raise ValueError("Input mesh is empty.")
+        if sample_count is not None:
+            warnings.warn(
+                "validate_for_printing(sample_count=...) is ignored; wall thickness is measured on every face.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
 
-        has_correct_normals = bool(mesh.is_winding_consistent)
-        min_wall_thickness = self._estimate_min_wall_thickness(mesh, sample_count=sample_count)
+        if thickness is None:
+            thickness = ThicknessAnalyzer().analyze(mesh)
+        topology = MeshValidator().validate(mesh)
+        min_wall_thickness = thickness.minimum
         bounds = tuple(float(value) for value in mesh.bounds.reshape(-1))
-        volume = float(mesh.volume) if mesh.is_volume else 0.0
 
         report = {
-            "is_watertight": bool(mesh.is_watertight),
-            "has_correct_normals": has_correct_normals,
-            "min_wall_thickness": float(min_wall_thickness),
+            "is_watertight": topology["is_watertight"],
+            "has_correct_normals": topology["is_winding_consistent"],
+            "min_wall_thickness": 0.0 if min_wall_thickness is None else min_wall_thickness,
+            "wall_thickness_percentiles": thickness.percentiles(),
             "bounding_box": bounds,
-            "volume": volume,
+            "volume": topology["volume"] if topology["is_volume"] else 0.0,
+            "shells": topology["shells"],
+            "holes": topology["holes"],
+            "issues": topology["issues"],
         }
         logger.info("Validation report: {}", report)
         return report
-
-    def _estimate_min_wall_thickness(self, mesh: trimesh.Trimesh, sample_count: int = 250) -> float:
-        if sample_count <= 0:
-            raise ValueError("sample_count must be positive.")
-
-        if mesh.faces.size == 0:
-            return 0.0
-
-        points, face_indices = mesh.sample(sample_count, return_index=True)
-        normals = mesh.face_normals[face_indices]
-        epsilon = float(max(np.max(mesh.extents) * 1e-6, 1e-6))
-        origins = points - normals * epsilon
-        directions = -normals
-
-        try:
-            locations, ray_index, _ = mesh.ray.intersects_location(
-                origins,
-                directions,
-                multiple_hits=False,
-            )
-        except Exception as exc:  # noqa: BLE001 - fallback when ray engine is unavailable
-            logger.warning("Ray-based thickness estimation failed: {}", exc)
-            if mesh.edges_unique_length.size == 0:
-                return 0.0
-            return float(np.min(mesh.edges_unique_length))
-
-        if len(locations) == 0:
-            return 0.0
-
-        distances = np.linalg.norm(locations - origins[ray_index], axis=1)
-        distances = distances[distances > epsilon]
-        if distances.size == 0:
-            return 0.0
-        return float(np.min(distances))
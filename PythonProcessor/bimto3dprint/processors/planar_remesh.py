@@ -0,0 +1,493 @@
+"""Planar-region remeshing of voxel surfaces.
+
+Marching-cubes envelopes are dense meshes of mostly flat façades, floors and
+chamfered edges. Faces are grouped into planar regions: neighbouring faces join
+when the far vertex of each lies within ``max_distance`` of the other's plane,
+and a region whose vertices stray further from its fitted plane is kept as it
+is. Vertices inside a region and collinear vertices on the border of exactly
+two regions are dropped, and every changed region is triangulated once from its
+remaining boundary loops by ear clipping. Neighbouring regions keep the same
+border vertices, so a closed surface stays closed.
+
+Example:
+    flattened = remesh_planar_regions(envelope, max_distance=PLANAR_TOLERANCE_VOXELS * pitch)
+"""
+from __future__ import annotations
+
+import time
+from typing import Dict, List, Tuple
+
+import mapbox_earcut
+import numpy as np
+import trimesh
+from loguru import logger
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from bimto3dprint.utils.topology import EdgeIndex
+
+PLANAR_TOLERANCE_VOXELS = 0.1
+"""Default deviation allowed when flattening marching-cubes surfaces, in voxels."""
+_RELATIVE_EPSILON = 1e-9
+"""Relative size below which distances, turns and areas count as zero."""
+_MAX_ATTEMPTS = 4
+"""Triangulation rounds; regions that fail to triangulate are kept as they are in the next round."""
+_PINCH_OFFSET = 1e-3
+"""Shift of repeated loop points towards the region interior for ear clipping, relative to the shorter edge."""
+_MAX_REPAIR_STEPS = 64
+"""Bound on the faces walked around a vertex and on the rounds that repair ear-clipped triangles."""
+
+
+def remesh_planar_regions(mesh: trimesh.Trimesh, max_distance: float) -> trimesh.Trimesh:
+    """Re-triangulate planar and near-planar regions with as few faces as possible.
+
+    Args:
+        mesh: Input mesh, typically a marching-cubes surface.
+        max_distance: Allowed distance of region vertices from the region plane;
+            zero merges exactly coplanar faces only.
+
+    Returns:
+        Remeshed surface without unreferenced vertices.
+
+    Raises:
+        ValueError: If ``max_distance`` is negative.
+    """
+    if max_distance < 0:
+        raise ValueError("max_distance must not be negative.")
+    if len(mesh.faces) == 0:
+        return mesh.copy()
+
+    start = time.perf_counter()
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces, dtype=np.int64)
+    tolerance = max(float(max_distance), _RELATIVE_EPSILON * float(np.ptp(vertices, axis=0).max()))
+    index = EdgeIndex.build(faces)
+    regions = _planar_regions(vertices, faces, index, tolerance)
+    normals, fixed = _region_planes(vertices, faces, regions, tolerance)
+
+    for _ in range(_MAX_ATTEMPTS):
+        remeshed, failed = _retriangulate(vertices, faces, index, regions, normals, fixed)
+        if len(failed) == 0:
+            break
+        fixed[failed] = True
+    else:
+        logger.warning("Planar remeshing failed to triangulate {} regions; mesh left unchanged", len(failed))
+        return mesh.copy()
+
+    result = trimesh.Trimesh(vertices=vertices, faces=remeshed, process=False)
+    result.remove_unreferenced_vertices()
+    logger.info(
+        "Planar remesh: {} -> {} faces, {} regions ({} kept) in {:.2f} s",
+        len(faces),
+        len(result.faces),
+        len(fixed),
+        int(fixed.sum()),
+        time.perf_counter() - start,
+    )
+    return result
+
+
+def _planar_regions(vertices: np.ndarray, faces: np.ndarray, index: EdgeIndex, tolerance: float) -> np.ndarray:
+    """Region label of every face: components of neighbours that lie in each other's planes."""
+    normals = np.cross(vertices[faces[:, 1]] - vertices[faces[:, 0]], vertices[faces[:, 2]] - vertices[faces[:, 0]])
+    length = np.linalg.norm(normals, axis=1)
+    valid = length > 0
+    normals[valid] /= length[valid, None]
+    offsets = (normals * vertices[faces[:, 0]]).sum(axis=1)
+
+    first, second = index.manifold_pairs()
+    left, right = first // 3, second // 3
+    # Slot k of a face is the edge from corner k to k + 1, so corner k + 2 is the vertex off the edge.
+    far_left = vertices[faces[left, (first % 3 + 2) % 3]]
+    far_right = vertices[faces[right, (second % 3 + 2) % 3]]
+    join = (
+        (index.forward[first] != index.forward[second])
+        & valid[left]
+        & valid[right]
+        & ((normals[left] * normals[right]).sum(axis=1) > 0)
+        & (np.abs((normals[left] * far_right).sum(axis=1) - offsets[left]) <= tolerance)
+        & (np.abs((normals[right] * far_left).sum(axis=1) - offsets[right]) <= tolerance)
+    )
+    graph = sparse.coo_matrix(
+        (np.ones(int(join.sum()), dtype=np.int8), (left[join], right[join])), shape=(len(faces), len(faces))
+    )
+    return connected_components(graph, directed=False)[1]
+
+
+def _region_planes(
+    vertices: np.ndarray, faces: np.ndarray, regions: np.ndarray, tolerance: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Area-weighted unit normal of every region and whether the region must be kept as it is."""
+    count = int(regions.max()) + 1
+    triangles = vertices[faces]
+    weighted = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]) / 2.0
+    area = np.linalg.norm(weighted, axis=1)
+    normals = np.column_stack([np.bincount(regions, weights=weighted[:, axis], minlength=count) for axis in range(3)])
+    total = np.bincount(regions, weights=area, minlength=count)
+    length = np.linalg.norm(normals, axis=1)
+    # Regions of degenerate faces, or folded ones whose normals cancel out, have no plane to fit.
+    fixed = ~(length > 0.5 * total) | ~(total > 0)
+    normals[~fixed] /= length[~fixed, None]
+
+    centers = triangles.mean(axis=1)
+    offsets = np.bincount(regions, weights=area * (normals[regions] * centers).sum(axis=1), minlength=count)
+    offsets[~fixed] /= total[~fixed]
+    corner_regions = np.repeat(regions, 3)
+    distances = np.abs((normals[corner_regions] * vertices[faces.ravel()]).sum(axis=1) - offsets[corner_regions])
+    deviation = np.zeros(count)
+    np.maximum.at(deviation, corner_regions, distances)
+    fixed |= deviation > tolerance
+    return normals, fixed
+
+
+def _retriangulate(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    index: EdgeIndex,
+    regions: np.ndarray,
+    normals: np.ndarray,
+    fixed: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Faces with every changed region re-triangulated, and the regions that could not be."""
+    corner_vertices = faces.ravel()
+    slot_regions = np.repeat(regions, 3)
+    ends = faces[:, [1, 2, 0]].ravel()
+
+    # Border slots separate two regions or lie on boundary and non-manifold edges.
+    first, second = index.manifold_pairs()
+    inner = slot_regions[first] == slot_regions[second]
+    twin = np.full(len(corner_vertices), -1, dtype=np.int64)
+    twin[first[inner]] = second[inner]
+    twin[second[inner]] = first[inner]
+    border = twin < 0
+
+    locked = np.zeros(len(vertices), dtype=bool)
+    locked[index.edges[index.counts != 2].ravel()] = True
+    locked[corner_vertices[fixed[slot_regions]]] = True
+    # Without border edges the faces around a vertex all lie in one region and it can go.
+    border_starts = np.bincount(corner_vertices[border], minlength=len(vertices))
+    removed = border_starts == 0
+    removed |= _collinear_border_vertices(vertices, corner_vertices, ends, slot_regions, border, border_starts)
+    removed &= ~locked
+    changed = np.bincount(slot_regions, weights=removed[corner_vertices], minlength=len(fixed)) > 0
+
+    slots = np.flatnonzero(border & changed[slot_regions])
+    successor, lost = _border_successors(slots, border, twin)
+    if len(lost):
+        return faces, np.unique(slot_regions[lost])
+    loops, loop_ids = _trace_loops(slots, successor)
+    kept = ~removed[corner_vertices[loops]]
+    loop_vertices, loop_ids = corner_vertices[loops[kept]], loop_ids[kept]
+    loop_regions = slot_regions[loops[kept]]
+    triangles, failed = _triangulate_regions(vertices, loop_vertices, loop_ids, loop_regions, normals)
+    if len(failed):
+        return faces, failed
+    triangles = _flip_degenerate(vertices, triangles)
+    return np.concatenate([faces[~changed[regions]], triangles]), np.empty(0, dtype=np.int64)
+
+
+def _collinear_border_vertices(
+    vertices: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    slot_regions: np.ndarray,
+    border: np.ndarray,
+    border_starts: np.ndarray,
+) -> np.ndarray:
+    """Vertices on a straight border between exactly two regions."""
+    slots = np.flatnonzero(border & (border_starts[starts] == 2))
+    slots = slots[np.argsort(starts[slots], kind="stable")]
+    middle = starts[slots][::2]
+    before = vertices[ends[slots][::2]] - vertices[middle]
+    after = vertices[ends[slots][1::2]] - vertices[middle]
+    span = np.linalg.norm(after - before, axis=1)
+    offset = np.linalg.norm(np.cross(before, after), axis=1)
+    # One border edge leaves the vertex in each region, so the faces around it form exactly two regions.
+    straight = (
+        (slot_regions[slots][::2] != slot_regions[slots][1::2])
+        & ((before * after).sum(axis=1) < 0)
+        & (offset <= _RELATIVE_EPSILON * span * np.maximum(span, 1.0))
+    )
+    result = np.zeros(len(vertices), dtype=bool)
+    result[middle[straight]] = True
+    return result
+
+
+def _border_successors(slots: np.ndarray, border: np.ndarray, twin: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Next border slot of every border slot in its region, found by turning around the shared vertex.
+
+    Walking the face fan keeps the loops of a region that touches itself at a vertex apart.
+
+    Returns:
+        Successor slots aligned with ``slots`` and the slots whose fan walk did not end.
+    """
+    successor = np.empty(len(slots), dtype=np.int64)
+    active = np.arange(len(slots))
+    current = _next_slot(slots)
+    for _ in range(_MAX_REPAIR_STEPS):
+        done = border[current]
+        successor[active[done]] = current[done]
+        active, current = active[~done], current[~done]
+        if len(active) == 0:
+            return successor, np.empty(0, dtype=np.int64)
+        current = _next_slot(twin[current])
+    return successor, slots[active]
+
+
+def _next_slot(slots: np.ndarray) -> np.ndarray:
+    """Slot that follows each slot in its face."""
+    return slots - slots % 3 + (slots % 3 + 1) % 3
+
+
+def _trace_loops(slots: np.ndarray, successor: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Border slots in loop order and the loop number of each."""
+    position = np.full(int(slots.max(initial=-1)) + 1, -1, dtype=np.int64)
+    position[slots] = np.arange(len(slots))
+    following = position[successor].tolist()
+    visited = bytearray(len(slots))
+    order: List[int] = []
+    sizes: List[int] = []
+    for seed in range(len(slots)):
+        if visited[seed]:
+            continue
+        count = 0
+        item = seed
+        while not visited[item]:
+            visited[item] = 1
+            order.append(item)
+            item = following[item]
+            count += 1
+        sizes.append(count)
+    return slots[np.asarray(order, dtype=np.int64)], np.repeat(np.arange(len(sizes)), sizes)
+
+
+def _triangulate_regions(
+    vertices: np.ndarray,
+    loop_vertices: np.ndarray,
+    loop_ids: np.ndarray,
+    loop_regions: np.ndarray,
+    normals: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Ear-clip the border loops of every changed region in its plane.
+
+    Earcut drops collinear points, so only loop corners are clipped and the straight runs between
+    them are fanned back into the triangles on their edges.
+
+    Returns:
+        Triangles and the regions whose loops do not form a valid polygon.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(loop_ids) == 0:
+        return np.empty((0, 3), dtype=np.int64), empty
+    sizes = np.bincount(loop_ids)
+    present = np.flatnonzero(sizes)
+    sizes, starts = sizes[present], np.searchsorted(loop_ids, present)
+    loop_number = np.repeat(np.arange(len(sizes)), sizes)
+    region_of_loop = loop_regions[starts]
+
+    # In-plane basis with u x w = normal; faces wind counter-clockwise in it, so regions lie left of their loops.
+    region_normals = normals[loop_regions]
+    axis = np.eye(3)[np.argmin(np.abs(region_normals), axis=1)]
+    u = np.cross(region_normals, axis)
+    u /= np.linalg.norm(u, axis=1)[:, None]
+    w = np.cross(region_normals, u)
+    points = vertices[loop_vertices]
+    coordinates = np.column_stack([(points * u).sum(axis=1), (points * w).sum(axis=1)])
+    following = np.arange(1, len(loop_ids) + 1)
+    following[starts + sizes - 1] = starts
+    preceding = np.arange(-1, len(loop_ids) - 1)
+    preceding[starts] = starts + sizes - 1
+    x, y = coordinates[:, 0], coordinates[:, 1]
+    area = np.abs(np.bincount(loop_number, weights=x * y[following] - y * x[following]))
+    before, after = coordinates[preceding] - coordinates, coordinates[following] - coordinates
+    turn = before[:, 0] * after[:, 1] - before[:, 1] * after[:, 0]
+    lengths = np.linalg.norm(before, axis=1) * np.linalg.norm(after, axis=1)
+    corner = ~((np.abs(turn) <= _RELATIVE_EPSILON * lengths) & ((before * after).sum(axis=1) < 0))
+    # Earcut loses triangles at points it sees twice, so where a region touches itself each pass
+    # through the shared vertex is moved a little into the region along its angle bisector.
+    keys = loop_regions * len(vertices) + loop_vertices
+    order = np.argsort(keys, kind="stable")
+    repeated = np.zeros(len(keys), dtype=bool)
+    same = keys[order[1:]] == keys[order[:-1]]
+    repeated[order[1:][same]] = repeated[order[:-1][same]] = True
+    if np.any(repeated):
+        ahead, behind = after[repeated], before[repeated]
+        reach = np.minimum(np.linalg.norm(ahead, axis=1), np.linalg.norm(behind, axis=1))
+        angle = np.arctan2(-turn[repeated], (ahead * behind).sum(axis=1)) % (2.0 * np.pi) / 2.0
+        direction = ahead / np.linalg.norm(ahead, axis=1)[:, None]
+        cos, sin = np.cos(angle), np.sin(angle)
+        bisector = np.column_stack(
+            [cos * direction[:, 0] - sin * direction[:, 1], sin * direction[:, 0] + cos * direction[:, 1]]
+        )
+        coordinates[repeated] += _PINCH_OFFSET * reach[:, None] * bisector
+    corner_count = np.bincount(loop_number[corner], minlength=len(sizes))
+    failed = np.unique(region_of_loop[corner_count < 3])
+    if len(failed):
+        return np.empty((0, 3), dtype=np.int64), failed
+
+    # Loops are rotated to start at a corner, and earcut takes the outer loop, which encloses
+    # the largest area, first and the holes after it.
+    corner_entries = np.flatnonzero(corner)
+    shift = corner_entries[np.searchsorted(loop_number[corner_entries], np.arange(len(sizes)))] - starts
+    largest = np.full(int(region_of_loop.max()) + 1, -1.0)
+    np.maximum.at(largest, region_of_loop, area)
+    loop_order = np.lexsort((area != largest[region_of_loop], region_of_loop))
+    ordered_sizes = sizes[loop_order]
+    ordered_starts = np.cumsum(ordered_sizes) - ordered_sizes
+    step = np.arange(len(loop_ids)) - np.repeat(ordered_starts, ordered_sizes)
+    entries = np.repeat(starts[loop_order], ordered_sizes)
+    entries += (step + np.repeat(shift[loop_order], ordered_sizes)) % np.repeat(ordered_sizes, ordered_sizes)
+    coordinates, ids, corner = coordinates[entries], loop_vertices[entries], corner[entries]
+
+    # Each corner is followed by the run of collinear points up to the next corner of its loop.
+    corner_entries = np.flatnonzero(corner)
+    run_end = np.r_[corner_entries[1:], len(corner)]
+    loop_of_entry = np.repeat(np.arange(len(ordered_sizes)), ordered_sizes)
+    corner_loop = loop_of_entry[corner_entries]
+    loop_end = (ordered_starts + ordered_sizes)[corner_loop]
+    run_end = np.minimum(run_end, loop_end)
+    next_corner = np.full(len(corner), -1, dtype=np.int64)
+    next_corner[corner_entries] = np.where(run_end == loop_end, ordered_starts[corner_loop], run_end)
+    run_length = np.zeros(len(corner), dtype=np.int64)
+    run_length[corner_entries] = run_end - corner_entries - 1
+
+    ordered_regions = region_of_loop[loop_order]
+    ring_ends = np.cumsum(np.bincount(corner_loop, minlength=len(ordered_sizes)))
+    bounds = np.flatnonzero(np.r_[True, ordered_regions[1:] != ordered_regions[:-1], True])
+    triangles: List[np.ndarray] = []
+    failures: List[int] = []
+    for first, last in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        offset = int(ring_ends[first - 1]) if first else 0
+        rings = (ring_ends[first:last] - offset).astype(np.uint32)
+        region_corners = corner_entries[offset : int(ring_ends[last - 1])]
+        clipped = mapbox_earcut.triangulate_float64(coordinates[region_corners], rings).reshape(-1, 3)
+        expected = int(rings[-1]) + 2 * (last - first) - 4
+        if len(clipped) != expected:
+            clipped = _split_t_junctions(clipped.astype(np.int64), coordinates[region_corners], rings)
+        if clipped is None or len(clipped) != expected:
+            failures.append(int(ordered_regions[first]))
+            continue
+        triangles.append(region_corners[clipped])
+    if failures:
+        return np.empty((0, 3), dtype=np.int64), np.asarray(failures, dtype=np.int64)
+
+    entry_triangles = np.concatenate(triangles)
+    corners = coordinates[entry_triangles]
+    signed = (corners[:, 1, 0] - corners[:, 0, 0]) * (corners[:, 2, 1] - corners[:, 0, 1]) - (
+        corners[:, 1, 1] - corners[:, 0, 1]
+    ) * (corners[:, 2, 0] - corners[:, 0, 0])
+    triangle_regions = ordered_regions[loop_of_entry[entry_triangles[:, 0]]]
+    flipped = np.bincount(triangle_regions, weights=signed, minlength=len(normals)) < 0
+    entry_triangles[flipped[triangle_regions]] = entry_triangles[flipped[triangle_regions]][:, ::-1]
+    entry_triangles = _fan_runs(entry_triangles, next_corner, run_length)
+
+    result = ids[entry_triangles]
+    collapsed = (result[:, 0] == result[:, 1]) | (result[:, 1] == result[:, 2]) | (result[:, 2] == result[:, 0])
+    if np.any(collapsed):
+        # A region touching itself at a vertex can come out with a triangle across the pinch.
+        failed = np.unique(ordered_regions[loop_of_entry[entry_triangles[collapsed, 0]]])
+        return np.empty((0, 3), dtype=np.int64), failed
+    return result, empty
+
+
+def _fan_runs(triangles: np.ndarray, next_corner: np.ndarray, run_length: np.ndarray) -> np.ndarray:
+    """Split triangles whose edges span a run of collinear loop points into fans from the opposite corner."""
+    for _ in range(3):
+        spanned = (next_corner[triangles] == np.roll(triangles, -1, axis=1)) & (run_length[triangles] > 0)
+        split = np.flatnonzero(spanned.any(axis=1))
+        if len(split) == 0:
+            break
+        # Rotate each split triangle so that its first spanned edge runs from corner 0 to corner 1.
+        rotation = np.argmax(spanned[split], axis=1)
+        rotated = triangles[split[:, None], (rotation[:, None] + np.arange(3)) % 3]
+        count = run_length[rotated[:, 0]] + 1
+        step = np.arange(int(count.sum())) - np.repeat(np.cumsum(count) - count, count)
+        start = np.repeat(rotated[:, 0], count) + step
+        end = np.where(step == np.repeat(count, count) - 1, np.repeat(rotated[:, 1], count), start + 1)
+        fans = np.column_stack([start, end, np.repeat(rotated[:, 2], count)])
+        triangles = np.concatenate([np.delete(triangles, split, axis=0), fans])
+    return triangles
+
+
+def _flip_degenerate(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Flip zero-area triangles with their neighbour across the longest edge.
+
+    Ear clipping makes such triangles where points of different loops line up. The middle point
+    of a flat triangle lies on its longest edge, so the pair is split at that point instead.
+    """
+    for _ in range(_MAX_REPAIR_STEPS):
+        corners = vertices[triangles]
+        sides = corners[:, [1, 2, 0]] - corners
+        lengths = (sides**2).sum(axis=2)
+        area = np.linalg.norm(np.cross(sides[:, 0], sides[:, 1]), axis=1)
+        flat = np.flatnonzero(area <= _RELATIVE_EPSILON * lengths.max(axis=1))
+        if len(flat) == 0:
+            break
+        keys = triangles * len(vertices) + triangles[:, [1, 2, 0]]
+        order = np.argsort(keys.ravel())
+        sorted_keys = keys.ravel()[order]
+        touched = np.zeros(len(triangles), dtype=bool)
+        for number, side in zip(flat.tolist(), lengths[flat].argmax(axis=1).tolist()):
+            start, end, middle = (triangles[number, (side + k) % 3] for k in range(3))
+            found = int(np.searchsorted(sorted_keys, end * len(vertices) + start))
+            if found == len(sorted_keys) or sorted_keys[found] != end * len(vertices) + start:
+                continue
+            neighbour, corner = divmod(int(order[found]), 3)
+            if touched[number] or touched[neighbour]:
+                continue
+            apex = triangles[neighbour, (corner + 2) % 3]
+            triangles[number] = (middle, start, apex)
+            triangles[neighbour] = (end, middle, apex)
+            touched[[number, neighbour]] = True
+        if not touched.any():
+            break
+    return triangles
+
+
+def _split_t_junctions(triangles: np.ndarray, points: np.ndarray, rings: np.ndarray) -> np.ndarray | None:
+    """Split ear-clipped triangles whose edges pass through other loop points.
+
+    Earcut leaves such points as T-junctions when the triangle that would connect them has no
+    area. Every triangle edge that is neither shared nor a loop edge is fanned from the opposite
+    corner through the loose points lying on it.
+
+    Returns:
+        Triangles without T-junctions, or ``None`` if an open edge has no points on it.
+    """
+    a, b, c = points[triangles[:, 0]], points[triangles[:, 1]], points[triangles[:, 2]]
+    if ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])).sum() < 0:
+        triangles = triangles[:, ::-1]
+    starts = np.r_[0, rings[:-1]].astype(np.int64)
+    ring_edges = {
+        (int(point), int(starts[number] + (point - starts[number] + 1) % (rings[number] - starts[number])))
+        for number in range(len(rings))
+        for point in range(starts[number], rings[number])
+    }
+    for _ in range(_MAX_REPAIR_STEPS):
+        edges = {(int(row[k]), int(row[(k + 1) % 3])): number for number, row in enumerate(triangles) for k in range(3)}
+        unpaired = [edge for edge in edges if edge[::-1] not in edges and edge not in ring_edges]
+        if not unpaired:
+            return triangles
+        loose = np.array(sorted({point for edge in unpaired + list(ring_edges - edges.keys()) for point in edge}))
+        split: Dict[int, List[List[int]]] = {}
+        for start, end in unpaired:
+            number = edges[(start, end)]
+            if number in split:
+                continue
+            direction = points[end] - points[start]
+            length = float(direction @ direction)
+            offset = points[loose] - points[start]
+            along = offset @ direction
+            cross = np.abs(offset[:, 0] * direction[1] - offset[:, 1] * direction[0])
+            inside = (along > 0) & (along < length) & (cross <= _RELATIVE_EPSILON * length * max(length, 1.0))
+            if not np.any(inside):
+                continue
+            row = triangles[number].tolist()
+            apex = row[(row.index(start) + 2) % 3]
+            path = [start] + loose[inside][np.argsort(along[inside])].tolist() + [end]
+            split[number] = [[path[k], path[k + 1], apex] for k in range(len(path) - 1)]
+        if not split:
+            return None
+        fans = np.array([row for rows in split.values() for row in rows], dtype=np.int64)
+        triangles = np.concatenate([np.delete(triangles, list(split), axis=0), fans])
+    return None
@@ -0,0 +1,151 @@
+"""Trace output faces back to the IFC elements they were built from.
+
+The envelope, decimation and smoothing stages rebuild the mesh, so element
+identity cannot ride along on faces. Instead the tessellated element surfaces
+are recorded with a group label (IFC class or storey) during extraction, and
+each face of a finished mesh takes the label of the element surface it covers:
+a ray from the face center along the inward normal finds that surface (Embree
+when installed, otherwise the NumPy ``TriangleBVH``), and faces whose ray
+misses, such as the floor of a filled room, take the closest element surface
+instead.
+
+Example:
+    recorder = ProvenanceRecorder("storey", ElementIndex(model))
+    for element_mesh in recorder.track(element_meshes):
+        buffer.append(element_mesh.vertices, element_mesh.faces)
+    groups = recorder.provenance().assign(envelope)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.filters.element_filter import ElementIndex
+from bimto3dprint.processors.tessellator import ElementMesh
+from bimto3dprint.utils.bvh import TriangleBVH
+from bimto3dprint.utils.mesh_buffer import MeshBuffer
+from bimto3dprint.utils.proximity import SurfaceDistance
+
+GROUP_KEYS = ("ifc_class", "storey")
+PROVENANCE_KEY = "provenance"
+"""``mesh.metadata`` key under which extracted meshes carry their ``ElementProvenance``."""
+UNGROUPED = "ungrouped"
+"""Group name of elements without a storey."""
+_RAY_OFFSET = 1e-6
+"""Ray origins start this fraction of the mesh size outside the face."""
+
+
+@dataclass
+class FaceGroups:
+    """Group label of every face of a mesh.
+
+    Attributes:
+        names: Group names.
+        labels: Index into ``names`` for each face.
+    """
+
+    names: List[str]
+    labels: np.ndarray
+
+    def runs(self) -> Iterator[tuple[str, np.ndarray]]:
+        """Face indices of each non-empty group, in name order."""
+        order = np.argsort(self.labels, kind="stable")
+        bounds = np.searchsorted(self.labels[order], np.arange(len(self.names) + 1))
+        for label in np.argsort(self.names, kind="stable"):
+            if bounds[label + 1] > bounds[label]:
+                yield self.names[label], order[bounds[label] : bounds[label + 1]]
+
+
+@dataclass
+class ElementProvenance:
+    """Element surfaces with the group label of every face.
+
+    Attributes:
+        key: Grouping, one of ``GROUP_KEYS``.
+        surface: Combined element surfaces.
+        face_labels: Group index of every face of ``surface``.
+        names: Group names.
+    """
+
+    key: str
+    surface: trimesh.Trimesh
+    face_labels: np.ndarray
+    names: List[str]
+
+    def apply_scale(self, factor: float) -> None:
+        """Scale the recorded surfaces along with the mesh they describe."""
+        if factor != 1.0:
+            self.surface.apply_scale(factor)
+
+    def assign(self, mesh: trimesh.Trimesh) -> FaceGroups:
+        """Label the faces of ``mesh`` with the group of the element surface under them.
+
+        Args:
+            mesh: Mesh derived from the recorded elements.
+
+        Returns:
+            Group of every face of ``mesh``.
+        """
+        centers = mesh.triangles_center
+        normals = mesh.face_normals
+        origins = centers + normals * (_RAY_OFFSET * float(np.max(mesh.extents)))
+        if trimesh.ray.has_embree:
+            hits = self.surface.ray.intersects_first(ray_origins=origins, ray_directions=-normals)
+        else:
+            # Without Embree trimesh falls back to a slow Python intersector.
+            _, hits = TriangleBVH.build(self.surface.triangles).intersect(origins, -normals)
+
+        missed = np.flatnonzero(hits < 0)
+        if len(missed):
+            _, hits[missed] = SurfaceDistance(self.surface).query(centers[missed])
+        logger.info(
+            "Grouped {} faces by {} into {} groups ({} by closest element)",
+            len(centers),
+            self.key,
+            len(self.names),
+            len(missed),
+        )
+        return FaceGroups(names=list(self.names), labels=self.face_labels[hits])
+
+
+@dataclass
+class ProvenanceRecorder:
+    """Record element surfaces and their groups while they stream to extraction.
+
+    Attributes:
+        key: Grouping, one of ``GROUP_KEYS``.
+        index: Inverse-attribute index of the model, used for storeys.
+    """
+
+    key: str
+    index: ElementIndex
+    _buffer: MeshBuffer = field(default_factory=MeshBuffer, init=False, repr=False)
+    _labels: List[np.ndarray] = field(default_factory=list, init=False, repr=False)
+    _groups: Dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.key not in GROUP_KEYS:
+            raise ValueError(f"Unsupported face grouping: {self.key}; use one of: {', '.join(GROUP_KEYS)}")
+
+    def track(self, element_meshes: Iterable[ElementMesh]) -> Iterator[ElementMesh]:
+        """Pass element meshes through, recording each one."""
+        for element_mesh in element_meshes:
+            name = self._group_name(element_mesh)
+            label = self._groups.setdefault(name, len(self._groups))
+            self._buffer.append(element_mesh.vertices, element_mesh.faces)
+            self._labels.append(np.full(len(element_mesh.faces), label, dtype=np.int32))
+            yield element_mesh
+
+    def provenance(self) -> ElementProvenance:
+        """Recorded surfaces and labels."""
+        labels = np.concatenate(self._labels) if self._labels else np.empty(0, dtype=np.int32)
+        return ElementProvenance(self.key, self._buffer.to_trimesh(), labels, list(self._groups))
+
+    def _group_name(self, element_mesh: ElementMesh) -> str:
+        if self.key == "ifc_class":
+            return element_mesh.ifc_class
+        return self.index.storey(self.index.model.by_id(element_mesh.element_id)) or UNGROUPED
@@ -13,15 +13,25 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Iterable, Iterator, Mapping, Sequence
 
 import ifcopenshell
-import ifcopenshell.geom
 import numpy as np
 import trimesh
 from loguru import logger
 
+from bimto3dprint.filters.element_filter import ElementIndex, filter_elements
+from bimto3dprint.filters.exterior_filter import DEFAULT_CELL_SIZE_M, ExteriorFilter
+from bimto3dprint.filters.geometry_cleaner import GeometryCleaner
 from bimto3dprint.integrations.ifc_env_extractor import IfcEnvExtractorRunner
+from bimto3dprint.processors.decimation import QuadricDecimator
+from bimto3dprint.processors.planar_remesh import PLANAR_TOLERANCE_VOXELS, remesh_planar_regions
+from bimto3dprint.processors.provenance import PROVENANCE_KEY, ProvenanceRecorder
+from bimto3dprint.processors.smoothing import VOXEL_PITCH_KEY
+from bimto3dprint.processors.tessellation_cache import TessellationCache
+from bimto3dprint.processors.tessellator import ElementMesh, Tessellator
+from bimto3dprint.processors.voxel_engine import DEFAULT_BLOCK_SIZE, SparseVoxelGrid
+from bimto3dprint.utils.mesh_buffer import MeshBuffer
 
 
 DEFAULT_CATEGORIES: tuple[str, ...] = (
@@ -34,15 +44,43 @@ DEFAULT_CATEGORIES: tuple[str, ...] = (
     "IfcColumn",
     "IfcBeam",
 )
+DEFAULT_TESSELLATION_BATCH = 2000
+DEFAULT_CHUNK_VOXEL_PITCH = 1.0
+SIMPLIFY_LEVELS = {"low": 0.25, "medium": 0.5, "high": 0.75}
+"""Face ratios kept by the named simplification levels."""
+DECIMATION_ENGINES = ("auto", "trimesh", "numpy")
 
 
 @dataclass
 class ShellExtractor:
-    """Extract a simplified building envelope mesh from IFC geometry."""
+    """Extract a simplified building envelope mesh from IFC geometry.
+
+    Attributes:
+        threads: Worker threads for tessellation.
+        cache: Optional persistent tessellation cache.
+        decimation_engine: ``"trimesh"`` (quadric decimation backend of trimesh),
+            ``"numpy"`` (built-in :class:`QuadricDecimator`) or ``"auto"`` (the
+            trimesh backend when installed).
+    """
+
+    threads: int = 1
+    cache: TessellationCache | None = None
+    decimation_engine: str = "auto"
+
+    def __post_init__(self) -> None:
+        if self.decimation_engine not in DECIMATION_ENGINES:
+            raise ValueError(f"decimation_engine must be one of: {', '.join(DECIMATION_ENGINES)}")
 
     def extract_from_ifc(self, ifc_path: Path | str, config: Mapping[str, Any]) -> trimesh.Trimesh:
         """Load IFC and extract a building envelope mesh.
 
+        Element geometry is streamed into a growable vertex/face buffer. When
+        ``config["chunk_faces"]`` is set, the buffer is handed to the envelope stage
+        every time it reaches that many faces, which bounds peak memory.
+        ``config["face_groups"]`` (``"ifc_class"`` or ``"storey"``) records the
+        element surfaces and attaches them to the envelope as an
+        :class:`ElementProvenance` under ``metadata["provenance"]``.
+
         Args:
             ifc_path: Path to the IFC file.
             config: Configuration mapping with extraction options.
@@ -67,15 +105,37 @@ class ShellExtractor:
         categories: Sequence[str] | Mapping[str, Any] = config.get("categories", DEFAULT_CATEGORIES)
         if isinstance(categories, Mapping):
             categories = categories.get("include", DEFAULT_CATEGORIES)
-        mesh_list = self._collect_meshes(model, categories)
-        if not mesh_list:
-            raise ValueError("No geometry extracted from IFC elements.")
+        elements = self._collect_elements(model, categories)
+        # Filtered-out and interior elements are dropped before tessellation.
+        index = ElementIndex(model)
+        elements = filter_elements(elements, config, index)
+        if config.get("skip_interior"):
+            cell_size = float(config.get("interior_cell_size", DEFAULT_CELL_SIZE_M))
+            elements = ExteriorFilter(cell_size=cell_size).apply(elements, index)
+        element_meshes = self._iter_element_meshes(model, elements, config)
+        recorder = None
+        if config.get("face_groups"):
+            # Element surfaces stay in memory so that output faces can be traced back to them.
+            recorder = ProvenanceRecorder(str(config["face_groups"]), index)
+            element_meshes = recorder.track(element_meshes)
+
+        chunk_faces = int(config.get("chunk_faces") or 0)
+        if chunk_faces > 0:
+            envelope = self._extract_envelope_chunked(element_meshes, config, chunk_faces)
+        else:
+            buffer = MeshBuffer()
+            for element_mesh in element_meshes:
+                buffer.append(element_mesh.vertices, element_mesh.faces)
+            if buffer.face_count == 0:
+                raise ValueError("No geometry extracted from IFC elements.")
 
-        combined = trimesh.util.concatenate(mesh_list)
-        logger.info("Combined mesh: vertices={}, faces={}", len(combined.vertices), len(combined.faces))
+            combined = buffer.to_trimesh()
+            logger.info("Combined mesh: vertices={}, faces={}", len(combined.vertices), len(combined.faces))
+            envelope = self._extract_envelope(combined, config)
 
-        envelope = self._extract_envelope(combined, config)
         logger.info("Envelope mesh: vertices={}, faces={}", len(envelope.vertices), len(envelope.faces))
+        if recorder is not None:
+            envelope.metadata[PROVENANCE_KEY] = recorder.provenance()
         return envelope
 
     def simplify_shell(self, mesh: trimesh.Trimesh, level: str | float) -> trimesh.Trimesh:
@@ -88,9 +148,8 @@ class ShellExtractor:
         Returns:
             Simplified mesh.
         """
-        ratio_map = {"low": 0.25, "medium": 0.5, "high": 0.75}
         if isinstance(level, str):
-            ratio = ratio_map.get(level.lower())
+            ratio = SIMPLIFY_LEVELS.get(level.lower())
             if ratio is None:
                 raise ValueError(f"Unsupported simplification level: {level}")
         else:
@@ -99,10 +158,32 @@ class ShellExtractor:
         ratio = min(max(ratio, 0.05), 1.0)
         target_faces = max(int(len(mesh.faces) * ratio), 100)
         logger.info("Simplifying mesh to ~{} faces (ratio={:.2f})", target_faces, ratio)
+        return self.decimate(mesh, target_faces)
 
-        simplified = mesh.simplify_quadratic_decimation(target_faces)
-        simplified.remove_unreferenced_vertices()
-        return simplified
+    def decimate(self, mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+        """Reduce a mesh to about ``target_faces`` faces with quadric decimation.
+
+        Args:
+            mesh: Input mesh.
+            target_faces: Face count to aim for.
+
+        Returns:
+            Decimated mesh without unreferenced vertices.
+
+        Raises:
+            ImportError: If the ``trimesh`` engine is selected and its backend is missing.
+        """
+        if self.decimation_engine != "numpy":
+            try:
+                simplified = mesh.simplify_quadric_decimation(face_count=target_faces)
+            except ImportError:
+                if self.decimation_engine == "trimesh":
+                    raise
+                logger.info("trimesh decimation backend is not installed; using the built-in quadric decimator")
+            else:
+                simplified.remove_unreferenced_vertices()
+                return simplified
+        return QuadricDecimator().decimate(mesh, target_faces)
 
     def ensure_watertight(self, mesh: trimesh.Trimesh) -> trimesh.Trimesh:
         """Repair mesh to make it watertight when possible.
@@ -113,17 +194,8 @@ class ShellExtractor:
         Returns:
             Repaired mesh.
         """
-        repaired = mesh.copy()
-        repaired.remove_degenerate_faces()
-        repaired.remove_duplicate_faces()
-        repaired.remove_infinite_values()
-        repaired.remove_unreferenced_vertices()
-        repaired.fix_normals()
-
-        holes_filled = trimesh.repair.fill_holes(repaired)
-        logger.info("Filled {} holes", holes_filled)
-
-        if not repaired.is_watertight:
+        repaired, report = GeometryCleaner(detect_self_intersections=False).clean(mesh)
+        if not report.is_watertight:
             logger.warning("Mesh is still not watertight after repair")
 
         return repaired
@@ -155,33 +227,72 @@ class ShellExtractor:
         scaled.apply_scale(scale_factor)
         return scaled
 
-    def _collect_meshes(self, model: ifcopenshell.file, categories: Sequence[str]) -> list[trimesh.Trimesh]:
-        settings = ifcopenshell.geom.settings()
-        settings.set(settings.USE_WORLD_COORDS, True)
-        settings.set(settings.INCLUDE_CURVES, False)
-
-        meshes: list[trimesh.Trimesh] = []
+    def _collect_elements(
+        self,
+        model: ifcopenshell.file,
+        categories: Sequence[str],
+    ) -> list[ifcopenshell.entity_instance]:
+        elements: list[ifcopenshell.entity_instance] = []
         for category in categories:
-            elements = model.by_type(category)
-            logger.info("Collecting elements: {} (count={})", category, len(elements))
-            for element in elements:
-                try:
-                    shape = ifcopenshell.geom.create_shape(settings, element)
-                except Exception as exc:  # noqa: BLE001 - IFC geometry failures are expected
-                    logger.warning("Failed to create shape for {}: {}", element.GlobalId, exc)
-                    continue
-
-                geometry = shape.geometry
-                vertices = np.array(geometry.verts, dtype=float).reshape(-1, 3)
-                faces = np.array(geometry.faces, dtype=int).reshape(-1, 3)
-                if len(vertices) == 0 or len(faces) == 0:
-                    continue
-
-                mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
-                mesh.remove_unreferenced_vertices()
-                meshes.append(mesh)
-
-        return meshes
+            matched = model.by_type(category)
+            logger.info("Collecting elements: {} (count={})", category, len(matched))
+            elements.extend(matched)
+        return elements
+
+    def _iter_element_meshes(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+        config: Mapping[str, Any],
+    ) -> Iterator[ElementMesh]:
+        tessellator = Tessellator(threads=self.threads, cache=self.cache)
+        batch_size = int(config.get("tessellation_batch", DEFAULT_TESSELLATION_BATCH))
+        return tessellator.iter_tessellate(model, elements, batch_size=batch_size)
+
+    def _extract_envelope_chunked(
+        self,
+        element_meshes: Iterable[ElementMesh],
+        config: Mapping[str, Any],
+        chunk_faces: int,
+    ) -> trimesh.Trimesh:
+        method = str(config.get("method", "voxel")).lower()
+        hull_points: list[np.ndarray] = []
+        grid: SparseVoxelGrid | None = None
+        if method != "convex_hull":
+            if "voxel_pitch" not in config:
+                logger.info("Chunked extraction without voxel_pitch; using {:.3f}", DEFAULT_CHUNK_VOXEL_PITCH)
+            grid = self._voxel_grid(float(config.get("voxel_pitch", DEFAULT_CHUNK_VOXEL_PITCH)), config)
+
+        def consume(chunk: trimesh.Trimesh) -> None:
+            if grid is None:
+                hull_points.append(np.asarray(chunk.convex_hull.vertices))
+            else:
+                grid.add_mesh(chunk)
+
+        buffer = MeshBuffer()
+        chunk_count = 0
+        total_faces = 0
+        for element_mesh in element_meshes:
+            buffer.append(element_mesh.vertices, element_mesh.faces)
+            if buffer.face_count >= chunk_faces:
+                consume(buffer.to_trimesh())
+                chunk_count += 1
+                total_faces += buffer.face_count
+                buffer.clear()
+        if buffer.face_count:
+            consume(buffer.to_trimesh())
+            chunk_count += 1
+            total_faces += buffer.face_count
+        if total_faces == 0:
+            raise ValueError("No geometry extracted from IFC elements.")
+        logger.info("Streamed {} faces to the envelope stage in {} chunks", total_faces, chunk_count)
+
+        if grid is None:
+            logger.info("Using convex hull for envelope extraction")
+            return trimesh.convex.convex_hull(np.vstack(hull_points))
+
+        logger.info("Using chunked voxel envelope with pitch {:.3f}", grid.pitch)
+        return self._voxel_envelope(grid, config)
 
     def _extract_envelope(self, mesh: trimesh.Trimesh, config: Mapping[str, Any]) -> trimesh.Trimesh:
         method = str(config.get("method", "voxel")).lower()
@@ -194,10 +305,23 @@ class ShellExtractor:
         pitch = float(config.get("voxel_pitch", max(max_extent / 200.0, 1.0)))
         logger.info("Using voxel envelope with pitch {:.3f}", pitch)
 
-        voxel_grid = mesh.voxelized(pitch)
-        voxel_grid = voxel_grid.fill()
-        envelope = voxel_grid.marching_cubes
-        envelope.remove_unreferenced_vertices()
+        grid = self._voxel_grid(pitch, config)
+        grid.add_mesh(mesh)
+        return self._voxel_envelope(grid, config)
+
+    def _voxel_grid(self, pitch: float, config: Mapping[str, Any]) -> SparseVoxelGrid:
+        return SparseVoxelGrid(pitch, block_size=int(config.get("voxel_block_size", DEFAULT_BLOCK_SIZE)))
+
+    def _voxel_envelope(self, grid: SparseVoxelGrid, config: Mapping[str, Any]) -> trimesh.Trimesh:
+        min_void_volume = config.get("min_void_volume")
+        envelope = grid.envelope(
+            fill_courtyards=bool(config.get("fill_courtyards", False)),
+            min_void_volume=None if min_void_volume is None else float(min_void_volume),
+        )
+        tolerance = config.get("planar_tolerance", PLANAR_TOLERANCE_VOXELS)
+        if tolerance is not None:
+            envelope = remesh_planar_regions(envelope, float(tolerance) * grid.pitch)
+        envelope.metadata[VOXEL_PITCH_KEY] = grid.pitch
         return envelope
 
     def _extract_with_tudelft(self, ifc_path: Path, config: Mapping[str, Any]) -> trimesh.Trimesh:
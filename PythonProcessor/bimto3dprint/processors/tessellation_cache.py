@@ -0,0 +1,236 @@
+"""Persistent on-disk cache for tessellated IFC element meshes.
+
+Example:
+    from pathlib import Path
+
+    cache = TessellationCache(Path("cache"))
+    key = cache.element_key(model, element, settings_signature(settings))
+    cached = cache.get(key)
+    if cached is None:
+        cache.put(key, vertices, faces)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import ifcopenshell
+import ifcopenshell.geom
+import numpy as np
+from loguru import logger
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "bimto3dprint" / "tessellation"
+DEFAULT_CACHE_MAX_MB = 2048.0
+CACHE_FORMAT_VERSION = "1"
+
+_REFERENCE_PATTERN = re.compile(r"#(\d+)")
+
+
+def settings_signature(settings: ifcopenshell.geom.settings) -> str:
+    """Build a stable text signature of geometry settings.
+
+    Args:
+        settings: ifcopenshell geometry settings.
+
+    Returns:
+        Signature string that changes whenever tessellation output may change.
+    """
+    values: list[str] = [f"ifcopenshell={ifcopenshell.version}"]
+    if hasattr(settings, "setting_names"):
+        for name in settings.setting_names():
+            try:
+                values.append(f"{name}={settings.get(name)}")
+            except RuntimeError:  # unset settings keep their defaults
+                continue
+    else:
+        values.append(f"use-world-coords={settings.get(settings.USE_WORLD_COORDS)}")
+    return "|".join(values)
+
+
+def subtree_fingerprint(model: ifcopenshell.file, root: ifcopenshell.entity_instance) -> str:
+    """Hash an entity subtree by content.
+
+    Step ids are replaced by their position in the subtree, so identical geometry
+    hashes the same regardless of file numbering.
+
+    Args:
+        model: IFC model the entity belongs to.
+        root: Root entity of the subtree.
+
+    Returns:
+        Hex digest of the subtree content.
+    """
+    digest = hashlib.sha256()
+    subtree = model.traverse(root)
+    ordinals = {instance.id(): index for index, instance in enumerate(subtree)}
+    for instance in subtree:
+        text = _REFERENCE_PATTERN.sub(
+            lambda match: f"#{ordinals.get(int(match.group(1)), match.group(1))}",
+            str(instance),
+        )
+        digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class TessellationCache:
+    """Content-addressed store of element meshes with size-bounded LRU eviction."""
+
+    cache_dir: Path = DEFAULT_CACHE_DIR
+    max_size_mb: float = DEFAULT_CACHE_MAX_MB
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _size_bytes: int | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_size_mb <= 0:
+            raise ValueError("max_size_mb must be positive.")
+        self.cache_dir = Path(self.cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def element_key(
+        self,
+        model: ifcopenshell.file,
+        element: ifcopenshell.entity_instance,
+        signature: str,
+    ) -> str:
+        """Compute the cache key of an element.
+
+        The key hashes the GlobalId, the geometry settings and the entity subtrees that
+        define the element shape (representation, placement and voids), so renumbered
+        exports still hit.
+
+        Args:
+            model: IFC model the element belongs to.
+            element: IFC element.
+            signature: Geometry settings signature from ``settings_signature``.
+
+        Returns:
+            Hex digest key.
+        """
+        digest = hashlib.sha256()
+        digest.update(CACHE_FORMAT_VERSION.encode("utf-8"))
+        digest.update(str(getattr(element, "GlobalId", "")).encode("utf-8"))
+        digest.update(signature.encode("utf-8"))
+
+        roots = [getattr(element, "Representation", None), getattr(element, "ObjectPlacement", None)]
+        for relation in getattr(element, "HasOpenings", None) or ():
+            opening = relation.RelatedOpeningElement
+            roots.extend([opening.Representation, opening.ObjectPlacement])
+
+        for root in roots:
+            digest.update(b"\x00")
+            if root is not None:
+                digest.update(subtree_fingerprint(model, root).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Load cached vertices and faces.
+
+        Args:
+            key: Cache key from ``element_key``.
+
+        Returns:
+            Tuple of (vertices, faces) or None on a cache miss.
+        """
+        path = self._path_for(key)
+        try:
+            with np.load(path) as data:
+                vertices = data["vertices"].astype(float)
+                faces = data["faces"].astype(np.int64)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as exc:  # noqa: BLE001 - corrupt entries are dropped and recomputed
+            logger.warning("Dropping unreadable cache entry {}: {}", path, exc)
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:  # evicted concurrently; the loaded data is still valid
+            pass
+        self.hits += 1
+        return vertices, faces
+
+    def put(self, key: str, vertices: np.ndarray, faces: np.ndarray) -> None:
+        """Store element geometry and evict least recently used entries if needed.
+
+        Args:
+            key: Cache key from ``element_key``.
+            vertices: Vertex array of shape (N, 3).
+            faces: Face index array of shape (M, 3).
+        """
+        path = self._path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size_before = self._current_size()
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        face_dtype = np.uint16 if len(vertices) <= np.iinfo(np.uint16).max else np.uint32
+        handle, temp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez(file, vertices=np.asarray(vertices, dtype=float), faces=faces.astype(face_dtype))
+            os.replace(temp_name, path)
+        except OSError as exc:
+            logger.warning("Failed to write cache entry {}: {}", path, exc)
+            Path(temp_name).unlink(missing_ok=True)
+            return
+
+        # An existing entry for the key is overwritten, so only the size difference is added.
+        self._size_bytes = size_before - replaced + path.stat().st_size
+        if self._size_bytes > self.max_size_mb * 1024 * 1024:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits its size limit.
+
+        Returns:
+            Number of removed entries.
+        """
+        entries = []
+        for path in self.cache_dir.glob("*/*.npz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(key=lambda entry: entry[0])
+
+        limit = self.max_size_mb * 1024 * 1024
+        # Evict down to 90% of the limit so the next few writes do not rescan the cache.
+        target = limit * 0.9
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        self._size_bytes = total
+        if removed:
+            logger.info("Evicted {} tessellation cache entries ({:.1f} MB left)", removed, total / 1024 / 1024)
+        return removed
+
+    def log_stats(self) -> None:
+        """Log hit and miss counters."""
+        logger.info("Tessellation cache: hits={}, misses={}, dir={}", self.hits, self.misses, self.cache_dir)
+
+    def _current_size(self) -> int:
+        if self._size_bytes is None:
+            self._size_bytes = sum(
+                path.stat().st_size for path in self.cache_dir.glob("*/*.npz") if path.exists()
+            )
+        return self._size_bytes
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npz"
@@ -0,0 +1,392 @@
+"""Parallel IFC tessellation engine.
+
+Example:
+    import ifcopenshell
+
+    model = ifcopenshell.open("model.ifc")
+    tessellator = Tessellator(threads=8, cache=TessellationCache())
+    element_meshes = tessellator.tessellate(model, model.by_type("IfcWall"))
+    meshes = [element_mesh.to_trimesh() for element_mesh in element_meshes]
+"""
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Iterator, Sequence, Tuple
+
+import ifcopenshell
+import ifcopenshell.geom
+import ifcopenshell.util.placement
+import ifcopenshell.util.unit
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.processors.tessellation_cache import (
+    TessellationCache,
+    settings_signature,
+    subtree_fingerprint,
+)
+
+InstanceKey = Tuple[Tuple[str, int, str], ...]
+
+
+def create_geom_settings(world_coords: bool = True) -> ifcopenshell.geom.settings:
+    """Create ifcopenshell geometry settings used by the pipeline.
+
+    Args:
+        world_coords: Whether to bake object placements into vertices.
+
+    Returns:
+        Configured geometry settings.
+    """
+    settings = ifcopenshell.geom.settings()
+    settings.set(settings.USE_WORLD_COORDS, world_coords)
+    if hasattr(settings, "INCLUDE_CURVES"):  # ifcopenshell < 0.8 only
+        settings.set(settings.INCLUDE_CURVES, False)
+    return settings
+
+
+@dataclass
+class ElementMesh:
+    """Triangulated geometry of a single IFC element."""
+
+    element_id: int
+    global_id: str
+    ifc_class: str
+    vertices: np.ndarray
+    faces: np.ndarray
+
+    def to_trimesh(self) -> trimesh.Trimesh:
+        """Convert element geometry into a trimesh mesh."""
+        return trimesh.Trimesh(vertices=self.vertices, faces=self.faces, process=False)
+
+
+@dataclass
+class _InstancePlan:
+    """Prototype meshes of shared representations and their member elements."""
+
+    prototypes: dict[InstanceKey, ElementMesh] = field(default_factory=dict)
+    membership: dict[int, InstanceKey] = field(default_factory=dict)
+    unit_scale: float = 1.0
+
+
+@dataclass
+class Tessellator:
+    """Tessellate IFC elements on multiple cores via the ifcopenshell geometry iterator.
+
+    Elements whose body is made of the same mapped representation (IfcMappedItem of a
+    shared IfcRepresentationMap) are tessellated once and placed by their transforms.
+    """
+
+    threads: int = 1
+    world_coords: bool = True
+    cache: TessellationCache | None = None
+    instancing: bool = True
+
+    def __post_init__(self) -> None:
+        if self.threads <= 0:
+            raise ValueError("threads must be a positive integer.")
+
+    def tessellate(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+    ) -> list[ElementMesh]:
+        """Tessellate elements and return meshes in element order.
+
+        Elements that fail to triangulate or produce empty geometry are logged and skipped.
+
+        Args:
+            model: Opened IFC model.
+            elements: IFC elements to tessellate.
+
+        Returns:
+            Element meshes ordered like ``elements``.
+        """
+        return list(self.iter_tessellate(model, elements))
+
+    def iter_tessellate(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+        batch_size: int | None = None,
+    ) -> Iterator[ElementMesh]:
+        """Stream element meshes in element order.
+
+        Elements are tessellated in batches so that at most one batch of geometry is
+        held in memory while the consumer processes the stream.
+
+        Args:
+            model: Opened IFC model.
+            elements: IFC elements to tessellate.
+            batch_size: Elements per tessellation batch; all elements when omitted.
+
+        Yields:
+            Element meshes ordered like ``elements``.
+        """
+        if batch_size is not None and batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+
+        elements = list({element.id(): element for element in elements}.values())
+        if not elements:
+            return
+
+        plan = _InstancePlan()
+        if self.instancing and self.world_coords:
+            plan = self._plan_instances(model, elements)
+
+        settings = create_geom_settings(self.world_coords)
+        batch_size = batch_size or len(elements)
+        produced = 0
+        for start in range(0, len(elements), batch_size):
+            batch = elements[start : start + batch_size]
+            instanced = self._place_batch(batch, plan)
+            unique = [element for element in batch if element.id() not in instanced]
+            built = self._tessellate_unique(model, unique, settings)
+            for element in batch:
+                element_mesh = instanced.get(element.id()) or built.get(element.id())
+                if element_mesh is not None:
+                    produced += 1
+                    yield element_mesh
+
+        if self.cache is not None:
+            self.cache.log_stats()
+        logger.info("Tessellated {} of {} elements", produced, len(elements))
+
+    def _tessellate_unique(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+        settings: ifcopenshell.geom.settings,
+    ) -> dict[int, ElementMesh]:
+        if not elements:
+            return {}
+
+        cached, keys = self._lookup_cache(model, elements, settings)
+        pending = [element for element in elements if element.id() not in cached]
+
+        shapes: dict[int, object] = {}
+        errors: dict[int, str] = {}
+        if pending:
+            threads = min(self.threads, os.cpu_count() or 1, len(pending))
+            logger.info("Tessellating {} elements (threads={})", len(pending), threads)
+            shapes, errors = self._run_iterator(model, pending, settings, threads)
+
+        built: dict[int, ElementMesh] = {}
+        for element in elements:
+            if element.id() in cached:
+                vertices, faces = cached[element.id()]
+                built[element.id()] = self._build_element_mesh(element, vertices, faces)
+                continue
+
+            shape = shapes.pop(element.id(), None)
+            if shape is None:
+                logger.warning(
+                    "Failed to create shape for {}: {}",
+                    getattr(element, "GlobalId", element.id()),
+                    errors.get(element.id(), "no geometry produced"),
+                )
+                continue
+            element_mesh = self._to_element_mesh(element, shape.geometry)
+            if element_mesh is None:
+                continue
+            if self.cache is not None:
+                self.cache.put(keys[element.id()], element_mesh.vertices, element_mesh.faces)
+            built[element.id()] = element_mesh
+        return built
+
+    def _plan_instances(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+    ) -> _InstancePlan:
+        groups: dict[InstanceKey, list[ifcopenshell.entity_instance]] = defaultdict(list)
+        for element in elements:
+            key = self._instance_key(model, element)
+            if key is not None:
+                groups[key].append(element)
+        groups = {key: members for key, members in groups.items() if len(members) > 1}
+        if not groups:
+            return _InstancePlan()
+
+        representatives = {members[0].id(): key for key, members in groups.items()}
+        prototypes = self._tessellate_unique(
+            model,
+            [members[0] for members in groups.values()],
+            create_geom_settings(world_coords=False),
+        )
+
+        plan = _InstancePlan(unit_scale=float(ifcopenshell.util.unit.calculate_unit_scale(model)))
+        for element_id, element_mesh in prototypes.items():
+            key = representatives[element_id]
+            plan.prototypes[key] = element_mesh
+            for member in groups[key]:
+                plan.membership[member.id()] = key
+
+        logger.info(
+            "Instanced {} elements from {} shared representations",
+            len(plan.membership),
+            len(plan.prototypes),
+        )
+        return plan
+
+    def _place_batch(
+        self,
+        batch: Sequence[ifcopenshell.entity_instance],
+        plan: _InstancePlan,
+    ) -> dict[int, ElementMesh]:
+        groups: dict[InstanceKey, list[ifcopenshell.entity_instance]] = defaultdict(list)
+        for element in batch:
+            key = plan.membership.get(element.id())
+            if key is not None:
+                groups[key].append(element)
+
+        placed: dict[int, ElementMesh] = {}
+        for key, members in groups.items():
+            for element_mesh in self._place_instances(plan.prototypes[key], members, plan.unit_scale):
+                placed[element_mesh.element_id] = element_mesh
+        return placed
+
+    @staticmethod
+    def _instance_key(model: ifcopenshell.file, element: ifcopenshell.entity_instance) -> InstanceKey | None:
+        if getattr(element, "HasOpenings", None):
+            return None
+
+        representation = getattr(element, "Representation", None)
+        if representation is None:
+            return None
+
+        bodies = [item for item in representation.Representations if item.RepresentationIdentifier == "Body"]
+        if len(bodies) != 1 or not bodies[0].Items:
+            return None
+
+        key: list[tuple[str, int, str]] = []
+        for item in bodies[0].Items:
+            if not item.is_a("IfcMappedItem"):
+                return None
+            target = subtree_fingerprint(model, item.MappingTarget) if item.MappingTarget else ""
+            key.append((item.is_a(), item.MappingSource.id(), target))
+        return tuple(key)
+
+    @staticmethod
+    def _place_instances(
+        prototype: ElementMesh,
+        members: Sequence[ifcopenshell.entity_instance],
+        unit_scale: float,
+    ) -> list[ElementMesh]:
+        matrices = np.stack([Tessellator._placement_matrix(member, unit_scale) for member in members])
+        rotations = matrices[:, :3, :3]
+        translations = matrices[:, :3, 3]
+
+        vertices = np.einsum("kij,vj->kvi", rotations, prototype.vertices) + translations[:, None, :]
+        faces = np.repeat(prototype.faces[None, :, :], len(members), axis=0)
+        mirrored = np.linalg.det(rotations) < 0
+        faces[mirrored] = faces[mirrored][:, :, ::-1]
+
+        return [
+            Tessellator._build_element_mesh(member, vertices[index], faces[index])
+            for index, member in enumerate(members)
+        ]
+
+    @staticmethod
+    def _placement_matrix(element: ifcopenshell.entity_instance, unit_scale: float) -> np.ndarray:
+        placement = getattr(element, "ObjectPlacement", None)
+        if placement is None:
+            return np.eye(4)
+        matrix = np.array(ifcopenshell.util.placement.get_local_placement(placement), dtype=float)
+        matrix[:3, 3] *= unit_scale
+        return matrix
+
+    def _lookup_cache(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+        settings: ifcopenshell.geom.settings,
+    ) -> tuple[dict[int, tuple[np.ndarray, np.ndarray]], dict[int, str]]:
+        cached: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        keys: dict[int, str] = {}
+        if self.cache is None:
+            return cached, keys
+
+        signature = settings_signature(settings)
+        for element in elements:
+            key = self.cache.element_key(model, element, signature)
+            keys[element.id()] = key
+            entry = self.cache.get(key)
+            if entry is not None:
+                cached[element.id()] = entry
+        return cached, keys
+
+    def _run_iterator(
+        self,
+        model: ifcopenshell.file,
+        elements: Sequence[ifcopenshell.entity_instance],
+        settings: ifcopenshell.geom.settings,
+        threads: int,
+    ) -> tuple[dict[int, object], dict[int, str]]:
+        """Shapes by element id, and the error of every element without one."""
+        try:
+            iterator = ifcopenshell.geom.iterator(settings, model, threads, include=list(elements))
+            initialized = iterator.initialize()
+        except Exception as exc:  # noqa: BLE001 - fall back to per-element shapes
+            logger.warning("Geometry iterator unavailable, tessellating sequentially: {}", exc)
+            return self._run_sequential(settings, elements)
+
+        shapes: dict[int, object] = {}
+        if initialized:
+            while True:
+                shape = iterator.get()
+                shapes[int(shape.id)] = shape
+                if not iterator.next():
+                    break
+        # The iterator skips failing elements silently; rerunning them alone recovers their error message.
+        missing = [element for element in elements if element.id() not in shapes]
+        retried, errors = self._run_sequential(settings, missing)
+        shapes.update(retried)
+        return shapes, errors
+
+    @staticmethod
+    def _run_sequential(
+        settings: ifcopenshell.geom.settings,
+        elements: Sequence[ifcopenshell.entity_instance],
+    ) -> tuple[dict[int, object], dict[int, str]]:
+        shapes: dict[int, object] = {}
+        errors: dict[int, str] = {}
+        for element in elements:
+            try:
+                shapes[element.id()] = ifcopenshell.geom.create_shape(settings, element)
+            except Exception as exc:  # noqa: BLE001 - IFC geometry failures are expected
+                errors[element.id()] = str(exc) or type(exc).__name__
+        return shapes, errors
+
+    @staticmethod
+    def _to_element_mesh(element: ifcopenshell.entity_instance, geometry: object) -> ElementMesh | None:
+        vertices = np.asarray(geometry.verts, dtype=float).reshape(-1, 3)
+        faces = np.asarray(geometry.faces, dtype=np.int64).reshape(-1, 3)
+        if len(vertices) == 0 or len(faces) == 0:
+            logger.warning("Empty geometry for {}", getattr(element, "GlobalId", element.id()))
+            return None
+
+        used = np.unique(faces)
+        if len(used) != len(vertices):
+            remap = np.full(len(vertices), -1, dtype=np.int64)
+            remap[used] = np.arange(len(used))
+            vertices = vertices[used]
+            faces = remap[faces]
+        return Tessellator._build_element_mesh(element, vertices, faces)
+
+    @staticmethod
+    def _build_element_mesh(
+        element: ifcopenshell.entity_instance,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+    ) -> ElementMesh:
+        return ElementMesh(
+            element_id=element.id(),
+            global_id=str(getattr(element, "GlobalId", "")),
+            ifc_class=element.is_a(),
+            vertices=vertices,
+            faces=faces,
+        )
@@ -0,0 +1,282 @@
+"""Per-face wall thickness analysis.
+
+Thickness at a surface point is the distance to the opposite side of the solid
+along the inward normal. Every face is probed with stratified samples, so the
+result is deterministic and covers the whole mesh; rays are cast with Embree when
+it is installed and with the NumPy BVH otherwise.
+
+Example:
+    from pathlib import Path
+
+    analysis = ThicknessAnalyzer().analyze(mesh)
+    print(analysis.percentiles())
+    analysis.export_ply(mesh, Path("out/model.thickness.ply"), min_thickness=2.0)
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Sequence
+
+import numpy as np
+import trimesh
+from loguru import logger
+
+from bimto3dprint.utils.bvh import TriangleBVH
+
+THICKNESS_ENGINES = ("auto", "embree", "numpy")
+DEFAULT_PERCENTILES = (1.0, 5.0, 50.0)
+_THIN_COLOR = np.array([220, 30, 30], dtype=np.float64)
+_LIMIT_COLOR = np.array([240, 220, 40], dtype=np.float64)
+_THICK_COLOR = np.array([40, 170, 70], dtype=np.float64)
+_UNMEASURED_COLOR = np.array([160, 160, 160], dtype=np.uint8)
+
+
+@dataclass
+class ThicknessAnalysis:
+    """Per-face thickness of a mesh.
+
+    Attributes:
+        face_thickness: Minimum thickness over the samples of each face; ``inf``
+            where no opposite side was found (open meshes or ``max_thickness``).
+        face_areas: Face areas used to weight percentiles.
+        engine: Ray engine used.
+        rays: Number of rays cast.
+        seconds: Analysis time.
+    """
+
+    face_thickness: np.ndarray
+    face_areas: np.ndarray
+    engine: str
+    rays: int
+    seconds: float
+
+    @property
+    def minimum(self) -> float | None:
+        """Smallest measured thickness, if any face was measured."""
+        finite = self.face_thickness[np.isfinite(self.face_thickness)]
+        return float(finite.min()) if finite.size else None
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> dict[str, float | None]:
+        """Area-weighted thickness percentiles over measured faces.
+
+        Args:
+            q: Percentiles in the range 0-100.
+
+        Returns:
+            Mapping such as ``{"p1": 1.8, "p5": 2.4, "p50": 20.0}``.
+        """
+        measured = np.isfinite(self.face_thickness)
+        values = self.face_thickness[measured]
+        if values.size == 0:
+            return {f"p{value:g}": None for value in q}
+        order = np.argsort(values)
+        values = values[order]
+        weights = np.cumsum(self.face_areas[measured][order])
+        if weights[-1] <= 0:
+            weights = np.arange(1, len(values) + 1, dtype=np.float64)
+        ranks = np.searchsorted(weights / weights[-1], np.asarray(q, dtype=np.float64) / 100.0)
+        return {f"p{value:g}": float(values[min(rank, len(values) - 1)]) for value, rank in zip(q, ranks)}
+
+    def thin_faces(self, min_thickness: float) -> np.ndarray:
+        """Indices of faces thinner than ``min_thickness``."""
+        return np.flatnonzero(self.face_thickness < min_thickness)
+
+    def vertex_thickness(self, mesh: trimesh.Trimesh) -> np.ndarray:
+        """Thickness per vertex as the minimum over its faces."""
+        thickness = np.full(len(mesh.vertices), np.inf)
+        np.minimum.at(thickness, np.asarray(mesh.faces).reshape(-1), np.repeat(self.face_thickness, 3))
+        return thickness
+
+    def to_dict(self, min_thickness: float | None = None) -> dict[str, Any]:
+        """Summarize the analysis for reports.
+
+        Args:
+            min_thickness: Optional threshold for counting thin faces and their area.
+        """
+        summary: dict[str, Any] = {
+            "engine": self.engine,
+            "rays": self.rays,
+            "seconds": round(self.seconds, 3),
+            "faces": len(self.face_thickness),
+            "measured_faces": int(np.count_nonzero(np.isfinite(self.face_thickness))),
+            "min": self.minimum,
+            "percentiles": self.percentiles(),
+        }
+        if min_thickness is not None:
+            thin = self.thin_faces(min_thickness)
+            summary["thin_faces"] = len(thin)
+            summary["thin_area"] = float(self.face_areas[thin].sum())
+        return summary
+
+    def save(self, path: Path) -> None:
+        """Write the per-face thickness array as ``.npy``.
+
+        Args:
+            path: Output path.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as file:
+            np.save(file, self.face_thickness)
+        logger.info("Saved face thickness array: {}", path)
+
+    def export_ply(self, mesh: trimesh.Trimesh, path: Path, min_thickness: float) -> None:
+        """Write the mesh as PLY with faces colored by thickness.
+
+        Faces are red below ``min_thickness``, yellow at it and green from twice
+        the minimum; unmeasured faces are grey.
+
+        Args:
+            mesh: Analyzed mesh.
+            path: Output PLY path.
+            min_thickness: Minimum printable thickness.
+        """
+        if min_thickness <= 0:
+            raise ValueError("min_thickness must be positive.")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        heatmap = trimesh.Trimesh(
+            vertices=mesh.vertices,
+            faces=mesh.faces,
+            face_colors=thickness_colors(self.face_thickness, min_thickness),
+            process=False,
+        )
+        heatmap.export(str(path), file_type="ply")
+        logger.info("Saved thickness heatmap: {}", path)
+
+
+@dataclass
+class ThicknessAnalyzer:
+    """Measure wall thickness over the whole mesh.
+
+    Attributes:
+        engine: ``"embree"``, ``"numpy"`` or ``"auto"`` (Embree when installed).
+        samples_per_face: Stratified samples per face; a power of four (1, 4, 16, ...).
+        max_thickness: Ignore opposite sides farther than this; faces beyond it
+            are reported as ``inf``. Shorter limits speed up the NumPy engine.
+        outward: Cast along the outward normal instead, measuring the width of
+            the gap in front of each face rather than the wall behind it.
+    """
+
+    engine: str = "auto"
+    samples_per_face: int = 1
+    max_thickness: float | None = None
+    outward: bool = False
+
+    def __post_init__(self) -> None:
+        if self.engine not in THICKNESS_ENGINES:
+            raise ValueError(f"engine must be one of: {', '.join(THICKNESS_ENGINES)}")
+        levels = np.log(self.samples_per_face) / np.log(4) if self.samples_per_face > 0 else -1
+        if levels < 0 or not float(levels).is_integer():
+            raise ValueError("samples_per_face must be a power of four.")
+        if self.max_thickness is not None and self.max_thickness <= 0:
+            raise ValueError("max_thickness must be positive.")
+
+    def analyze(self, mesh: trimesh.Trimesh) -> ThicknessAnalysis:
+        """Cast one ray per sample and keep the minimum distance per face.
+
+        Args:
+            mesh: Mesh with outward-facing normals.
+
+        Returns:
+            Per-face thickness analysis.
+        """
+        if mesh.is_empty:
+            raise ValueError("Input mesh is empty.")
+
+        started = time.perf_counter()
+        weights = stratified_barycentric(self.samples_per_face)
+        triangles = np.asarray(mesh.triangles, dtype=np.float64)
+        normals = np.asarray(mesh.face_normals, dtype=np.float64)
+        measurable = np.flatnonzero(np.linalg.norm(normals, axis=1) > 0.5)
+
+        face_index = np.repeat(measurable, len(weights))
+        points = np.matmul(weights, triangles[measurable]).reshape(-1, 3)
+        directions = normals[face_index] if self.outward else -normals[face_index]
+        epsilon = float(max(np.max(mesh.extents) * 1e-6, 1e-9))
+        origins = points + directions * epsilon
+
+        engine = self._resolve_engine()
+        limit = np.inf if self.max_thickness is None else float(self.max_thickness)
+        if engine == "embree":
+            distances = _cast_embree(mesh, origins, directions, limit)
+        else:
+            distances, _ = TriangleBVH.build(triangles).intersect(origins, directions, max_distance=limit)
+        distances[distances <= epsilon] = np.inf
+
+        face_thickness = np.full(len(mesh.faces), np.inf)
+        np.minimum.at(face_thickness, face_index, distances + epsilon)
+        analysis = ThicknessAnalysis(
+            face_thickness=face_thickness,
+            face_areas=np.asarray(mesh.area_faces, dtype=np.float64),
+            engine=engine,
+            rays=len(origins),
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Thickness analysis: {} faces, {} rays via {} in {:.2f}s, min={}, percentiles={}",
+            len(mesh.faces),
+            analysis.rays,
+            engine,
+            analysis.seconds,
+            analysis.minimum,
+            analysis.percentiles(),
+        )
+        return analysis
+
+    def _resolve_engine(self) -> str:
+        if self.engine == "auto":
+            return "embree" if trimesh.ray.has_embree else "numpy"
+        if self.engine == "embree" and not trimesh.ray.has_embree:
+            raise RuntimeError("Embree is not installed; use engine='numpy' or install embreex.")
+        return self.engine
+
+
+def stratified_barycentric(samples: int) -> np.ndarray:
+    """Barycentric centroids of a regular subdivision of the triangle.
+
+    Args:
+        samples: Number of samples; a power of four.
+
+    Returns:
+        Weights of shape (samples, 3), one stratum per sub-triangle.
+    """
+    divisions = int(round(np.sqrt(samples)))
+    rows, columns = np.meshgrid(np.arange(divisions), np.arange(divisions), indexing="ij")
+    upward = rows + columns <= divisions - 1
+    downward = rows + columns <= divisions - 2
+    first = np.concatenate([rows[upward] + 1.0 / 3.0, rows[downward] + 2.0 / 3.0]) / divisions
+    second = np.concatenate([columns[upward] + 1.0 / 3.0, columns[downward] + 2.0 / 3.0]) / divisions
+    return np.column_stack([1.0 - first - second, first, second])
+
+
+def thickness_colors(face_thickness: np.ndarray, min_thickness: float) -> np.ndarray:
+    """RGBA face colors ramping red → yellow → green from 0 to twice the minimum."""
+    ratio = np.clip(np.asarray(face_thickness, dtype=np.float64) / min_thickness, 0.0, 2.0)
+    lower = np.clip(ratio, 0.0, 1.0)[:, None]
+    upper = np.clip(ratio - 1.0, 0.0, 1.0)[:, None]
+    rgb = np.where(
+        ratio[:, None] <= 1.0,
+        _THIN_COLOR + (_LIMIT_COLOR - _THIN_COLOR) * lower,
+        _LIMIT_COLOR + (_THICK_COLOR - _LIMIT_COLOR) * upper,
+    ).astype(np.uint8)
+    rgb[~np.isfinite(face_thickness)] = _UNMEASURED_COLOR
+    return np.column_stack([rgb, np.full(len(rgb), 255, dtype=np.uint8)])
+
+
+def _cast_embree(mesh: trimesh.Trimesh, origins: np.ndarray, directions: np.ndarray, limit: float) -> np.ndarray:
+    from trimesh.ray.ray_pyembree import RayMeshIntersector
+
+    # The mesh caches its intersector, so repeated passes and containment queries share one Embree scene.
+    intersector = mesh.ray if isinstance(mesh.ray, RayMeshIntersector) else RayMeshIntersector(mesh)
+    locations, ray_index, _ = intersector.intersects_location(
+        origins,
+        directions,
+        multiple_hits=False,
+    )
+    distances = np.full(len(origins), np.inf)
+    distances[ray_index] = np.linalg.norm(locations - origins[ray_index], axis=1)
+    distances[distances > limit] = np.inf
+    return distances
@@ -0,0 +1,633 @@
+"""Sparse block-chunked voxel engine for envelope extraction.
+
+Only blocks that contain surface voxels are allocated, so memory scales with the
+building surface instead of its bounding volume. The exterior is found with a
+flood fill that streams from block to block, and the envelope is meshed with
+marching cubes per block; block seams are welded exactly.
+
+Everything the exterior fill does not reach is solid. Courtyards open to the sky
+stay open unless ``fill_courtyards`` is set, and enclosed voids such as atria can
+be kept hollow with ``min_void_volume``. ``thicken`` grows parts thinner than a
+minimum wall thickness, using distance transforms evaluated per block.
+
+Example:
+    grid = SparseVoxelGrid(pitch=0.2)
+    for chunk in chunks:
+        grid.add_mesh(chunk)
+    envelope = grid.envelope(min_void_volume=500.0)
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import trimesh
+from loguru import logger
+from scipy import ndimage, sparse
+from scipy.sparse.csgraph import connected_components
+
+DEFAULT_BLOCK_SIZE = 32
+DEFAULT_SAMPLE_BUDGET = 2_000_000
+SAMPLE_SPACING = 0.5
+"""Maximum distance between surface samples in voxels, as in trimesh's subdivide voxelizer."""
+
+_PACK_BITS = 21
+_PACK_OFFSET = 1 << (_PACK_BITS - 1)
+_PACK_MASK = (1 << _PACK_BITS) - 1
+
+BlockKey = Tuple[int, int, int]
+_FACE_DIRECTIONS: tuple[tuple[int, int], ...] = tuple((axis, side) for axis in range(3) for side in (-1, 1))
+_PLANAR_DIRECTIONS = tuple((axis, side) for axis, side in _FACE_DIRECTIONS if axis < 2)
+_NEIGHBOR_OFFSETS = np.array(list(np.ndindex(3, 3, 3)), dtype=np.int64) - 1
+_NEGATIVE_OFFSETS = np.array(
+    [(dx, dy, dz) for dx in (0, -1) for dy in (0, -1) for dz in (0, -1)],
+    dtype=np.int64,
+)
+
+
+@dataclass
+class SparseVoxelGrid:
+    """Surface voxels on a global lattice, stored as dense blocks of ``block_size``³.
+
+    Voxel indices are ``round(point / pitch)`` on one global lattice (as in
+    ``Trimesh.voxelized``), so voxelizing a mesh in chunks yields the same occupancy
+    as voxelizing it at once.
+    """
+
+    pitch: float
+    block_size: int = DEFAULT_BLOCK_SIZE
+    _blocks: Dict[BlockKey, np.ndarray] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pitch <= 0:
+            raise ValueError("pitch must be positive.")
+        if self.block_size < 2:
+            raise ValueError("block_size must be at least 2.")
+
+    @property
+    def block_count(self) -> int:
+        """Number of allocated blocks."""
+        return len(self._blocks)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by allocated blocks in bytes."""
+        return sum(block.nbytes for block in self._blocks.values())
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Sorted unique surface voxel indices of shape (N, 3)."""
+        if not self._blocks:
+            return np.empty((0, 3), dtype=np.int64)
+        parts = [np.argwhere(block) + np.multiply(key, self.block_size) for key, block in self._blocks.items()]
+        return np.unique(np.concatenate(parts).astype(np.int64), axis=0)
+
+    def add_mesh(self, mesh: trimesh.Trimesh) -> None:
+        """Voxelize a mesh chunk and merge its surface voxels.
+
+        Args:
+            mesh: Mesh chunk in world coordinates.
+        """
+        if mesh.is_empty:
+            return
+        for indices in iter_surface_voxels(mesh.vertices, mesh.faces, self.pitch):
+            self.add_indices(indices)
+
+    def add_indices(self, indices: np.ndarray) -> None:
+        """Mark voxels as surface.
+
+        Args:
+            indices: Global voxel indices of shape (N, 3).
+        """
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+        if len(indices) == 0:
+            return
+        size = self.block_size
+        block_keys = np.floor_divide(indices, size)
+        local = indices - block_keys * size
+        packed = _pack(block_keys)
+        order = np.argsort(packed, kind="stable")
+        packed = packed[order]
+        starts = np.flatnonzero(np.r_[True, packed[1:] != packed[:-1]])
+        keys = _unpack(packed[starts])
+        for key, group in zip(keys, np.split(local[order], starts[1:])):
+            block_key = (int(key[0]), int(key[1]), int(key[2]))
+            block = self._blocks.get(block_key)
+            if block is None:
+                block = np.zeros((size, size, size), dtype=bool)
+                self._blocks[block_key] = block
+            block[group[:, 0], group[:, 1], group[:, 2]] = True
+
+    def envelope(self, fill_courtyards: bool = False, min_void_volume: float | None = None) -> trimesh.Trimesh:
+        """Mesh the solid bounded by the surface voxels.
+
+        Voxels not reachable from outside through empty voxels (6-connected) are
+        solid, which closes interior rooms while keeping open courtyards open.
+
+        Args:
+            fill_courtyards: Flood the exterior within each horizontal voxel layer
+                only, so spaces enclosed in plan are solid even when open to the sky.
+            min_void_volume: Keep enclosed voids at least this large (in model
+                units cubed) hollow, e.g. atria; smaller voids are filled.
+
+        Returns:
+            Watertight envelope mesh in world coordinates.
+
+        Raises:
+            ValueError: If no voxels were added or the options conflict.
+        """
+        if not self._blocks:
+            raise ValueError("Voxel grid is empty.")
+        if min_void_volume is not None and min_void_volume <= 0:
+            raise ValueError("min_void_volume must be positive.")
+        if fill_courtyards and min_void_volume is not None:
+            raise ValueError("fill_courtyards and min_void_volume cannot be combined.")
+        logger.info(
+            "Sparse voxel grid: pitch={:.3f}, blocks={}, block_size={}, memory={:.1f} MB",
+            self.pitch,
+            self.block_count,
+            self.block_size,
+            self.nbytes / 1024 / 1024,
+        )
+        min_void_voxels = None
+        if min_void_volume is not None:
+            min_void_voxels = max(int(np.ceil(min_void_volume / self.pitch**3)), 1)
+        solid = _SolidBlocks.from_surface(
+            self._blocks,
+            self.block_size,
+            planar=fill_courtyards,
+            min_void_voxels=min_void_voxels,
+        )
+        return solid.marching_cubes(self.pitch)
+
+    def thicken(self, min_thickness: float) -> trimesh.Trimesh | None:
+        """Mesh the solid with every part thinner than ``min_thickness`` grown to it.
+
+        A solid voxel is thin when no ball of diameter ``min_thickness`` inside the
+        solid covers it (a morphological opening computed with Euclidean distance
+        transforms). The medial ridge of thin parts is dilated by half the minimum
+        thickness, so thick parts are left untouched. Distances are evaluated per
+        surface block on a halo window, keeping the cost proportional to the surface.
+
+        Args:
+            min_thickness: Minimum wall thickness in model units.
+
+        Returns:
+            Thickened watertight envelope in world coordinates, or ``None`` when no
+            part is thinner than ``min_thickness``.
+
+        Raises:
+            ValueError: If the grid is empty or the thickness does not fit a block.
+        """
+        if min_thickness <= 0:
+            raise ValueError("min_thickness must be positive.")
+        if not self._blocks:
+            raise ValueError("Voxel grid is empty.")
+        radius = min_thickness / 2.0 / self.pitch
+        if 2 * int(np.ceil(radius)) + 2 > self.block_size:
+            raise ValueError("min_thickness exceeds the block size; increase the voxel pitch or block size.")
+
+        solid = _SolidBlocks.from_surface(self._blocks, self.block_size)
+        added = solid.thicken(radius)
+        logger.info("Distance-field thickening: radius={:.2f} voxels, {} voxels added", radius, added)
+        if added == 0:
+            return None
+        return solid.marching_cubes(self.pitch)
+
+
+def iter_surface_voxels(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    pitch: float,
+    sample_budget: int = DEFAULT_SAMPLE_BUDGET,
+) -> Iterator[np.ndarray]:
+    """Yield voxel indices touched by triangles, in batches of bounded size.
+
+    Each triangle is sampled on a barycentric grid no coarser than ``SAMPLE_SPACING``
+    voxels and samples are snapped with ``round(point / pitch)``. Unlike
+    ``Trimesh.voxelized`` no subdivided copy of the mesh is built, so peak memory
+    is bounded by ``sample_budget`` points regardless of triangle size.
+
+    Args:
+        vertices: Vertex array of shape (N, 3).
+        faces: Face index array of shape (M, 3).
+        pitch: Voxel edge length.
+        sample_budget: Maximum number of sample points per batch.
+
+    Yields:
+        Unique voxel indices of shape (K, 3) per batch.
+    """
+    triangles = np.asarray(vertices, dtype=np.float64)[np.asarray(faces)] / pitch
+    if len(triangles) == 0:
+        return
+    edges = np.linalg.norm(triangles - np.roll(triangles, 1, axis=1), axis=2).max(axis=1)
+    steps = np.maximum(np.ceil(edges / SAMPLE_SPACING), 1).astype(np.int64)
+    for step in np.unique(steps):
+        members = np.flatnonzero(steps == step)
+        rows, columns = np.triu_indices(int(step) + 1)
+        first, second = rows / step, (columns - rows) / step
+        weights = np.column_stack([1.0 - first - second, first, second])
+        for start in range(0, len(weights), sample_budget):
+            chunk = weights[start : start + sample_budget]
+            batch = max(sample_budget // len(chunk), 1)
+            for offset in range(0, len(members), batch):
+                points = np.matmul(chunk, triangles[members[offset : offset + batch]])
+                snapped = np.round(points.reshape(-1, 3)).astype(np.int64)
+                yield _unpack(np.unique(_pack(snapped)))
+
+
+@dataclass
+class _SolidBlocks:
+    """Solid occupancy: explicit arrays for surface blocks, flags for empty blocks.
+
+    Empty-block components carry one flag per z layer of a block, since a planar
+    fill can reach some horizontal layers of an empty block but not others.
+    """
+
+    block_size: int
+    blocks: Dict[BlockKey, np.ndarray]
+    origin: np.ndarray
+    labels: np.ndarray
+    interior_labels: np.ndarray
+
+    @classmethod
+    def from_surface(
+        cls,
+        surface: Dict[BlockKey, np.ndarray],
+        block_size: int,
+        planar: bool = False,
+        min_void_voxels: int | None = None,
+    ) -> "_SolidBlocks":
+        # Planar fills connect voxels within horizontal layers only.
+        structure = ndimage.generate_binary_structure(3, 1)
+        directions = _FACE_DIRECTIONS
+        if planar:
+            structure[:, :, (0, 2)] = False
+            directions = _PLANAR_DIRECTIONS
+
+        keys = np.array(list(surface), dtype=np.int64)
+        origin = keys.min(axis=0) - 1
+        shape = keys.max(axis=0) + 2 - origin
+        allocated = np.zeros(shape, dtype=bool)
+        allocated[tuple((keys - origin).T)] = True
+
+        # Empty blocks form components; a component is exterior when it touches the
+        # padded border or when the flood fill reaches it through a surface block.
+        labels, count = ndimage.label(~allocated, structure)
+        exterior = np.zeros((count + 1, block_size), dtype=bool)
+        border = np.concatenate(
+            [labels[0].ravel(), labels[-1].ravel(), labels[:, 0].ravel(), labels[:, -1].ravel()]
+            + [labels[:, :, 0].ravel(), labels[:, :, -1].ravel()]
+        )
+        exterior[np.unique(border)] = True
+        exterior[0] = False
+
+        # Surface blocks adjacent to each empty-block component, found once for all
+        # components; the grid is padded, so every neighbor of a surface block exists.
+        positions = np.argwhere(allocated)
+        steps = np.argwhere(structure) - 1
+        around = labels[tuple((positions[:, None, :] + steps[None, :, :]).reshape(-1, 3).T)]
+        pairs = np.unique(
+            np.column_stack([around, np.repeat(np.arange(len(positions)), len(steps))])[around > 0], axis=0
+        )
+        splits = np.flatnonzero(np.diff(pairs[:, 0])) + 1
+        touching: Dict[int, list[BlockKey]] = {
+            int(group[0, 0]): list(_as_keys(positions[group[:, 1]] + origin)) for group in np.split(pairs, splits)
+        }
+
+        outside = {key: np.zeros_like(block) for key, block in surface.items()}
+        queue = deque(surface)
+        queued = set(surface)
+
+        def activate(label: int, layers: np.ndarray) -> None:
+            exterior[label] |= layers
+            for key in touching.get(label, ()):
+                if key not in queued:
+                    queue.append(key)
+                    queued.add(key)
+
+        while queue:
+            key = queue.popleft()
+            queued.discard(key)
+            free = ~surface[key]
+            seed = outside[key].copy()
+            for axis, side in directions:
+                neighbor = _offset(key, axis, side)
+                layer = _face(axis, side)
+                if neighbor in outside:
+                    incoming = outside[neighbor][_face(axis, -side)]
+                else:
+                    label = _label_at(labels, origin, neighbor)
+                    if label == -1:
+                        incoming = True
+                    elif axis == 2:
+                        incoming = exterior[label][-1 if side < 0 else 0]
+                    else:
+                        incoming = exterior[label]
+                seed[layer] |= incoming & free[layer]
+            if not seed.any():
+                continue
+
+            free_labels, _ = ndimage.label(free, structure)
+            reached = np.unique(free_labels[seed])
+            updated = np.isin(free_labels, reached[reached > 0])
+            previous = outside[key]
+            if np.array_equal(updated, previous):
+                continue
+            outside[key] = updated
+
+            for axis, side in directions:
+                layer = _face(axis, side)
+                if np.array_equal(updated[layer], previous[layer]):
+                    continue
+                neighbor = _offset(key, axis, side)
+                if neighbor in outside:
+                    if neighbor not in queued:
+                        queue.append(neighbor)
+                        queued.add(neighbor)
+                    continue
+                label = _label_at(labels, origin, neighbor)
+                if label <= 0:
+                    continue
+                layers = updated[layer].any(axis=0) if planar else np.ones(block_size, dtype=bool)
+                if np.any(layers & ~exterior[label]):
+                    activate(label, layers)
+
+        if min_void_voxels is not None:
+            _open_voids(surface, outside, labels, exterior, origin, block_size, min_void_voxels)
+
+        blocks = {key: surface[key] | ~outside[key] for key in surface}
+        interior = ~exterior
+        interior[0] = False
+        logger.info(
+            "Exterior flood fill: {} surface blocks, {} interior empty blocks",
+            len(blocks),
+            int(np.count_nonzero(interior.any(axis=1)[labels])),
+        )
+        return cls(block_size, blocks, origin, labels, interior)
+
+    def block(self, key: BlockKey) -> np.ndarray | bool:
+        """Solid occupancy of a block; a bool for uniform empty blocks."""
+        array = self.blocks.get(key)
+        if array is not None:
+            return array
+        label = _label_at(self.labels, self.origin, key)
+        if label == -1:
+            return False
+        layers = self.interior_labels[label]
+        if layers.all() or not layers.any():
+            return bool(layers[0])
+        return np.broadcast_to(layers, (self.block_size,) * 3)
+
+    def region(self, key: BlockKey, halo: int) -> np.ndarray:
+        """Solid samples of a block padded by ``halo`` voxels from all neighbors."""
+        return _gather(self.block, key, self.block_size, halo)
+
+    def thicken(self, radius: float) -> int:
+        """Grow parts thinner than ``2 * radius`` voxels in place.
+
+        Returns:
+            Number of voxels added.
+        """
+        size = self.block_size
+        reach = int(np.ceil(radius))
+        core = (slice(reach, reach + size),) * 3
+        # Thin parts are narrower than a block, so their ridges lie in surface blocks.
+        ridges: Dict[BlockKey, np.ndarray] = {}
+        detect = (slice(2 * reach + 2, 2 * reach + 2 + size),) * 3
+        for key in list(self.blocks):
+            ridge = _thin_ridge(self.region(key, 2 * reach + 2), radius)[detect]
+            if ridge.any():
+                ridges[key] = ridge
+        if not ridges:
+            return 0
+
+        keys = np.array(list(ridges), dtype=np.int64)
+        touched = np.unique((keys[:, None, :] + _NEIGHBOR_OFFSETS[None, :, :]).reshape(-1, 3), axis=0)
+        grown: Dict[BlockKey, np.ndarray] = {}
+        added = 0
+        for key in _as_keys(touched):
+            seeds = _gather(lambda neighbor: ridges.get(neighbor, False), key, size, reach)
+            if not seeds.any():
+                continue
+            balls = ndimage.distance_transform_edt(~seeds)[core] <= radius
+            current = np.broadcast_to(self.block(key), (size,) * 3)
+            block = balls | current
+            count = int(np.count_nonzero(block & ~current))
+            if count:
+                grown[key] = block
+                added += count
+        self.blocks.update(grown)
+        return added
+
+    def window(self, key: BlockKey) -> np.ndarray:
+        """Solid samples of a block plus one layer from its +x/+y/+z neighbors."""
+        size = self.block_size
+        window = np.empty((size + 1,) * 3, dtype=bool)
+        for offset in np.ndindex(2, 2, 2):
+            neighbor = (key[0] + offset[0], key[1] + offset[1], key[2] + offset[2])
+            target = tuple(slice(size, size + 1) if step else slice(0, size) for step in offset)
+            source = tuple(slice(0, 1) if step else slice(None) for step in offset)
+            values = self.block(neighbor)
+            window[target] = values[source] if isinstance(values, np.ndarray) else values
+        return window
+
+    def marching_cubes(self, pitch: float) -> trimesh.Trimesh:
+        """Mesh the solid surface block by block and weld vertices shared across blocks.
+
+        Args:
+            pitch: Voxel edge length in model units.
+
+        Raises:
+            ValueError: If the solid has no surface.
+        """
+        from skimage import measure
+
+        # A block owns the cells whose lower corner lies inside it; blocks preceding a
+        # surface block along any axis own the cells on its lower faces. Planar fills
+        # also leave surfaces inside empty blocks and between vertically stacked ones.
+        layers = self.interior_labels[self.labels]
+        boundary = layers.any(axis=-1) & ~layers.all(axis=-1)
+        seams = layers[:, :, 1:, 0] != layers[:, :, :-1, -1]
+        boundary[:, :, 1:] |= seams
+        boundary[:, :, :-1] |= seams
+        keys = np.concatenate(
+            [np.array(list(self.blocks), dtype=np.int64), np.argwhere(boundary) + self.origin]
+        )
+        candidates = np.unique((keys[:, None, :] + _NEGATIVE_OFFSETS[None, :, :]).reshape(-1, 3), axis=0)
+
+        vertex_parts: list[np.ndarray] = []
+        face_parts: list[np.ndarray] = []
+        vertex_count = 0
+        for key in _as_keys(candidates):
+            window = self.window(key)
+            if window.all() or not window.any():
+                continue
+            vertices, faces, _, _ = measure.marching_cubes((~window).astype(np.float32), level=0.5)
+            vertex_parts.append(vertices + np.multiply(key, self.block_size))
+            face_parts.append(faces + vertex_count)
+            vertex_count += len(vertices)
+
+        if not face_parts:
+            raise ValueError("Voxel envelope is empty.")
+
+        # Level 0.5 on a binary field puts every vertex on a half-voxel lattice, so
+        # vertices shared by neighbouring blocks are bitwise identical after rounding.
+        lattice = np.round(np.concatenate(vertex_parts) * 2.0).astype(np.int64)
+        unique, inverse = np.unique(lattice, axis=0, return_inverse=True)
+        faces = inverse.reshape(-1)[np.concatenate(face_parts)]
+        faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+        envelope = trimesh.Trimesh(vertices=unique * (pitch / 2.0), faces=faces, process=False)
+        envelope.remove_unreferenced_vertices()
+        return envelope
+
+
+def _open_voids(
+    surface: Dict[BlockKey, np.ndarray],
+    outside: Dict[BlockKey, np.ndarray],
+    labels: np.ndarray,
+    exterior: np.ndarray,
+    origin: np.ndarray,
+    block_size: int,
+    min_voxels: int,
+) -> None:
+    """Mark enclosed voids of at least ``min_voxels`` voxels as outside, in place.
+
+    Voids span blocks, so free voxels not reached by the exterior fill are labelled
+    per surface block, joined across block faces and with interior empty-block
+    components, and measured as graph components.
+    """
+    cavities: Dict[BlockKey, np.ndarray] = {}
+    sizes: list[np.ndarray] = []
+    node_count = 0
+    for key, block in surface.items():
+        local, count = ndimage.label(~block & ~outside[key])
+        if count == 0:
+            continue
+        cavities[key] = np.where(local > 0, local + node_count - 1, -1)
+        sizes.append(np.bincount(local.ravel(), minlength=count + 1)[1:])
+        node_count += count
+
+    interior = np.flatnonzero(~exterior.any(axis=1))
+    interior = interior[interior > 0]
+    empty_nodes = np.full(len(exterior), -1, dtype=np.int64)
+    empty_nodes[interior] = np.arange(node_count, node_count + len(interior))
+    sizes.append(np.bincount(labels.ravel(), minlength=len(exterior))[interior] * block_size**3)
+    node_count += len(interior)
+    if node_count == 0:
+        return
+
+    edges: list[np.ndarray] = []
+    for key, nodes in cavities.items():
+        for axis, side in _FACE_DIRECTIONS:
+            layer = nodes[_face(axis, side)]
+            neighbor = _offset(key, axis, side)
+            if neighbor in surface:
+                other = cavities.get(neighbor)
+                if side < 0 or other is None:
+                    continue
+                facing = other[_face(axis, -side)]
+                joined = (layer >= 0) & (facing >= 0)
+                edges.append(np.column_stack([layer[joined], facing[joined]]))
+                continue
+            label = _label_at(labels, origin, neighbor)
+            if label > 0 and empty_nodes[label] >= 0:
+                touching = np.unique(layer[layer >= 0])
+                edges.append(np.column_stack([touching, np.full_like(touching, empty_nodes[label])]))
+
+    pairs = np.concatenate(edges) if edges else np.empty((0, 2), dtype=np.int64)
+    graph = sparse.coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(node_count, node_count),
+    )
+    _, components = connected_components(graph, directed=False)
+    volumes = np.bincount(components, weights=np.concatenate(sizes))
+    kept = volumes >= min_voxels
+    if not kept.any():
+        return
+
+    for key, nodes in cavities.items():
+        outside[key] |= (nodes >= 0) & kept[components[np.maximum(nodes, 0)]]
+    exterior[interior[kept[components[empty_nodes[interior]]]]] = True
+    logger.info(
+        "Kept {} enclosed voids hollow ({} voxels)",
+        int(np.count_nonzero(kept)),
+        int(volumes[kept].sum()),
+    )
+
+
+def _thin_ridge(solid: np.ndarray, radius: float) -> np.ndarray:
+    """Medial ridge voxels of the parts of ``solid`` thinner than ``2 * radius``."""
+    if solid.all() or not solid.any():
+        return np.zeros_like(solid)
+    depth = ndimage.distance_transform_edt(solid)
+    ridge = solid & (depth <= radius) & (depth >= ndimage.maximum_filter(depth, size=3))
+    if not ridge.any():
+        return ridge
+    # Ridge voxels covered by the opening belong to thick parts.
+    eroded = depth > radius
+    if eroded.any():
+        ridge &= ndimage.distance_transform_edt(~eroded) > radius
+    return ridge
+
+
+def _gather(
+    lookup: Callable[[BlockKey], np.ndarray | bool],
+    key: BlockKey,
+    size: int,
+    halo: int,
+) -> np.ndarray:
+    region = np.empty((size + 2 * halo,) * 3, dtype=bool)
+    # (target, source) slices for the lower neighbor, the block itself and the upper neighbor.
+    spans = (
+        (slice(0, halo), slice(size - halo, size)),
+        (slice(halo, halo + size), slice(None)),
+        (slice(halo + size, None), slice(0, halo)),
+    )
+    for offset in np.ndindex(3, 3, 3):
+        neighbor = (key[0] + offset[0] - 1, key[1] + offset[1] - 1, key[2] + offset[2] - 1)
+        target = tuple(spans[step][0] for step in offset)
+        values = lookup(neighbor)
+        if isinstance(values, np.ndarray):
+            region[target] = values[tuple(spans[step][1] for step in offset)]
+        else:
+            region[target] = values
+    return region
+
+
+def _label_at(labels: np.ndarray, origin: np.ndarray, key: BlockKey) -> int:
+    position = np.subtract(key, origin)
+    if np.any(position < 0) or np.any(position >= labels.shape):
+        return -1
+    return int(labels[tuple(position)])
+
+
+def _pack(indices: np.ndarray) -> np.ndarray:
+    shifted = indices + _PACK_OFFSET
+    if shifted.size and (shifted.min() < 0 or shifted.max() > _PACK_MASK):
+        raise ValueError("Voxel index out of range; increase the voxel pitch.")
+    return (shifted[:, 0] << (2 * _PACK_BITS)) | (shifted[:, 1] << _PACK_BITS) | shifted[:, 2]
+
+
+def _unpack(packed: np.ndarray) -> np.ndarray:
+    columns = [(packed >> (2 * _PACK_BITS)) & _PACK_MASK, (packed >> _PACK_BITS) & _PACK_MASK, packed & _PACK_MASK]
+    return np.column_stack(columns) - _PACK_OFFSET
+
+
+def _as_keys(array: np.ndarray) -> Iterable[BlockKey]:
+    for row in array:
+        yield int(row[0]), int(row[1]), int(row[2])
+
+
+def _offset(key: BlockKey, axis: int, side: int) -> BlockKey:
+    shifted = list(key)
+    shifted[axis] += side
+    return shifted[0], shifted[1], shifted[2]
+
+
+def _face(axis: int, side: int) -> tuple[slice | int, ...]:
+    index: list[slice | int] = [slice(None)] * 3
+    index[axis] = 0 if side < 0 else -1
+    return tuple(index)
@@ -0,0 +1,387 @@
+"""Bounding volume hierarchy ray caster written with vectorized NumPy.
+
+Used when Embree is not installed: the hierarchy is built level by level,
+splitting nodes at the midpoint of their centroid bounds (the median when that
+leaves one side empty), and rays are traversed in batches as (ray, node) pair
+arrays, so no Python loop runs per ray or per triangle. Closest-point queries
+traverse the same hierarchy, pruning boxes farther than the closest triangle
+found so far.
+
+Example:
+    bvh = TriangleBVH.build(mesh.triangles)
+    distances, faces = bvh.intersect(origins, directions, max_distance=50.0)
+    distances, faces = bvh.closest(points)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import trimesh
+
+DEFAULT_LEAF_SIZE = 8
+DEFAULT_RAY_BATCH = 32_768
+
+
+@dataclass
+class TriangleBVH:
+    """Binary hierarchy of axis-aligned boxes over triangles.
+
+    Attributes:
+        triangles: Triangle corners of shape (N, 3, 3), ordered by leaf.
+        faces: Original face index of each ordered triangle.
+        lower: Node box minima of shape (M, 3).
+        upper: Node box maxima of shape (M, 3).
+        children: Child node indices of shape (M, 2); ``-1`` for leaves.
+        start: First ordered triangle of each node.
+        count: Number of triangles in each node.
+        depth: Number of levels below the root.
+    """
+
+    triangles: np.ndarray
+    faces: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    children: np.ndarray
+    start: np.ndarray
+    count: np.ndarray
+    depth: int
+
+    @classmethod
+    def build(cls, triangles: np.ndarray, leaf_size: int = DEFAULT_LEAF_SIZE) -> "TriangleBVH":
+        """Build the hierarchy by splitting every node at the midpoint of its centroid bounds.
+
+        Nodes split along the longest axis of their centroid bounds; when all
+        centroids fall on one side of the midpoint, the node splits at the median.
+
+        Args:
+            triangles: Triangle corners of shape (N, 3, 3).
+            leaf_size: Maximum number of triangles per leaf.
+
+        Returns:
+            Built hierarchy.
+
+        Raises:
+            ValueError: If there are no triangles or the leaf size is not positive.
+        """
+        triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        if len(triangles) == 0:
+            raise ValueError("Cannot build a BVH without triangles.")
+        if leaf_size <= 0:
+            raise ValueError("leaf_size must be positive.")
+
+        centroids = triangles.mean(axis=1)
+        order = np.arange(len(triangles))
+        # Nodes are created level by level, so every level is a contiguous id range.
+        levels = [(np.array([0]), np.array([len(triangles)]), np.full((1, 2), -1, dtype=np.int64))]
+        node_count = 1
+        while True:
+            level_start, level_count, level_children = levels[-1]
+            split = np.flatnonzero(level_count > leaf_size)
+            if len(split) == 0:
+                break
+            node_start, node_size = level_start[split], level_count[split]
+
+            # Sort each splitting range by its longest centroid axis; ranges are disjoint.
+            segment = np.repeat(np.arange(len(split)), node_size)
+            offsets = np.cumsum(node_size) - node_size
+            positions = np.repeat(node_start - offsets, node_size) + np.arange(len(segment))
+            points = centroids[order[positions]]
+            extent = np.maximum.reduceat(points, offsets) - np.minimum.reduceat(points, offsets)
+            axis = np.argmax(extent, axis=1)
+            values = points[np.arange(len(points)), axis[segment]]
+            permutation = np.lexsort((values, segment))
+            order[positions] = order[positions][permutation]
+
+            # Split at the spatial midpoint of the centroid bounds; fall back to the
+            # median when all centroids land on one side.
+            low = np.minimum.reduceat(points, offsets)[np.arange(len(split)), axis]
+            middle = low + extent[np.arange(len(split)), axis] / 2.0
+            half = np.add.reduceat((values < middle[segment]).astype(np.int64), offsets)
+            degenerate = (half == 0) | (half == node_size)
+            half = np.where(degenerate, node_size // 2, half)
+            child_ids = node_count + np.arange(2 * len(split))
+            level_children[split] = child_ids.reshape(2, -1).T
+            levels.append(
+                (
+                    np.concatenate([node_start, node_start + half]),
+                    np.concatenate([half, node_size - half]),
+                    np.full((len(child_ids), 2), -1, dtype=np.int64),
+                )
+            )
+            node_count += len(child_ids)
+
+        start = np.concatenate([level[0] for level in levels])
+        count = np.concatenate([level[1] for level in levels])
+        children = np.concatenate([level[2] for level in levels])
+        ordered = triangles[order]
+        lower, upper = _node_bounds(ordered, start, children, [len(level[0]) for level in levels])
+        return cls(ordered, order, lower, upper, children, start, count, len(levels) - 1)
+
+    def intersect(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float = np.inf,
+        batch_size: int = DEFAULT_RAY_BATCH,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find the closest triangle hit along each ray.
+
+        Args:
+            origins: Ray origins of shape (R, 3).
+            directions: Unit ray directions of shape (R, 3).
+            max_distance: Hits farther than this are ignored; short limits prune
+                most of the traversal.
+            batch_size: Number of rays traversed together.
+
+        Returns:
+            Hit distances (``inf`` for misses) and original face indices (``-1`` for misses).
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        distances = np.full(len(origins), np.inf)
+        faces = np.full(len(origins), -1, dtype=np.int64)
+        for offset in range(0, len(origins), batch_size):
+            window = slice(offset, offset + batch_size)
+            distances[window], faces[window] = self._intersect_batch(origins[window], directions[window], max_distance)
+        return distances, faces
+
+    def closest(self, points: np.ndarray, batch_size: int = DEFAULT_RAY_BATCH) -> tuple[np.ndarray, np.ndarray]:
+        """Find the closest triangle to each point.
+
+        Args:
+            points: Query points of shape (P, 3).
+            batch_size: Number of points traversed together.
+
+        Returns:
+            Distances to the surface and original face indices of the closest triangles.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        distances = np.full(len(points), np.inf)
+        faces = np.full(len(points), -1, dtype=np.int64)
+        for offset in range(0, len(points), batch_size):
+            window = slice(offset, offset + batch_size)
+            distances[window], faces[window] = self._closest_batch(points[window])
+        return distances, faces
+
+    def _closest_batch(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Same per-point stack traversal as _intersect_batch, ordered and pruned by
+        # the distance from the point to each node box.
+        count = len(points)
+        best = np.full(count, np.inf)
+        best_face = np.full(count, -1, dtype=np.int64)
+        depth = self.depth + 2
+        stack = np.zeros((count, depth), dtype=np.int64)
+        stack_distance = np.zeros((count, depth))
+        size = np.ones(count, dtype=np.int64)
+        active = np.arange(count)
+
+        while len(active):
+            size[active] -= 1
+            nodes = stack[active, size[active]]
+            live = stack_distance[active, size[active]] < best[active]
+            queries, nodes = active[live], nodes[live]
+
+            leaf = self.children[nodes, 0] < 0
+            if leaf.any():
+                self._closest_in_leaves(queries[leaf], nodes[leaf], points, best, best_face)
+
+            queries, nodes = queries[~leaf], nodes[~leaf]
+            if len(queries):
+                first, second = self.children[nodes, 0], self.children[nodes, 1]
+                first_distance = _box_distance(self.lower[first], self.upper[first], points[queries])
+                second_distance = _box_distance(self.lower[second], self.upper[second], points[queries])
+                swap = second_distance < first_distance
+                near = np.where(swap, second, first)
+                far = np.where(swap, first, second)
+                near_distance = np.where(swap, second_distance, first_distance)
+                far_distance = np.where(swap, first_distance, second_distance)
+                for node, node_distance in ((far, far_distance), (near, near_distance)):
+                    push = node_distance < best[queries]
+                    pushed = queries[push]
+                    stack[pushed, size[pushed]] = node[push]
+                    stack_distance[pushed, size[pushed]] = node_distance[push]
+                    size[pushed] += 1
+
+            active = active[size[active] > 0]
+
+        return best, best_face
+
+    def _closest_in_leaves(
+        self,
+        queries: np.ndarray,
+        nodes: np.ndarray,
+        points: np.ndarray,
+        best: np.ndarray,
+        best_face: np.ndarray,
+    ) -> None:
+        sizes = self.count[nodes]
+        pair_queries = np.repeat(queries, sizes)
+        within = np.arange(len(pair_queries)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        pair_triangles = np.repeat(self.start[nodes], sizes) + within
+        pair_points = points[pair_queries]
+        closest = trimesh.triangles.closest_point(self.triangles[pair_triangles], pair_points)
+        distances = np.linalg.norm(closest - pair_points, axis=1)
+        closer = distances < best[pair_queries]
+        if not closer.any():
+            return
+        pair_queries, pair_triangles, distances = pair_queries[closer], pair_triangles[closer], distances[closer]
+        np.minimum.at(best, pair_queries, distances)
+        winner = distances == best[pair_queries]
+        best_face[pair_queries[winner]] = self.faces[pair_triangles[winner]]
+
+    def _intersect_batch(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        max_distance: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Depth-first traversal, vectorized over rays: every ray keeps its own stack
+        # of (node, entry distance) and pops one node per step. The nearer child is
+        # pushed last so it is visited first, and nodes entered beyond the current
+        # closest hit are skipped.
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / directions
+        count = len(origins)
+        best = np.full(count, float(max_distance))
+        best_face = np.full(count, -1, dtype=np.int64)
+        depth = self.depth + 2
+        stack = np.zeros((count, depth), dtype=np.int64)
+        stack_entry = np.zeros((count, depth))
+        size = np.ones(count, dtype=np.int64)
+        entry, exit_ = _slab(self.lower[:1], self.upper[:1], origins, inverse)
+        active = np.flatnonzero((exit_ >= np.maximum(entry, 0.0)) & (entry <= best))
+        stack_entry[:, 0] = entry
+
+        while len(active):
+            size[active] -= 1
+            nodes = stack[active, size[active]]
+            live = stack_entry[active, size[active]] <= best[active]
+            rays, nodes = active[live], nodes[live]
+
+            leaf = self.children[nodes, 0] < 0
+            if leaf.any():
+                self._hit_leaves(rays[leaf], nodes[leaf], origins, directions, best, best_face)
+
+            rays, nodes = rays[~leaf], nodes[~leaf]
+            if len(rays):
+                first, second = self.children[nodes, 0], self.children[nodes, 1]
+                first_entry, first_exit = _slab(self.lower[first], self.upper[first], origins[rays], inverse[rays])
+                second_entry, second_exit = _slab(self.lower[second], self.upper[second], origins[rays], inverse[rays])
+                first_hit = (first_exit >= np.maximum(first_entry, 0.0)) & (first_entry <= best[rays])
+                second_hit = (second_exit >= np.maximum(second_entry, 0.0)) & (second_entry <= best[rays])
+                swap = second_entry < first_entry
+                near = np.where(swap, second, first)
+                far = np.where(swap, first, second)
+                near_entry = np.where(swap, second_entry, first_entry)
+                far_entry = np.where(swap, first_entry, second_entry)
+                near_hit = np.where(swap, second_hit, first_hit)
+                far_hit = np.where(swap, first_hit, second_hit)
+                for push, node, node_entry in ((far_hit, far, far_entry), (near_hit, near, near_entry)):
+                    pushed = rays[push]
+                    stack[pushed, size[pushed]] = node[push]
+                    stack_entry[pushed, size[pushed]] = node_entry[push]
+                    size[pushed] += 1
+
+            active = active[size[active] > 0]
+
+        best[best_face < 0] = np.inf
+        return best, best_face
+
+    def _hit_leaves(
+        self,
+        rays: np.ndarray,
+        nodes: np.ndarray,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        best: np.ndarray,
+        best_face: np.ndarray,
+    ) -> None:
+        sizes = self.count[nodes]
+        pair_rays = np.repeat(rays, sizes)
+        within = np.arange(len(pair_rays)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        pair_triangles = np.repeat(self.start[nodes], sizes) + within
+        hits = ray_triangle_distances(origins[pair_rays], directions[pair_rays], self.triangles[pair_triangles])
+        closer = hits < best[pair_rays]
+        if not closer.any():
+            return
+        pair_rays, pair_triangles, hits = pair_rays[closer], pair_triangles[closer], hits[closer]
+        np.minimum.at(best, pair_rays, hits)
+        winner = hits == best[pair_rays]
+        best_face[pair_rays[winner]] = self.faces[pair_triangles[winner]]
+
+
+def ray_triangle_distances(
+    origins: np.ndarray,
+    directions: np.ndarray,
+    triangles: np.ndarray,
+    epsilon: float = 1e-12,
+) -> np.ndarray:
+    """Möller–Trumbore intersection of ray/triangle pairs.
+
+    Args:
+        origins: Ray origins of shape (K, 3).
+        directions: Ray directions of shape (K, 3).
+        triangles: Triangle corners of shape (K, 3, 3).
+        epsilon: Determinant tolerance for rays parallel to a triangle.
+
+    Returns:
+        Distance along each ray to its triangle, ``inf`` where it misses.
+    """
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    p = np.cross(directions, edge2)
+    determinant = np.sum(edge1 * p, axis=1)
+    valid = np.abs(determinant) > epsilon
+    inverse = np.divide(1.0, determinant, out=np.zeros_like(determinant), where=valid)
+    s = origins - triangles[:, 0]
+    u = np.sum(s * p, axis=1) * inverse
+    q = np.cross(s, edge1)
+    v = np.sum(directions * q, axis=1) * inverse
+    distance = np.sum(edge2 * q, axis=1) * inverse
+    hit = valid & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0) & (distance > 0.0)
+    return np.where(hit, distance, np.inf)
+
+
+def _slab(
+    lower: np.ndarray,
+    upper: np.ndarray,
+    origins: np.ndarray,
+    inverse: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    with np.errstate(invalid="ignore"):
+        near = (lower - origins) * inverse
+        far = (upper - origins) * inverse
+    # 0 * inf is NaN for rays parallel to a slab they start on; treat as inside.
+    near = np.where(np.isnan(near), -np.inf, near)
+    far = np.where(np.isnan(far), np.inf, far)
+    return np.minimum(near, far).max(axis=1), np.maximum(near, far).min(axis=1)
+
+
+def _box_distance(lower: np.ndarray, upper: np.ndarray, points: np.ndarray) -> np.ndarray:
+    gap = np.maximum(np.maximum(lower - points, points - upper), 0.0)
+    return np.sqrt(np.einsum("ij,ij->i", gap, gap))
+
+
+def _node_bounds(
+    ordered: np.ndarray,
+    start: np.ndarray,
+    children: np.ndarray,
+    level_sizes: list[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    lower = np.empty((len(start), 3))
+    upper = np.empty((len(start), 3))
+    # Leaf ranges are disjoint, so one reduceat over sorted starts covers them all.
+    leaves = np.flatnonzero(children[:, 0] < 0)
+    leaves = leaves[np.argsort(start[leaves])]
+    lower[leaves] = np.minimum.reduceat(ordered.min(axis=1), start[leaves])
+    upper[leaves] = np.maximum.reduceat(ordered.max(axis=1), start[leaves])
+    # Inner nodes take the union of their children, deepest level first.
+    ends = np.cumsum(level_sizes)
+    for first, last in zip(ends[::-1] - level_sizes[::-1], ends[::-1]):
+        nodes = np.arange(first, last)
+        nodes = nodes[children[nodes, 0] >= 0]
+        left, right = children[nodes, 0], children[nodes, 1]
+        lower[nodes] = np.minimum(lower[left], lower[right])
+        upper[nodes] = np.maximum(upper[left], upper[right])
+    return lower, upper
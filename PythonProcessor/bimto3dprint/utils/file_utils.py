@@ -2,10 +2,20 @@
 
 Example:
     ensure_dir(Path("output"))
+    with atomic_write(Path("output/model.stl")) as file:
+        file.write(data)
 """
 from __future__ import annotations
 
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
+from typing import IO, Iterator
+
+DEFAULT_UMASK = 0o022
+"""Umask assumed where the process umask cannot be read without changing it."""
 
 
 def ensure_dir(path: Path) -> None:
@@ -15,3 +25,53 @@ def ensure_dir(path: Path) -> None:
         path: Directory path.
     """
     path.mkdir(parents=True, exist_ok=True)
+
+
+@contextmanager
+def atomic_write(path: Path, mode: str = "wb", encoding: str | None = None) -> Iterator[IO]:
+    """Write a file through a temporary file in the same directory.
+
+    The temporary file replaces ``path`` only after the block finishes, so
+    readers never see a partial file and a failed write keeps the old one.
+
+    Args:
+        path: Target file path; its directory is created if needed.
+        mode: ``"wb"`` or ``"w"``.
+        encoding: Text encoding for ``"w"``.
+
+    Yields:
+        Open file object of the temporary file.
+    """
+    path = Path(path)
+    ensure_dir(path.parent)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        if hasattr(os, "fchmod"):
+            # mkstemp creates owner-only files; give the result the permissions of a normal write.
+            os.fchmod(handle, _target_mode(path))
+        with os.fdopen(handle, mode, encoding=encoding) as file:
+            yield file
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _target_mode(path: Path) -> int:
+    """Permissions an in-place write of ``path`` would leave: the existing file's, else ``0o666`` minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_current_umask()
+
+
+def _current_umask() -> int:
+    """Process umask read from ``/proc``; ``os.umask`` is avoided because it changes the umask of every thread."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    return DEFAULT_UMASK
@@ -10,12 +10,13 @@ from pathlib import Path
 from loguru import logger
 
 LOG_DIR = Path("Logs")
-LOG_FILE = LOG_DIR / "bimto3dprint.log"
+"""Directory of the log file, relative to the working directory."""
+LOG_NAME = "bimto3dprint.log"
 
 
 def get_logger():
     """Configure and return a shared logger instance."""
     LOG_DIR.mkdir(parents=True, exist_ok=True)
     logger.remove()
-    logger.add(LOG_FILE.as_posix(), format="{time} [{level}] {message}")
+    logger.add((LOG_DIR / LOG_NAME).as_posix(), format="{time} [{level}] {message}")
     return logger
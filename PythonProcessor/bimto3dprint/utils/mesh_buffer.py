@@ -0,0 +1,77 @@
+"""Growable vertex/face buffer for assembling large meshes.
+
+Example:
+    buffer = MeshBuffer()
+    buffer.append(vertices, faces)
+    mesh = buffer.to_trimesh()
+"""
+from __future__ import annotations
+
+import numpy as np
+import trimesh
+
+
+class MeshBuffer:
+    """Preallocated vertex and face arrays that grow geometrically on demand."""
+
+    def __init__(self, vertex_capacity: int = 65536, face_capacity: int = 131072) -> None:
+        if vertex_capacity <= 0 or face_capacity <= 0:
+            raise ValueError("Buffer capacities must be positive.")
+        self._vertices = np.empty((vertex_capacity, 3), dtype=np.float64)
+        self._faces = np.empty((face_capacity, 3), dtype=np.int64)
+        self.vertex_count = 0
+        self.face_count = 0
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """View of the filled vertex rows."""
+        return self._vertices[: self.vertex_count]
+
+    @property
+    def faces(self) -> np.ndarray:
+        """View of the filled face rows."""
+        return self._faces[: self.face_count]
+
+    @property
+    def nbytes(self) -> int:
+        """Allocated buffer size in bytes."""
+        return int(self._vertices.nbytes + self._faces.nbytes)
+
+    def append(self, vertices: np.ndarray, faces: np.ndarray) -> None:
+        """Append a mesh part, offsetting its face indices.
+
+        Args:
+            vertices: Vertex array of shape (N, 3).
+            faces: Face index array of shape (M, 3) local to ``vertices``.
+        """
+        vertex_end = self.vertex_count + len(vertices)
+        face_end = self.face_count + len(faces)
+        self._vertices = self._reserve(self._vertices, self.vertex_count, vertex_end)
+        self._faces = self._reserve(self._faces, self.face_count, face_end)
+
+        self._vertices[self.vertex_count : vertex_end] = vertices
+        np.add(faces, self.vertex_count, out=self._faces[self.face_count : face_end], casting="unsafe")
+        self.vertex_count = vertex_end
+        self.face_count = face_end
+
+    def clear(self) -> None:
+        """Reset the buffer while keeping its allocation."""
+        self.vertex_count = 0
+        self.face_count = 0
+
+    def to_trimesh(self) -> trimesh.Trimesh:
+        """Build a mesh over the buffer contents.
+
+        The mesh references the buffer memory; call ``clear`` only after the mesh is
+        no longer needed or copy it first.
+        """
+        return trimesh.Trimesh(vertices=self.vertices, faces=self.faces, process=False)
+
+    @staticmethod
+    def _reserve(array: np.ndarray, used: int, rows: int) -> np.ndarray:
+        if rows <= len(array):
+            return array
+        capacity = max(rows, int(len(array) * 1.5) + 1)
+        grown = np.empty((capacity, array.shape[1]), dtype=array.dtype)
+        grown[:used] = array[:used]
+        return grown
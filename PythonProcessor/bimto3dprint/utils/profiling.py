@@ -0,0 +1,161 @@
+"""Per-stage instrumentation for the processing pipeline.
+
+Example:
+    profiler = StageProfiler()
+    with profiler.stage("smooth", mesh) as record:
+        mesh = optimizer.smooth_surface(mesh)
+        record.output(mesh)
+    profiler.write(Path("out/model.profile.json"))
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+import trimesh
+from loguru import logger
+
+PROFILE_REPORT_VERSION = 1
+
+
+@dataclass
+class StageRecord:
+    """Measurements of one pipeline stage."""
+
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: float | None = None
+    peak_rss_growth_mb: float | None = None
+    vertices_in: int | None = None
+    faces_in: int | None = None
+    vertices_out: int | None = None
+    faces_out: int | None = None
+    profile_path: str | None = None
+    error: str | None = None
+
+    def output(self, mesh: trimesh.Trimesh | None) -> None:
+        """Record the size of the mesh produced by the stage."""
+        self.vertices_out, self.faces_out = _mesh_counts(mesh)
+
+
+@dataclass
+class StageProfiler:
+    """Collect wall time, CPU time, peak RSS and mesh sizes per stage.
+
+    Attributes:
+        dump_prefix: When set, each stage is run under cProfile and its stats are
+            written to ``<dump_prefix>.<stage>.prof``.
+    """
+
+    dump_prefix: Path | None = None
+    records: list[StageRecord] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str, mesh: trimesh.Trimesh | None = None) -> Iterator[StageRecord]:
+        """Measure the enclosed block as a pipeline stage.
+
+        The output size defaults to the input size; call ``record.output`` when
+        the stage produces a new mesh.
+
+        Args:
+            name: Stage name.
+            mesh: Stage input mesh, if any.
+
+        Yields:
+            Stage record to annotate with the output mesh.
+        """
+        record = StageRecord(name=name)
+        record.vertices_in, record.faces_in = _mesh_counts(mesh)
+        record.vertices_out, record.faces_out = record.vertices_in, record.faces_in
+        profile = cProfile.Profile() if self.dump_prefix is not None else None
+
+        rss_before = peak_rss_mb()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        except BaseException as exc:
+            record.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.wall_seconds = round(time.perf_counter() - wall_start, 6)
+            record.cpu_seconds = round(time.process_time() - cpu_start, 6)
+            record.peak_rss_mb = peak_rss_mb()
+            if rss_before is not None and record.peak_rss_mb is not None:
+                record.peak_rss_growth_mb = round(record.peak_rss_mb - rss_before, 3)
+            if profile is not None:
+                path = Path(f"{self.dump_prefix}.{name}.prof")
+                path.parent.mkdir(parents=True, exist_ok=True)
+                profile.dump_stats(str(path))
+                record.profile_path = str(path)
+            self.records.append(record)
+            logger.info(
+                "Stage {}: wall={:.3f}s cpu={:.3f}s peak_rss={}MB faces {} -> {}",
+                name,
+                record.wall_seconds,
+                record.cpu_seconds,
+                record.peak_rss_mb,
+                record.faces_in,
+                record.faces_out,
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the collected stages with totals."""
+        peaks = [record.peak_rss_mb for record in self.records if record.peak_rss_mb is not None]
+        return {
+            "version": PROFILE_REPORT_VERSION,
+            "total_wall_seconds": round(sum(record.wall_seconds for record in self.records), 6),
+            "total_cpu_seconds": round(sum(record.cpu_seconds for record in self.records), 6),
+            "peak_rss_mb": max(peaks) if peaks else None,
+            "stages": [asdict(record) for record in self.records],
+        }
+
+    def write(self, path: Path) -> None:
+        """Write the timing report as JSON.
+
+        Args:
+            path: Report path.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, indent=2)
+        logger.info("Saved profile report: {}", path)
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MB, if available."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS reports bytes.
+        divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return round(peak / divisor, 3)
+
+    try:
+        import psutil  # type: ignore[import-not-found]
+    except ImportError:
+        return None
+    memory = psutil.Process().memory_info()
+    return round(getattr(memory, "peak_wset", memory.rss) / 1024 / 1024, 3)
+
+
+def _mesh_counts(mesh: trimesh.Trimesh | None) -> tuple[int | None, int | None]:
+    if mesh is None:
+        return None, None
+    return len(mesh.vertices), len(mesh.faces)
@@ -0,0 +1,29 @@
+"""Closest-point queries against a triangle mesh.
+
+Example:
+    distances, faces = SurfaceDistance(mesh).query(points)
+"""
+from __future__ import annotations
+
+import numpy as np
+import trimesh
+
+from bimto3dprint.utils.bvh import TriangleBVH
+
+
+class SurfaceDistance:
+    """Unsigned point-to-surface distances and closest faces for one mesh."""
+
+    def __init__(self, mesh: trimesh.Trimesh) -> None:
+        self._bvh = TriangleBVH.build(mesh.triangles)
+
+    def query(self, points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Distance from every point to the surface and the face it is closest to.
+
+        Args:
+            points: Query points of shape (N, 3).
+
+        Returns:
+            Distances of shape (N,) and face indices of shape (N,).
+        """
+        return self._bvh.closest(points)
@@ -0,0 +1,141 @@
+"""Edge adjacency index for triangle meshes.
+
+The index is built with one sort over the face edges and answers the topology
+questions that mesh repair and validation share: boundary and non-manifold
+edges, winding consistency across edges, connected shells and boundary loops.
+
+Example:
+    index = EdgeIndex.build(mesh.faces)
+    holes = index.boundary_loops()
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+
+@dataclass
+class EdgeIndex:
+    """Undirected edges of a triangle mesh and the face slots on each of them.
+
+    Slot ``3 * f + k`` is the edge of face ``f`` from corner ``k`` to corner ``k + 1``.
+
+    Attributes:
+        faces: Face array of shape (F, 3).
+        edges: Unique undirected edges of shape (E, 2), smaller vertex first.
+        slot_edge: Edge index of every face slot, shape (3F,).
+        forward: Whether each slot runs from ``edges[:, 0]`` to ``edges[:, 1]``.
+        counts: Number of faces on each edge.
+        edge_slots: Slots grouped by edge; edge ``e`` owns
+            ``edge_slots[edge_start[e]:edge_start[e] + counts[e]]``.
+        edge_start: Offset of every edge in ``edge_slots``.
+    """
+
+    faces: np.ndarray
+    edges: np.ndarray
+    slot_edge: np.ndarray
+    forward: np.ndarray
+    counts: np.ndarray
+    edge_slots: np.ndarray
+    edge_start: np.ndarray
+
+    @classmethod
+    def build(cls, faces: np.ndarray) -> "EdgeIndex":
+        """Index the edges of ``faces``.
+
+        Args:
+            faces: Face array of shape (F, 3).
+
+        Returns:
+            Built index.
+        """
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        directed = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        forward = directed[:, 0] < directed[:, 1]
+        undirected = np.sort(directed, axis=1)
+        keys = row_keys(undirected)
+        edge_slots = np.argsort(keys, kind="stable")
+        sorted_keys = keys[edge_slots]
+        new_edge = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if len(keys) else np.empty(0, dtype=bool)
+        edge_start = np.flatnonzero(new_edge)
+        slot_edge = np.empty(len(keys), dtype=np.int64)
+        slot_edge[edge_slots] = np.cumsum(new_edge) - 1
+        counts = np.diff(np.r_[edge_start, len(keys)])
+        return cls(faces, undirected[edge_slots[edge_start]], slot_edge, forward, counts, edge_slots, edge_start)
+
+    @property
+    def slot_face(self) -> np.ndarray:
+        """Face of every slot."""
+        return np.repeat(np.arange(len(self.faces)), 3)
+
+    @property
+    def is_watertight(self) -> bool:
+        """Every edge has exactly two faces."""
+        return bool(len(self.counts)) and bool(np.all(self.counts == 2))
+
+    def boundary_edges(self) -> np.ndarray:
+        """Indices of edges with a single face."""
+        return np.flatnonzero(self.counts == 1)
+
+    def non_manifold_edges(self) -> np.ndarray:
+        """Indices of edges shared by more than two faces."""
+        return np.flatnonzero(self.counts > 2)
+
+    def manifold_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """The two slots on every edge with exactly two faces."""
+        start = self.edge_start[self.counts == 2]
+        return self.edge_slots[start], self.edge_slots[start + 1]
+
+    def inconsistent_edges(self) -> np.ndarray:
+        """Indices of manifold edges whose two faces traverse them in the same direction."""
+        first, second = self.manifold_pairs()
+        same = self.forward[first] == self.forward[second]
+        return self.slot_edge[first[same]]
+
+    def shells(self) -> np.ndarray:
+        """Shell label of every face; faces sharing any edge are in one shell."""
+        slot_face = self.slot_face
+        graph = sparse.coo_matrix(
+            (np.ones(len(slot_face), dtype=np.int8), (slot_face, len(self.faces) + self.slot_edge)),
+            shape=(len(self.faces) + len(self.edges),) * 2,
+        )
+        return connected_components(graph, directed=False)[1][: len(self.faces)]
+
+    def boundary_loops(self) -> tuple[np.ndarray, np.ndarray]:
+        """Group boundary edges into loops.
+
+        Returns:
+            Boundary edge indices and the loop label of each, numbered from 0.
+        """
+        boundary = self.boundary_edges()
+        if len(boundary) == 0:
+            return boundary, np.empty(0, dtype=np.int64)
+        vertices, ends = np.unique(self.edges[boundary], return_inverse=True)
+        ends = ends.reshape(-1, 2)
+        graph = sparse.coo_matrix(
+            (np.ones(len(ends), dtype=np.int8), (ends[:, 0], ends[:, 1])),
+            shape=(len(vertices), len(vertices)),
+        )
+        labels = connected_components(graph, directed=False)[1]
+        return boundary, labels[ends[:, 0]]
+
+
+def row_keys(rows: np.ndarray) -> np.ndarray:
+    """One int64 key per row, equal exactly for equal rows.
+
+    Integer rows are packed into a single index when their range allows;
+    other rows get their rank in lexicographic order.
+    """
+    if rows.dtype.kind in "iu" and len(rows):
+        shifted = rows - rows.min(axis=0)
+        dims = shifted.max(axis=0) + 1
+        if np.prod(dims.astype(np.float64)) < 2.0**62:
+            return np.ravel_multi_index(shifted.T, dims)
+    order = np.lexsort(rows.T[::-1])
+    ranks = np.cumsum(np.r_[False, np.any(rows[order][1:] != rows[order][:-1], axis=1)])
+    keys = np.empty(len(rows), dtype=np.int64)
+    keys[order] = ranks
+    return keys
@@ -1,22 +1,430 @@
 """3D print validation utilities.
 
+Checks a mesh in printer millimeters, with +Z as the build direction:
+overhanging regions (grouped over the edge adjacency index, with near-horizontal
+ones judged as bridges by their distance from supporting walls), features thinner
+than the printer can resolve, gaps narrow enough to fuse, small or floating
+islands and the fit in the build volume. Issues reference face indices and
+coordinates.
+
 Example:
     report = validate_print(mesh, config)
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import trimesh
+from loguru import logger
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from bimto3dprint.processors.thickness import ThicknessAnalysis, ThicknessAnalyzer
+from bimto3dprint.utils.topology import EdgeIndex
+
+DEFAULT_BUILD_VOLUME_MM = (220.0, 220.0, 250.0)
+DEFAULT_MAX_OVERHANG_DEG = 45.0
+DEFAULT_MAX_BRIDGE_MM = 10.0
+DEFAULT_MIN_FEATURE_MM = 0.8
+DEFAULT_MIN_GAP_MM = 0.4
+DEFAULT_MIN_ISLAND_VOLUME_MM3 = 1.0
+DEFAULT_BED_TOLERANCE_MM = 0.05
+DEFAULT_MAX_LOCATIONS = 20
+_BRIDGE_NORMAL_Z = -np.cos(np.radians(10.0))
+"""Downward faces within 10 degrees of horizontal are bridged rather than overhanging."""
+
+
+@dataclass
+class PrintSettings:
+    """Printer limits used by the print validator.
+
+    Attributes:
+        build_volume_mm: Printable (x, y, z) size; ``None`` skips the fit check.
+        max_overhang_deg: Steepest printable overhang, measured from vertical.
+        max_bridge_mm: Longest span printable without supports.
+        min_feature_mm: Thinnest printable wall or feature.
+        min_gap_mm: Narrowest gap that does not fuse shut.
+        min_island_volume_mm3: Smaller disconnected parts are reported.
+        bed_tolerance_mm: Distance within which geometry rests on the bed or on another part.
+    """
+
+    build_volume_mm: Optional[Tuple[float, float, float]] = DEFAULT_BUILD_VOLUME_MM
+    max_overhang_deg: float = DEFAULT_MAX_OVERHANG_DEG
+    max_bridge_mm: float = DEFAULT_MAX_BRIDGE_MM
+    min_feature_mm: float = DEFAULT_MIN_FEATURE_MM
+    min_gap_mm: float = DEFAULT_MIN_GAP_MM
+    min_island_volume_mm3: float = DEFAULT_MIN_ISLAND_VOLUME_MM3
+    bed_tolerance_mm: float = DEFAULT_BED_TOLERANCE_MM
+
+    def __post_init__(self) -> None:
+        if self.build_volume_mm is not None:
+            self.build_volume_mm = tuple(float(value) for value in self.build_volume_mm)
+            if len(self.build_volume_mm) != 3 or min(self.build_volume_mm) <= 0:
+                raise ValueError("build_volume_mm must contain three positive sizes.")
+        if not 0 < self.max_overhang_deg < 90:
+            raise ValueError("max_overhang_deg must be between 0 and 90.")
+        for name in ("max_bridge_mm", "min_feature_mm", "min_gap_mm", "min_island_volume_mm3", "bed_tolerance_mm"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"{name} must not be negative.")
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "PrintSettings":
+        """Read settings from the ``printer`` section of a configuration.
+
+        Args:
+            config: Configuration dictionary; missing keys keep their defaults.
+
+        Raises:
+            ValueError: If the section has unknown keys or invalid values.
+        """
+        section = dict(config.get("printer") or {})
+        known = set(cls.__dataclass_fields__)
+        unknown = sorted(set(section) - known)
+        if unknown:
+            raise ValueError(f"Unknown printer settings: {', '.join(unknown)}")
+        return cls(**section)
+
+
+@dataclass
+class PrintValidator:
+    """Check whether a mesh can be printed with the given settings.
+
+    Attributes:
+        settings: Printer limits.
+        max_locations: Offending elements listed per issue.
+    """
+
+    settings: PrintSettings
+    max_locations: int = DEFAULT_MAX_LOCATIONS
+
+    def validate(self, mesh: trimesh.Trimesh, thickness: ThicknessAnalysis | None = None) -> Dict[str, Any]:
+        """Run all printability checks.
+
+        Args:
+            mesh: Watertight mesh in printer millimeters.
+            thickness: Precomputed wall thickness analysis; a short-range one is
+                computed when omitted.
+
+        Returns:
+            Report with ``printable`` (no error-severity issues), the mesh extents,
+            overhang area and a list of issues.
+        """
+        if mesh.is_empty:
+            raise ValueError("Input mesh is empty.")
+        settings = self.settings
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        faces = np.asarray(mesh.faces, dtype=np.int64)
+        triangles = vertices[faces]
+        cross = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+        double_area = np.linalg.norm(cross, axis=1)
+        normals = cross / np.maximum(double_area, 1e-300)[:, None]
+        areas = double_area / 2.0
+        centroids = triangles.mean(axis=1)
+        index = EdgeIndex.build(faces)
+        issues = []
+
+        # Overhangs: downward faces steeper than the limit, except those on the bed.
+        bed = float(vertices[:, 2].min())
+        on_bed = triangles[:, :, 2].max(axis=1) <= bed + settings.bed_tolerance_mm
+        overhanging = (normals[:, 2] < -np.sin(np.radians(settings.max_overhang_deg))) & ~on_bed
+        region_faces = np.flatnonzero(overhanging)
+        if len(region_faces):
+            regions = _Regions.build(index, region_faces, triangles, normals, areas, settings.max_bridge_mm / 4.0)
+            # Near-horizontal regions are bridged from their supports; steeper ones overhang.
+            # A bridge of span L keeps every point within L / 2 of a support.
+            horizontal = regions.normal_z <= _BRIDGE_NORMAL_Z
+            unsupported = np.flatnonzero(horizontal & (regions.reach > settings.max_bridge_mm / 2.0))
+            if len(unsupported):
+                # Undersides resting on another part are supported across their whole area.
+                bottoms = centroids[regions.first_faces[unsupported]]
+                unsupported = unsupported[~_rests_on_part(mesh, bottoms, normals, settings.bed_tolerance_mm)]
+            issues.append(self._region_issue("overhangs", "warning", np.flatnonzero(~horizontal), regions))
+            issues.append(self._region_issue("unsupported_spans", "warning", unsupported, regions))
+
+        # Thin features and narrow gaps from inward and outward rays.
+        if thickness is None:
+            thickness = ThicknessAnalyzer(max_thickness=settings.min_feature_mm * 2.0).analyze(mesh)
+        thin = thickness.thin_faces(settings.min_feature_mm)
+        issues.append(self._face_issue("thin_features", "error", thin, centroids, thickness.face_thickness))
+        if settings.min_gap_mm > 0:
+            gaps = ThicknessAnalyzer(max_thickness=settings.min_gap_mm, outward=True).analyze(mesh)
+            narrow = gaps.thin_faces(settings.min_gap_mm)
+            issues.append(self._face_issue("narrow_gaps", "warning", narrow, centroids, gaps.face_thickness))
+
+        # Islands: small parts, and parts resting neither on the bed nor on another part.
+        shells = index.shells()
+        shell_count = int(shells.max()) + 1
+        shell_volume = np.bincount(shells, weights=np.einsum("ij,ij->i", triangles[:, 0], cross) / 6.0)
+        solid = shell_volume > 0
+        small = np.flatnonzero(solid & (shell_volume < settings.min_island_volume_mm3))
+        floating = _floating(mesh, shells, solid, triangles, normals, bed, settings.bed_tolerance_mm)
+        issues.append(self._shell_issue("small_islands", "warning", small, shells, centroids, shell_volume))
+        issues.append(self._shell_issue("floating_islands", "error", floating, shells, centroids, shell_volume))
+
+        extents = np.ptp(vertices, axis=0)
+        fit_scale = None
+        if settings.build_volume_mm is not None:
+            fit_scale = _fit_scale(extents, np.asarray(settings.build_volume_mm))
+            if fit_scale < 1.0:
+                issues.append(
+                    {
+                        "type": "exceeds_build_volume",
+                        "severity": "error",
+                        "count": 1,
+                        "extents_mm": np.round(extents, 3).tolist(),
+                        "build_volume_mm": list(settings.build_volume_mm),
+                        "scale_to_fit": round(fit_scale, 6),
+                    }
+                )
+
+        issues = [issue for issue in issues if issue["count"]]
+        report = {
+            "printable": not any(issue["severity"] == "error" for issue in issues),
+            "extents_mm": np.round(extents, 3).tolist(),
+            "scale_to_fit": None if fit_scale is None else round(fit_scale, 6),
+            "overhang_area_mm2": float(areas[overhanging].sum()),
+            "min_feature_mm": thickness.minimum,
+            "shells": shell_count,
+            "issues": issues,
+        }
+        logger.info(
+            "Print validation: printable={}, issues={}",
+            report["printable"],
+            {issue["type"]: issue["count"] for issue in issues},
+        )
+        return report
 
+    def _face_issue(
+        self,
+        kind: str,
+        severity: str,
+        face_ids: np.ndarray,
+        centroids: np.ndarray,
+        values: np.ndarray,
+    ) -> Dict[str, Any]:
+        listed = face_ids[np.argsort(values[face_ids], kind="stable")][: self.max_locations]
+        return {
+            "type": kind,
+            "severity": severity,
+            "count": len(face_ids),
+            "indices": listed.tolist(),
+            "values_mm": np.round(values[listed], 4).tolist(),
+            "locations": np.round(centroids[listed], 4).tolist(),
+        }
 
-def validate_print(mesh: Any, config: Dict[str, Any]) -> Dict[str, Any]:
+    def _region_issue(self, kind: str, severity: str, selected: np.ndarray, regions: "_Regions") -> Dict[str, Any]:
+        # Largest regions first; each references one of its faces.
+        listed = selected[np.argsort(-regions.areas[selected], kind="stable")][: self.max_locations]
+        return {
+            "type": kind,
+            "severity": severity,
+            "count": len(selected),
+            "faces": regions.first_faces[listed].tolist(),
+            "areas_mm2": np.round(regions.areas[listed], 3).tolist(),
+            "reach_mm": [None if np.isinf(value) else round(float(value), 3) for value in regions.reach[listed]],
+            "locations": np.round(regions.centers[listed], 4).tolist(),
+        }
+
+    def _shell_issue(
+        self,
+        kind: str,
+        severity: str,
+        selected: np.ndarray,
+        shells: np.ndarray,
+        centroids: np.ndarray,
+        volumes: np.ndarray,
+    ) -> Dict[str, Any]:
+        sizes = np.bincount(shells)
+        center = np.column_stack([np.bincount(shells, weights=centroids[:, axis]) for axis in range(3)])
+        center /= np.maximum(sizes, 1)[:, None]
+        listed = selected[: self.max_locations]
+        first_face = np.unique(shells, return_index=True)[1]
+        return {
+            "type": kind,
+            "severity": severity,
+            "count": len(selected),
+            "faces": first_face[listed].tolist(),
+            "volumes_mm3": np.round(volumes[listed], 4).tolist(),
+            "locations": np.round(center[listed], 4).tolist(),
+        }
+
+
+def validate_print(
+    mesh: trimesh.Trimesh,
+    config: Dict[str, Any],
+    thickness: ThicknessAnalysis | None = None,
+) -> Dict[str, Any]:
     """Validate mesh for printability.
 
     Args:
-        mesh: Mesh-like object.
-        config: Configuration dictionary.
+        mesh: Mesh in printer millimeters.
+        config: Configuration dictionary; printer limits are read from ``printer``.
+        thickness: Optional precomputed wall thickness analysis.
 
     Returns:
         Validation report.
     """
-    # TODO: Validate wall thickness and feature size.
-    return {"printable": True, "issues": []}
+    return PrintValidator(PrintSettings.from_config(config)).validate(mesh, thickness=thickness)
+
+
+@dataclass
+class _Regions:
+    """Edge-connected regions of a face subset with their area-weighted statistics.
+
+    Attributes:
+        areas: Region areas.
+        centers: Area-weighted region centroids.
+        normal_z: Area-weighted mean normal Z.
+        reach: Largest distance from a region point to its nearest supported
+            boundary edge; ``inf`` for regions without support.
+        first_faces: One face of every region.
+    """
+
+    areas: np.ndarray
+    centers: np.ndarray
+    normal_z: np.ndarray
+    reach: np.ndarray
+    first_faces: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        index: EdgeIndex,
+        face_ids: np.ndarray,
+        triangles: np.ndarray,
+        normals: np.ndarray,
+        areas: np.ndarray,
+        sample_step: float,
+    ) -> "_Regions":
+        region = np.full(len(index.faces), -1, dtype=np.int64)
+        region[face_ids] = 0
+        first, second = index.manifold_pairs()
+        first_face, second_face = first // 3, second // 3
+        both = (region[first_face] >= 0) & (region[second_face] >= 0)
+        graph = sparse.coo_matrix(
+            (np.ones(int(np.count_nonzero(both)), dtype=np.int8), (first_face[both], second_face[both])),
+            shape=(len(region), len(region)),
+        )
+        _, labels = np.unique(connected_components(graph, directed=False)[1][face_ids], return_inverse=True)
+        labels = labels.reshape(-1)
+        region[face_ids] = labels
+
+        weights = areas[face_ids]
+        region_area = np.bincount(labels, weights=weights)
+        total = np.maximum(region_area, 1e-300)
+        corners = triangles[face_ids]
+        centers = np.column_stack(
+            [np.bincount(labels, weights=corners[:, :, axis].mean(axis=1) * weights) for axis in range(3)]
+        )
+        return cls(
+            areas=region_area,
+            centers=centers / total[:, None],
+            normal_z=np.bincount(labels, weights=normals[face_ids, 2] * weights) / total,
+            reach=_support_reach(index, region, labels, corners, triangles, sample_step, len(region_area)),
+            first_faces=face_ids[np.unique(labels, return_index=True)[1]],
+        )
+
+
+def _support_reach(
+    index: EdgeIndex,
+    region: np.ndarray,
+    labels: np.ndarray,
+    corners: np.ndarray,
+    triangles: np.ndarray,
+    sample_step: float,
+    count: int,
+) -> np.ndarray:
+    """Largest distance from region corners to supported boundary edges of the same region.
+
+    A boundary edge is supported when the face across it runs downward, like a
+    wall under a ceiling; an edge whose neighbour rises is a free edge.
+    """
+    first, second = index.manifold_pairs()
+    inside, outside = np.concatenate([first, second]), np.concatenate([second, first])
+    boundary = (region[inside // 3] >= 0) & (region[outside // 3] < 0)
+    inside, outside = inside[boundary], outside[boundary]
+    # Corner positions of the slot's edge and of the neighbour's opposite corner.
+    inside_face, inside_corner = np.divmod(inside, 3)
+    outside_face, outside_corner = np.divmod(outside, 3)
+    a = triangles[inside_face, inside_corner]
+    b = triangles[inside_face, (inside_corner + 1) % 3]
+    opposite = triangles[outside_face, (outside_corner + 2) % 3]
+    supported = opposite[:, 2] < np.minimum(a[:, 2], b[:, 2])
+    a, b, owner = a[supported], b[supported], region[inside_face[supported]]
+    reach = np.full(count, np.inf)
+    if len(a) == 0:
+        return reach
+
+    # Sample supported edges densely enough that nearest samples approximate nearest points.
+    steps = np.maximum(np.ceil(np.linalg.norm(b - a, axis=1) / max(sample_step, 1e-9)).astype(np.int64), 1)
+    sample_edge = np.repeat(np.arange(len(a)), steps + 1)
+    fraction = (np.arange(len(sample_edge)) - np.repeat(np.cumsum(steps + 1) - steps - 1, steps + 1)) / np.repeat(
+        steps, steps + 1
+    )
+    samples = a[sample_edge] + (b - a)[sample_edge] * fraction[:, None]
+    # A fourth coordinate far larger than the model keeps nearest samples inside each region.
+    separation = 4.0 * float(np.ptp(triangles.reshape(-1, 3), axis=0).max() + 1.0)
+    tree = cKDTree(np.column_stack([samples, owner[sample_edge] * separation]))
+    points = corners.reshape(-1, 3)
+    point_labels = np.repeat(labels, 3)
+    distance, _ = tree.query(np.column_stack([points, point_labels * separation]), distance_upper_bound=separation / 2)
+    reach.fill(0.0)
+    np.maximum.at(reach, point_labels, distance)
+    return reach
+
+
+def _floating(
+    mesh: trimesh.Trimesh,
+    shells: np.ndarray,
+    solid: np.ndarray,
+    triangles: np.ndarray,
+    normals: np.ndarray,
+    bed: float,
+    tolerance: float,
+) -> np.ndarray:
+    """Solid shells above the bed whose lowest vertices and faces rest on no other part."""
+    lowest = np.full(len(solid), np.inf)
+    np.minimum.at(lowest, shells, triangles[:, :, 2].min(axis=1))
+    raised = solid & (lowest > bed + tolerance)
+    if not raised.any():
+        return np.zeros(0, dtype=np.int64)
+
+    bottom = raised[shells] & (triangles[:, :, 2].max(axis=1) <= lowest[shells] + tolerance)
+    points = [triangles[bottom].mean(axis=1)]
+    owners = [shells[bottom]]
+    corners = triangles.reshape(-1, 3)
+    corner_shells = np.repeat(shells, 3)
+    candidates = np.flatnonzero(raised[corner_shells] & (corners[:, 2] <= lowest[corner_shells]))
+    points.append(corners[candidates])
+    owners.append(corner_shells[candidates])
+    points, owners = np.concatenate(points), np.concatenate(owners)
+
+    resting = np.zeros(len(solid), dtype=bool)
+    resting[owners[_rests_on_part(mesh, points, normals, tolerance)]] = True
+    return np.flatnonzero(raised & ~resting)
+
+
+def _rests_on_part(mesh: trimesh.Trimesh, points: np.ndarray, normals: np.ndarray, tolerance: float) -> np.ndarray:
+    """Whether points on a part's underside lie on or inside another solid.
+
+    A ray cast down from just below each point exits a solid through a
+    downward face when it starts inside one. Unlike a parity count this stays
+    reliable where the two parts share coplanar faces.
+    """
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    origins = points - [0.0, 0.0, tolerance / 2.0]
+    directions = np.tile([0.0, 0.0, -1.0], (len(origins), 1))
+    hit = mesh.ray.intersects_first(origins, directions)
+    return (hit >= 0) & (normals[hit, 2] < 0)
+
+
+def _fit_scale(extents: np.ndarray, build_volume: np.ndarray) -> float:
+    """Largest uniform scale that fits the extents, allowing a quarter turn about Z."""
+    extents = np.maximum(extents, 1e-12)
+    straight = np.min(build_volume / extents)
+    turned = np.min(build_volume / extents[[1, 0, 2]])
+    return float(max(straight, turned))
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.utils import logger as log_config  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _log_to_tmp_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Commands and forked workers call get_logger(); keep their log file out of the working tree.
+    monkeypatch.setattr(log_config, "LOG_DIR", tmp_path / "Logs")
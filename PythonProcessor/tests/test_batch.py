@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint import batch  # noqa: E402
+from bimto3dprint.batch import BatchJob, BatchResult, BatchRunner, collect_jobs  # noqa: E402
+from bimto3dprint.pipeline import PipelineOptionsError, ProcessOptions  # noqa: E402
+
+
+def test_collect_jobs_applies_manifest_overrides(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "defaults": {"scale": 0.01},
+                "files": [
+                    "a.ifc",
+                    {"ifc": "sub/b.ifc", "output": "custom/b.obj", "format": "obj", "no-thicken": True},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    jobs = collect_jobs(manifest, tmp_path / "out", ProcessOptions())
+
+    assert [job.ifc_file for job in jobs] == [tmp_path / "a.ifc", tmp_path / "sub" / "b.ifc"]
+    assert jobs[0].output_path == tmp_path / "out" / "a.stl"
+    assert jobs[0].options.scale == 0.01
+    assert jobs[1].output_path == tmp_path / "custom" / "b.obj"
+    assert jobs[1].options.output_format == "obj"
+    assert jobs[1].options.no_thicken is True
+
+
+def test_collect_jobs_rejects_unknown_override(tmp_path: Path) -> None:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"files": [{"ifc": "a.ifc", "colour": "red"}]}), encoding="utf-8")
+
+    with pytest.raises(PipelineOptionsError):
+        collect_jobs(manifest, tmp_path, ProcessOptions())
+
+
+def test_batch_runner_isolates_failures(tmp_path: Path) -> None:
+    (tmp_path / "broken.ifc").write_text("not an ifc file", encoding="utf-8")
+    (tmp_path / "empty.ifc").write_text("", encoding="utf-8")
+    jobs = collect_jobs(tmp_path, tmp_path / "out", ProcessOptions(no_cache=True))
+
+    summary = BatchRunner(workers=2).run(jobs)
+
+    assert [Path(result.ifc_file).name for result in summary.results] == ["broken.ifc", "empty.ifc"]
+    assert summary.failed == 2
+    assert all(result.error for result in summary.results)
+    assert summary.to_dict()["total"] == 2
+
+
+def _crash_on_marker(job: BatchJob) -> BatchResult:
+    if job.ifc_file.name == "crash.ifc":
+        os._exit(1)
+    time.sleep(0.5)
+    return BatchResult(str(job.ifc_file), str(job.output_path), "ok", 0.5)
+
+
+def test_worker_crash_fails_only_the_crashing_job(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(batch, "run_job", _crash_on_marker)
+    shutdown = ProcessPoolExecutor.shutdown
+    # Python 3.8 has no cancel_futures keyword.
+    monkeypatch.setattr(ProcessPoolExecutor, "shutdown", lambda self, wait=True: shutdown(self, wait))
+    names = ("a.ifc", "crash.ifc", "b.ifc")
+    jobs = [BatchJob(tmp_path / name, tmp_path / f"{name}.stl", ProcessOptions()) for name in names]
+
+    summary = BatchRunner(workers=3, memory_budget_mb=1e6).run(jobs)
+
+    assert [result.status for result in summary.results] == ["ok", "failed", "ok"]
+    assert "crashed" in summary.results[1].error
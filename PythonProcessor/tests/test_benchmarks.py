@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from benchmarks import runner  # noqa: E402
+from benchmarks.runner import BenchmarkCase, BenchmarkResult, compare_to_baseline, run_benchmarks  # noqa: E402
+from benchmarks.synthetic import make_building_ifc, make_building_mesh  # noqa: E402
+
+
+def test_synthetic_building_scales_with_floors_and_rooms() -> None:
+    small = make_building_mesh(floors=1, rooms_per_floor=1)
+    large = make_building_mesh(floors=2, rooms_per_floor=4)
+
+    # Four walls per room plus one slab per floor and the roof slab, 12 faces per box.
+    assert len(small.faces) == (4 + 2) * 12
+    assert len(large.faces) == (2 * 4 * 4 + 3) * 12
+    assert large.extents[2] > small.extents[2]
+
+
+def test_synthetic_ifc_contains_storeys_walls_and_slabs() -> None:
+    model = make_building_ifc(floors=2, rooms_per_floor=2)
+
+    assert len(model.by_type("IfcBuildingStorey")) == 2
+    assert len(model.by_type("IfcWall")) == 2 * 2 * 4
+    assert len(model.by_type("IfcSlab")) == 2
+
+
+def test_compare_to_baseline_flags_slow_cases_only() -> None:
+    baseline = {
+        "results": [
+            {"name": "smooth_surface", "size": "small", "median_seconds": 1.0},
+            {"name": "thicken_walls", "size": "small", "median_seconds": 1.0},
+            {"name": "export_glb", "size": "small", "median_seconds": 0.0005},
+        ]
+    }
+    results = [
+        BenchmarkResult("smooth_surface", "small", median_seconds=1.2),
+        BenchmarkResult("thicken_walls", "small", median_seconds=2.0),
+        BenchmarkResult("export_glb", "small", median_seconds=0.002),
+        BenchmarkResult("export_stl", "small", error="TypeError"),
+    ]
+
+    regressions = compare_to_baseline(results, baseline, tolerance=0.5)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("thicken_walls[small]")
+
+
+def test_every_timed_run_gets_unmodified_input(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen = []
+
+    def shift(mesh: trimesh.Trimesh) -> None:
+        seen.append(float(mesh.bounds[0][0]))
+        mesh.apply_translation([1.0, 0.0, 0.0])
+
+    case = BenchmarkCase("shift", lambda size: trimesh.creation.box(), shift)
+    monkeypatch.setattr(runner, "CASES", [case])
+
+    (result,) = run_benchmarks(["small"], repeat=3)
+
+    assert result.error is None and len(result.runs) == 3
+    assert seen == [-0.5] * 4
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.config import ConfigManager  # noqa: E402
+from bimto3dprint.daemon import DaemonClient, DaemonError, ProcessingDaemon  # noqa: E402
+from bimto3dprint.pipeline import ProcessOptions, load_pipeline_config  # noqa: E402
+
+
+def _slow_handler(
+    ifc_file: Path,
+    output_path: Path,
+    options: Any,
+    progress: Callable[[str, float], None],
+) -> dict[str, Any]:
+    steps = 40
+    for step in range(steps):
+        progress(f"step-{step}", step / steps)
+        time.sleep(0.05)
+    return {"steps": steps}
+
+
+@pytest.fixture()
+def client(tmp_path: Path) -> Iterator[DaemonClient]:
+    daemon = ProcessingDaemon(port=0, workers=1, presets=[], handler=_slow_handler)
+    daemon.start()
+    try:
+        yield DaemonClient(*daemon.address, timeout=10.0)
+    finally:
+        daemon.stop()
+
+
+def test_daemon_streams_progress_and_completes(client: DaemonClient, tmp_path: Path) -> None:
+    ifc_file = tmp_path / "model.ifc"
+    ifc_file.write_text("", encoding="utf-8")
+
+    job = client.submit(ifc_file, tmp_path / "model.stl", format="obj")
+    events = list(client.watch(job["job_id"]))
+
+    assert events[-1]["done"] is True
+    assert events[-1]["job"]["status"] == "succeeded"
+    assert events[-1]["job"]["report"] == {"steps": 40}
+    stages = [event["event"]["stage"] for event in events[:-1] if event["event"]["type"] == "stage"]
+    assert stages[0] == "step-0"
+    assert client.status(job["job_id"])["progress"] == 1.0
+
+
+def test_daemon_cancels_queued_and_running_jobs(client: DaemonClient, tmp_path: Path) -> None:
+    ifc_file = tmp_path / "model.ifc"
+    ifc_file.write_text("", encoding="utf-8")
+
+    running = client.submit(ifc_file, tmp_path / "a.stl")
+    queued = client.submit(ifc_file, tmp_path / "b.stl")
+    for event in client.watch(running["job_id"]):
+        if event.get("event", {}).get("type") == "stage":
+            break
+
+    assert client.cancel(queued["job_id"])["status"] == "cancelled"
+    client.cancel(running["job_id"])
+    final = list(client.watch(running["job_id"]))[-1]["job"]
+
+    assert final["status"] == "cancelled"
+    assert final["report"] is None
+
+
+def test_daemon_rejects_invalid_requests(client: DaemonClient, tmp_path: Path) -> None:
+    assert client.ping()["workers"] == 1
+    with pytest.raises(DaemonError, match="IFC file not found"):
+        client.submit(tmp_path / "missing.ifc", tmp_path / "out.stl")
+    with pytest.raises(DaemonError, match="Unknown action"):
+        client.request({"action": "explode"})
+    ifc_file = tmp_path / "model.ifc"
+    ifc_file.write_text("", encoding="utf-8")
+    for options, error in (
+        (["a"], "must be an object"),
+        ({"scale": "2"}, "scale must be float"),
+        ({"threads": None}, "threads must be int"),
+    ):
+        message = {"action": "submit", "ifc_file": str(ifc_file), "output": "out.stl", "options": options}
+        with pytest.raises(DaemonError, match=error):
+            client.request(message)
+    with pytest.raises(DaemonError, match="Invalid request"):
+        client.request({"action": "submit", "ifc_file": 1, "output": "out.stl"})
+    assert client.ping()["ok"]
+
+
+def _quick_handler(
+    ifc_file: Path,
+    output_path: Path,
+    options: Any,
+    progress: Callable[[str, float], None],
+) -> dict[str, Any]:
+    return {"file": ifc_file.name}
+
+
+def test_daemon_forgets_oldest_finished_jobs(tmp_path: Path) -> None:
+    ifc_file = tmp_path / "model.ifc"
+    ifc_file.write_text("", encoding="utf-8")
+    daemon = ProcessingDaemon(port=0, workers=1, presets=[], handler=_quick_handler, keep_finished=2)
+    daemon.start()
+    try:
+        client = DaemonClient(*daemon.address, timeout=10.0)
+        job_ids = []
+        for index in range(4):
+            job_ids.append(client.submit(ifc_file, tmp_path / f"{index}.stl")["job_id"])
+            assert list(client.watch(job_ids[-1]))[-1]["job"]["status"] == "succeeded"
+
+        assert [job["job_id"] for job in client.jobs()] == job_ids[2:]
+        with pytest.raises(DaemonError, match="Unknown job"):
+            client.status(job_ids[0])
+    finally:
+        daemon.stop()
+
+
+def _crash_handler(
+    ifc_file: Path,
+    output_path: Path,
+    options: Any,
+    progress: Callable[[str, float], None],
+) -> dict[str, Any]:
+    if ifc_file.name == "crash.ifc":
+        time.sleep(0.2)
+        os._exit(1)
+    time.sleep(1.0)
+    return {"file": ifc_file.name}
+
+
+def test_worker_crash_fails_only_the_crashing_job(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    shutdown = ProcessPoolExecutor.shutdown
+    # Python 3.8 has no cancel_futures keyword.
+    monkeypatch.setattr(ProcessPoolExecutor, "shutdown", lambda self, wait=True: shutdown(self, wait))
+    daemon = ProcessingDaemon(port=0, workers=2, presets=[], handler=_crash_handler)
+    daemon.start()
+    try:
+        client = DaemonClient(*daemon.address, timeout=30.0)
+        jobs = {}
+        for name in ("a.ifc", "crash.ifc", "b.ifc"):
+            (tmp_path / name).write_text("", encoding="utf-8")
+            jobs[name] = client.submit(tmp_path / name, tmp_path / f"{name}.stl")["job_id"]
+        final = {name: list(client.watch(job_id))[-1]["job"] for name, job_id in jobs.items()}
+    finally:
+        daemon.stop()
+
+    assert {name: job["status"] for name, job in final.items()} == {
+        "a.ifc": "succeeded",
+        "crash.ifc": "failed",
+        "b.ifc": "succeeded",
+    }
+    assert "crashed" in final["crash.ifc"]["error"]
+
+
+def test_named_preset_is_reloaded_after_edit(tmp_path: Path) -> None:
+    preset_file = tmp_path / "Python" / "custom.json"
+    preset_file.parent.mkdir()
+    manager = ConfigManager(tmp_path)
+    options = ProcessOptions(preset="python:custom")
+
+    preset_file.write_text(json.dumps({"version": 1, "categories": {"include": ["IfcWall"]}}), encoding="utf-8")
+    assert load_pipeline_config(options, manager)["categories"]["include"] == ["IfcWall"]
+
+    preset_file.write_text(json.dumps({"version": 1, "categories": {"include": ["IfcSlab"]}}), encoding="utf-8")
+    os.utime(preset_file, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    assert load_pipeline_config(options, manager)["categories"]["include"] == ["IfcSlab"]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.decimation import QuadricDecimator  # noqa: E402
+from bimto3dprint.processors.shell_extractor import ShellExtractor  # noqa: E402
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid  # noqa: E402
+
+
+def test_coplanar_faces_merge_down_to_a_box() -> None:
+    box = trimesh.creation.box(extents=[10.0, 6.0, 4.0]).subdivide().subdivide().subdivide()
+
+    decimated = QuadricDecimator().decimate(box, target_faces=12)
+
+    assert len(decimated.faces) == 12
+    assert decimated.is_watertight and decimated.is_winding_consistent
+    assert decimated.volume == pytest.approx(240.0)
+    np.testing.assert_allclose(decimated.bounds, box.bounds)
+
+
+def test_marching_cubes_staircase_collapses_to_a_slope() -> None:
+    slab = trimesh.creation.box(extents=[12.0, 6.0, 1.0])
+    slab.apply_transform(trimesh.transformations.rotation_matrix(np.radians(20.0), [0.0, 1.0, 0.0]))
+    grid = SparseVoxelGrid(0.1)
+    grid.add_mesh(slab)
+    envelope = grid.envelope()
+
+    decimated = QuadricDecimator().decimate(envelope, target_faces=len(envelope.faces) // 20)
+
+    assert len(decimated.faces) <= len(envelope.faces) // 20
+    assert decimated.is_watertight and decimated.is_winding_consistent
+    assert decimated.volume == pytest.approx(envelope.volume, rel=0.01)
+    # Every decimated vertex stays within about one voxel of the staircase.
+    _, distance, _ = trimesh.proximity.closest_point(envelope, decimated.vertices)
+    assert distance.max() < 0.15
+
+
+def test_open_boundaries_are_kept_and_extractor_falls_back_to_numpy() -> None:
+    plane = trimesh.creation.box(extents=[4.0, 4.0, 1.0]).subdivide().subdivide()
+    plane = plane.submesh([np.flatnonzero(plane.face_normals[:, 2] > 0.5)], append=True)
+    boundary = np.unique(plane.edges_sorted[trimesh.grouping.group_rows(plane.edges_sorted, require_count=1)])
+
+    decimated = ShellExtractor(decimation_engine="numpy").decimate(plane, 2)
+
+    assert len(decimated.faces) < len(plane.faces)
+    assert len(decimated.vertices) == len(boundary)
+    with pytest.raises(ValueError, match="decimation_engine"):
+        ShellExtractor(decimation_engine="meshlab")
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import ifcopenshell
+import ifcopenshell.api
+import ifcopenshell.util.placement
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.filters.element_filter import ElementFilter, ElementIndex, filter_elements  # noqa: E402
+
+
+def _build_model() -> ifcopenshell.file:
+    model = ifcopenshell.api.run("project.create_file", version="IFC4")
+    project = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcProject", name="Test")
+    ifcopenshell.api.run("unit.assign_unit", model)
+    building = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuilding", name="B")
+    ifcopenshell.api.run("aggregate.assign_object", model, relating_object=project, products=[building])
+    wall_type = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcWallType", name="WT")
+    type_pset = ifcopenshell.api.run("pset.add_pset", model, product=wall_type, name="Pset_WallCommon")
+    ifcopenshell.api.run("pset.edit_pset", model, pset=type_pset, properties={"IsExternal": True, "FireRating": "EI60"})
+    zone = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcZone", name="North")
+
+    for level in range(2):
+        storey = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuildingStorey", name=f"L{level}")
+        ifcopenshell.api.run("aggregate.assign_object", model, relating_object=building, products=[storey])
+        space = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcSpace", name=f"R{level}")
+        ifcopenshell.api.run("aggregate.assign_object", model, relating_object=storey, products=[space])
+        if level == 0:
+            ifcopenshell.api.run("group.assign_group", model, group=zone, products=[space])
+        for index in range(3):
+            wall = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcWall", name=f"W{level}{index}")
+            ifcopenshell.api.run("type.assign_type", model, related_objects=[wall], relating_type=wall_type)
+            matrix = np.eye(4)
+            matrix[:3, 3] = [4.0 * index, 0.0, 3.0 * level]
+            ifcopenshell.api.run("geometry.edit_object_placement", model, product=wall, matrix=matrix)
+            container = space if index == 2 else storey
+            ifcopenshell.api.run("spatial.assign_container", model, relating_structure=container, products=[wall])
+            if index == 1:
+                # Occurrence values override the type's.
+                pset = ifcopenshell.api.run("pset.add_pset", model, product=wall, name="Pset_WallCommon")
+                ifcopenshell.api.run("pset.edit_pset", model, pset=pset, properties={"IsExternal": False})
+    return model
+
+
+def _names(elements: list) -> list[str]:
+    return sorted(element.Name for element in elements)
+
+
+def test_filter_by_storey_external_and_properties() -> None:
+    model = _build_model()
+    walls = model.by_type("IfcWall")
+    index = ElementIndex(model)
+
+    assert _names(filter_elements(walls, {"filters": {"storeys": ["L1"]}}, index)) == ["W10", "W11", "W12"]
+    assert _names(filter_elements(walls, {"filters": {"is_external": False}}, index)) == ["W01", "W11"]
+    rules = [{"pset": "Pset_WallCommon", "name": "FireRating", "values": ["EI60", "EI90"]}]
+    assert len(filter_elements(walls, {"filters": {"properties": rules}}, index)) == 6
+    assert index.property_value(walls[1], "FireRating") == "EI60"
+
+
+def test_filter_by_zone_and_bounding_box() -> None:
+    model = _build_model()
+    walls = model.by_type("IfcWall")
+    index = ElementIndex(model)
+
+    assert _names(filter_elements(walls, {"filters": {"zones": ["North"]}}, index)) == ["W02"]
+    box = {"bbox": {"min": [-1.0, -1.0, -1.0], "max": [5.0, 1.0, 1.0]}}
+    assert _names(filter_elements(walls, {"filters": box}, index)) == ["W00", "W01"]
+    for wall in walls:
+        expected = np.array(ifcopenshell.util.placement.get_local_placement(wall.ObjectPlacement))[:3, 3] / 1000.0
+        assert np.allclose(index.origin(wall), expected)
+
+
+def test_element_filter_rejects_unknown_keys() -> None:
+    assert ElementFilter.from_config({}).is_empty
+    with pytest.raises(ValueError, match="layer"):
+        ElementFilter.from_config({"filters": {"layer": "A"}})
+    with pytest.raises(ValueError):
+        ElementFilter.from_config({"filters": {"properties": [{"name": "IsExternal"}]}})
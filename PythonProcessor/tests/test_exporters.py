@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import stat
+import sys
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.exporters.glb_exporter import QUANTIZATION_EXTENSION, GLBExporter  # noqa: E402
+from bimto3dprint.exporters.obj_exporter import OBJExporter  # noqa: E402
+from bimto3dprint.exporters.stl_exporter import STL_RECORD, STLExporter  # noqa: E402
+from bimto3dprint.exporters.threemf_exporter import MODEL_PATH, REPORT_PATH, ThreeMFExporter  # noqa: E402
+from bimto3dprint.processors.provenance import FaceGroups, ProvenanceRecorder  # noqa: E402
+from bimto3dprint.processors.tessellator import ElementMesh  # noqa: E402
+
+
+def test_binary_stl_is_written_in_chunks(tmp_path: Path) -> None:
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    path = tmp_path / "model.stl"
+
+    STLExporter(chunk_faces=100).export(mesh, path, metadata={})
+
+    assert path.stat().st_size == 84 + 50 * len(mesh.faces)
+    records = np.fromfile(path, dtype=STL_RECORD, offset=84)
+    np.testing.assert_allclose(records["vertices"], mesh.triangles, atol=1e-6)
+    np.testing.assert_allclose(records["normal"], mesh.face_normals, atol=1e-6)
+    assert trimesh.load(path).is_watertight
+
+
+def test_ascii_stl_round_trips(tmp_path: Path) -> None:
+    mesh = trimesh.creation.box(extents=[1.0, 2.0, 3.0])
+    path = tmp_path / "model.stl"
+
+    STLExporter(ascii=True, chunk_faces=5).export(mesh, path, metadata={})
+
+    assert path.read_text(encoding="ascii").startswith("solid")
+    assert trimesh.load(path).volume == pytest.approx(6.0)
+
+
+def test_failed_export_keeps_previous_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "model.stl"
+    path.write_bytes(b"previous")
+
+    def fail(self: STLExporter, file, mesh: trimesh.Trimesh) -> None:
+        file.write(b"partial")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(STLExporter, "_write_binary", fail)
+    with pytest.raises(OSError, match="disk full"):
+        STLExporter().export(trimesh.creation.box(), path, metadata={})
+
+    assert path.read_bytes() == b"previous"
+    assert [item.name for item in tmp_path.iterdir()] == ["model.stl"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fchmod"), reason="POSIX permissions only")
+def test_export_keeps_permissions_of_a_normal_write(tmp_path: Path) -> None:
+    fresh, existing = tmp_path / "fresh.stl", tmp_path / "existing.stl"
+    existing.write_bytes(b"previous")
+    existing.chmod(0o640)
+    umask = os.umask(0o022)
+    try:
+        STLExporter().export(trimesh.creation.box(), fresh, metadata={})
+        STLExporter().export(trimesh.creation.box(), existing, metadata={})
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(fresh.stat().st_mode) == 0o644
+    assert stat.S_IMODE(existing.stat().st_mode) == 0o640
+
+
+def test_obj_writer_streams_groups(tmp_path: Path) -> None:
+    lower = trimesh.creation.box(extents=[2.0, 2.0, 1.0])
+    upper = trimesh.creation.box(extents=[2.0, 2.0, 1.0])
+    upper.apply_translation([0.0, 0.0, 3.0])
+    mesh = trimesh.util.concatenate([upper, lower])
+    labels = np.repeat([1, 0], len(lower.faces))
+    groups = FaceGroups(names=["Level 0", "Level 1"], labels=labels)
+    path = tmp_path / "model.obj"
+
+    OBJExporter(chunk_rows=7).export(mesh, path, metadata={"face_groups": groups})
+
+    text = path.read_text(encoding="utf-8")
+    assert text.count("\nv ") == text.count("\nvn ") == len(mesh.vertices)
+    assert [line for line in text.splitlines() if line.startswith("g ")] == ["g Level_0", "g Level_1"]
+    # trimesh renamed split_object to split_objects; pass both to cover trimesh 4.x and 5.x.
+    loaded = trimesh.load(
+        path, force="scene", process=False, group_material=False, split_object=True, split_objects=True
+    )
+    assert len(loaded.geometry) == 2
+    assert sorted(part.bounds[0][2] for part in loaded.geometry.values()) == pytest.approx([-0.5, 2.5])
+    assert sum(part.volume for part in loaded.geometry.values()) == pytest.approx(8.0)
+
+
+@pytest.mark.parametrize("embree", [True, False])
+def test_provenance_labels_faces_by_covered_element(embree: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(trimesh.ray, "has_embree", embree and trimesh.ray.has_embree)
+    recorder = ProvenanceRecorder("ifc_class", index=None)
+    parts = {"IfcSlab": [0.0, 0.0, 0.0], "IfcWall": [0.0, 0.0, 2.0]}
+    element_meshes = []
+    for number, (ifc_class, offset) in enumerate(parts.items()):
+        box = trimesh.creation.box(extents=[2.0, 2.0, 2.0])
+        box.apply_translation(offset)
+        element_meshes.append(ElementMesh(number, f"id{number}", ifc_class, box.vertices, box.faces))
+    assert len(list(recorder.track(element_meshes))) == 2
+
+    envelope = trimesh.creation.box(extents=[2.2, 2.2, 4.2]).subdivide()
+    envelope.apply_translation([0.0, 0.0, 1.0])
+    provenance = recorder.provenance()
+    provenance.apply_scale(10.0)
+    envelope.apply_scale(10.0)
+    groups = provenance.assign(envelope)
+
+    names = np.asarray(groups.names)[groups.labels]
+    heights = envelope.triangles_center[:, 2]
+    assert set(names[heights < 5.0]) == {"IfcSlab"} and set(names[heights > 15.0]) == {"IfcWall"}
+
+
+def test_3mf_package_keeps_one_closed_object_with_group_materials(tmp_path: Path) -> None:
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+    labels = (mesh.triangles_center[:, 2] > 0).astype(int)
+    groups = FaceGroups(names=["Level 1", "Level 0"], labels=labels)
+    path = tmp_path / "model.3mf"
+    metadata = {"face_groups": groups, "unit_scale_factor": 1000.0, "report": {"is_watertight": True}}
+
+    ThreeMFExporter().export(mesh, path, metadata=metadata)
+
+    with zipfile.ZipFile(path) as package:
+        model = package.read(MODEL_PATH).decode("utf-8")
+        assert json.loads(package.read(REPORT_PATH)) == {"is_watertight": True}
+    assert '<metadata name="b3p:unit_scale_factor">1000.0</metadata>' in model
+    assert model.count("<object ") == 1 and model.count("<base ") == 2
+    materials = [int(value) for value in re.findall(r'<triangle [^>]* p1="(\d+)"', model)]
+    np.testing.assert_array_equal(materials, labels)
+    loaded = trimesh.load(path, force="mesh")
+    assert loaded.is_watertight
+    assert loaded.volume == pytest.approx(mesh.volume, rel=1e-4)
+    assert path.stat().st_size < 84 + 50 * len(mesh.faces)
+
+
+def _glb_document(path: Path) -> dict:
+    data = path.read_bytes()
+    magic, version, length = np.frombuffer(data[:12], dtype="<u4")
+    assert (magic, version, length) == (0x46546C67, 2, len(data))
+    header_length = int(np.frombuffer(data[12:16], dtype="<u4")[0])
+    return json.loads(data[20 : 20 + header_length])
+
+
+def test_glb_uses_narrow_indices_and_optional_quantization(tmp_path: Path) -> None:
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+    groups = FaceGroups(names=["Level 1", "Level 0"], labels=(mesh.triangles_center[:, 2] > 0).astype(int))
+    full, compact = tmp_path / "model.glb", tmp_path / "model.preview.glb"
+
+    GLBExporter().export(mesh, full, metadata={"face_groups": groups, "unit_scale_factor": 1000.0})
+    GLBExporter.compact().export(mesh, compact, metadata={})
+
+    document = _glb_document(full)
+    assert document["scenes"][0]["extras"] == {"unit_scale_factor": 1000.0}
+    assert [accessor["componentType"] for accessor in document["accessors"][2:]] == [5123, 5123]
+    assert [node["name"] for node in document["nodes"]] == ["model", "Level 0", "Level 1"]
+    assert _glb_document(compact)["extensionsRequired"] == [QUANTIZATION_EXTENSION]
+    assert compact.stat().st_size < full.stat().st_size
+    for path, tolerance in ((full, 1e-6), (compact, 1e-4)):
+        scene = trimesh.load(path)
+        # glTF is in meters; the millimeter mesh is exported under a 0.001 scale.
+        assert scene.to_geometry().volume == pytest.approx(mesh.volume * 1e-9, rel=tolerance)
+    assert sorted(trimesh.load(full).geometry) == ["Level 0", "Level 1"]
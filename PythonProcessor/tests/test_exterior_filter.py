@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import ifcopenshell
+import ifcopenshell.api
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.filters.element_filter import ElementIndex  # noqa: E402
+from bimto3dprint.filters.exterior_filter import ExteriorFilter, element_bounds  # noqa: E402
+from bimto3dprint.processors.tessellator import Tessellator  # noqa: E402
+
+
+def _place(model: ifcopenshell.file, product: ifcopenshell.entity_instance, xyz: tuple, angle: float = 0.0) -> None:
+    matrix = np.eye(4)
+    matrix[:2, :2] = [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+    matrix[:3, 3] = xyz
+    ifcopenshell.api.run("geometry.edit_object_placement", model, product=product, matrix=matrix)
+
+
+def _build_closed_room() -> ifcopenshell.file:
+    """A 10 x 8 x 3 m room closed by four walls and two slabs, with a free-standing column inside."""
+    model = ifcopenshell.api.run("project.create_file", version="IFC4")
+    project = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcProject", name="Test")
+    ifcopenshell.api.run("unit.assign_unit", model)
+    context = ifcopenshell.api.run("context.add_context", model, context_type="Model")
+    body = ifcopenshell.api.run(
+        "context.add_context",
+        model,
+        context_type="Model",
+        context_identifier="Body",
+        target_view="MODEL_VIEW",
+        parent=context,
+    )
+    storey = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuildingStorey", name="L0")
+    ifcopenshell.api.run("aggregate.assign_object", model, relating_object=project, products=[storey])
+
+    def add(ifc_class: str, name: str, representation: ifcopenshell.entity_instance) -> ifcopenshell.entity_instance:
+        product = ifcopenshell.api.run("root.create_entity", model, ifc_class=ifc_class, name=name)
+        ifcopenshell.api.run("geometry.assign_representation", model, product=product, representation=representation)
+        ifcopenshell.api.run("spatial.assign_container", model, relating_structure=storey, products=[product])
+        return product
+
+    for index, (origin, angle, length) in enumerate(
+        [((0.0, 0.0), 0.0, 10.0), ((10.0, 0.0), 90.0, 8.0), ((10.0, 8.0), 180.0, 10.0), ((0.0, 8.0), 270.0, 8.0)]
+    ):
+        representation = ifcopenshell.api.run(
+            "geometry.add_wall_representation",
+            model,
+            context=body,
+            length=length,
+            height=3.0,
+            thickness=0.2,
+        )
+        wall = add("IfcWall", f"W{index}", representation)
+        _place(model, wall, (*origin, 0.0), np.radians(angle))
+
+    for index, z in enumerate((-0.2, 3.0)):
+        # Profile sizes are in project units (millimeters), extrusion depths in meters.
+        position = model.createIfcAxis2Placement2D(model.createIfcCartesianPoint((5000.0, 4000.0)))
+        profile = model.createIfcRectangleProfileDef("AREA", None, position, 10000.0, 8000.0)
+        representation = ifcopenshell.api.run(
+            "geometry.add_profile_representation",
+            model,
+            context=body,
+            profile=profile,
+            depth=0.2,
+        )
+        slab = add("IfcSlab", f"S{index}", representation)
+        _place(model, slab, (0.0, 0.0, z))
+
+    profile = model.createIfcRectangleProfileDef("AREA", None, None, 300.0, 300.0)
+    representation = ifcopenshell.api.run(
+        "geometry.add_profile_representation",
+        model,
+        context=body,
+        profile=profile,
+        depth=2.5,
+    )
+    column = add("IfcColumn", "C0", representation)
+    _place(model, column, (5.0, 4.0, 0.0), np.radians(30.0))
+    return model
+
+
+def test_element_bounds_match_tessellated_geometry() -> None:
+    model = _build_closed_room()
+    elements = model.by_type("IfcWall") + model.by_type("IfcSlab") + model.by_type("IfcColumn")
+    index = ElementIndex(model)
+
+    for element_mesh in Tessellator().tessellate(model, elements):
+        bounds = element_bounds(model.by_id(element_mesh.element_id), index)
+        expected = np.stack([element_mesh.vertices.min(axis=0), element_mesh.vertices.max(axis=0)])
+        assert np.allclose(bounds, expected, atol=1e-6)
+
+
+def test_exterior_filter_skips_enclosed_elements() -> None:
+    model = _build_closed_room()
+    elements = model.by_type("IfcWall") + model.by_type("IfcSlab") + model.by_type("IfcColumn")
+    index = ElementIndex(model)
+
+    kept = ExteriorFilter(cell_size=0.1).apply(elements, index)
+
+    assert sorted(element.Name for element in kept) == ["S0", "S1", "W0", "W1", "W2", "W3"]
+
+    pset = ifcopenshell.api.run("pset.add_pset", model, product=model.by_type("IfcColumn")[0], name="Pset_ColumnCommon")
+    ifcopenshell.api.run("pset.edit_pset", model, pset=pset, properties={"IsExternal": True})
+    assert len(ExteriorFilter(cell_size=0.1).apply(elements, ElementIndex(model))) == len(elements)
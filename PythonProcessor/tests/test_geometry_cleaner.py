@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.filters import geometry_cleaner  # noqa: E402
+from bimto3dprint.filters.geometry_cleaner import GeometryCleaner, find_self_intersections  # noqa: E402
+from bimto3dprint.processors.mesh_optimizer import MeshOptimizer  # noqa: E402
+
+
+def test_clean_repairs_seams_winding_and_holes() -> None:
+    sphere = trimesh.creation.icosphere(subdivisions=3)
+    faces = sphere.faces.copy()
+    faces[::7] = faces[::7, ::-1]
+    # Odd faces reference a duplicated vertex set that sits within the weld tolerance.
+    vertices = np.concatenate([sphere.vertices, sphere.vertices + 1e-9])
+    faces[1::2] += len(sphere.vertices)
+    broken = trimesh.Trimesh(vertices=vertices, faces=np.delete(faces, 5, axis=0), process=False)
+
+    cleaned, report = GeometryCleaner().clean(broken)
+
+    assert report.is_watertight
+    assert cleaned.is_winding_consistent
+    assert report.count("weld_vertices") == len(sphere.vertices)
+    assert report.count("fill_holes") == 1
+    assert cleaned.volume > 0
+    assert np.isclose(cleaned.volume, sphere.volume, rtol=1e-3)
+
+
+def test_clean_splits_solids_touching_at_an_edge() -> None:
+    first = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    second = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    second.apply_translation([1.0, 1.0, 0.0])
+    merged = trimesh.util.concatenate([first, second])
+
+    cleaned, report = GeometryCleaner().clean(merged)
+
+    assert report.count("split_non_manifold_edges") == 1
+    assert report.non_manifold_edges == 0
+    assert cleaned.is_volume
+    assert len(report.self_intersecting_faces) == 0
+
+
+def test_clean_separates_solids_sharing_a_face_with_different_triangulation() -> None:
+    first = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    second = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    # The shared faces use crossing diagonals, so they cannot cancel as duplicates.
+    second.apply_translation([1.0, 0.0, 0.0])
+    merged = trimesh.util.concatenate([first, second])
+
+    cleaned, report = GeometryCleaner().clean(merged)
+
+    assert report.count("split_non_manifold_edges") == 4
+    assert report.count("fill_holes") == 0
+    assert cleaned.is_volume
+    assert len(cleaned.split()) == 2
+    assert np.isclose(cleaned.volume, 2.0)
+
+
+def test_find_self_intersections_reports_overlapping_solids() -> None:
+    first = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    second = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    second.apply_translation([0.5, 0.3, 0.2])
+    overlapping = trimesh.util.concatenate([first, second])
+    sphere = trimesh.creation.icosphere(subdivisions=4)
+
+    hits = find_self_intersections(overlapping.vertices, overlapping.faces)
+
+    assert len(hits) > 0
+    assert np.any(hits < len(first.faces)) and np.any(hits >= len(first.faces))
+    assert len(find_self_intersections(sphere.vertices, sphere.faces)) == 0
+
+
+def test_ensure_watertight_skips_self_intersection_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(*_: object) -> np.ndarray:
+        raise AssertionError("repair must not search for self-intersections")
+
+    monkeypatch.setattr(geometry_cleaner, "find_self_intersections", fail)
+    sphere = trimesh.creation.icosphere(subdivisions=2)
+
+    repaired = MeshOptimizer().ensure_watertight(sphere)
+
+    assert repaired.is_watertight
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.pipeline import PipelineOptionsError, ProcessOptions, lod_path  # noqa: E402
+from bimto3dprint.processors.lod import LodPyramid, parse_lod_levels  # noqa: E402
+
+
+def _cluster(mesh: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+    """Vertex clustering stand-in for quadric decimation."""
+    pitch = np.sqrt(mesh.area / target_faces)
+    _, inverse = np.unique(np.round(mesh.vertices / pitch), axis=0, return_inverse=True)
+    faces = inverse.reshape(-1)[mesh.faces]
+    faces = faces[(faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])]
+    vertices = np.zeros((inverse.max() + 1, 3))
+    np.add.at(vertices, inverse.reshape(-1), mesh.vertices)
+    vertices /= np.bincount(inverse.reshape(-1))[:, None]
+    return trimesh.Trimesh(vertices, faces)
+
+
+def test_pyramid_decimates_each_level_from_the_previous_one() -> None:
+    mesh = trimesh.creation.icosphere(subdivisions=5, radius=100.0)
+    inputs = []
+
+    def decimate(current: trimesh.Trimesh, target_faces: int) -> trimesh.Trimesh:
+        inputs.append(len(current.faces))
+        return _cluster(current, target_faces)
+
+    levels = LodPyramid(decimate, samples=5000).build(mesh, parse_lod_levels("0.05,medium,0.2"))
+
+    assert [level.ratio for level in levels] == [0.5, 0.2, 0.05]
+    assert inputs == [len(mesh.faces), len(levels[0].mesh.faces), len(levels[1].mesh.faces)]
+    faces = [len(level.mesh.faces) for level in levels]
+    assert faces == sorted(faces, reverse=True) and faces[-1] < len(mesh.faces) * 0.2
+    errors = [level.hausdorff for level in levels]
+    assert errors == sorted(errors) and 0.0 < errors[0] < errors[-1] < 10.0
+    assert all(level.mean_deviation < level.hausdorff for level in levels)
+    assert levels[0].summary()["faces"] == faces[0]
+
+
+def test_lod_option_parsing_and_paths() -> None:
+    assert parse_lod_levels("low, high,0.25") == [0.75, 0.25]
+    with pytest.raises(ValueError, match="ultra"):
+        parse_lod_levels("ultra")
+    with pytest.raises(PipelineOptionsError, match="--lods"):
+        ProcessOptions(lods="1.5").validate()
+    assert lod_path(Path("out/model.stl"), 2) == Path("out/model.lod2.stl")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.utils.mesh_buffer import MeshBuffer  # noqa: E402
+
+
+def test_mesh_buffer_matches_concatenate() -> None:
+    parts = [trimesh.creation.box(extents=[1.0 + index, 1.0, 1.0]) for index in range(5)]
+    for index, part in enumerate(parts):
+        part.apply_translation([3.0 * index, 0.0, 0.0])
+
+    buffer = MeshBuffer(vertex_capacity=4, face_capacity=4)
+    for part in parts:
+        buffer.append(part.vertices, part.faces)
+
+    expected = trimesh.util.concatenate(parts)
+    np.testing.assert_allclose(buffer.vertices, expected.vertices)
+    np.testing.assert_array_equal(buffer.faces, expected.faces)
+    assert len(buffer.to_trimesh().faces) == len(expected.faces)
+
+
+def test_mesh_buffer_clear_keeps_allocation() -> None:
+    box = trimesh.creation.box()
+    buffer = MeshBuffer()
+    buffer.append(box.vertices, box.faces)
+    allocated = buffer.nbytes
+
+    buffer.clear()
+
+    assert buffer.face_count == 0
+    assert buffer.nbytes == allocated
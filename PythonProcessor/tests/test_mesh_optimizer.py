@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.mesh_optimizer import MeshOptimizer  # noqa: E402
+
+
+def _base_with_fin(fin_thickness: float) -> trimesh.Trimesh:
+    base = trimesh.creation.box(extents=[20.0, 20.0, 10.0])
+    base.apply_translation([0.0, 0.0, 5.0])
+    fin = trimesh.creation.box(extents=[fin_thickness, 10.0, 8.0])
+    fin.apply_translation([0.0, 0.0, 14.0])
+    return trimesh.util.concatenate([base, fin])
+
+
+def test_thicken_walls_grows_only_thin_parts() -> None:
+    thickened = MeshOptimizer().thicken_walls(_base_with_fin(0.5), min_thickness_mm=2.0)
+
+    assert thickened.is_watertight
+    fin_section = thickened.section(plane_origin=[0.0, 0.0, 14.0], plane_normal=[0.0, 0.0, 1.0])
+    assert fin_section.extents[0] >= 2.0
+    base_section = thickened.section(plane_origin=[0.0, 0.0, 5.0], plane_normal=[0.0, 0.0, 1.0])
+    # The thick base keeps its size up to the half-voxel rounding of the grid.
+    np.testing.assert_allclose(base_section.extents[:2], [20.0, 20.0], atol=0.6)
+
+
+def test_thicken_walls_remeshes_planar_regions_unless_disabled() -> None:
+    mesh = _base_with_fin(0.5)
+    raw = MeshOptimizer().thicken_walls(mesh, min_thickness_mm=2.0, voxel_pitch=0.25, planar_tolerance=None)
+    remeshed = MeshOptimizer().thicken_walls(mesh, min_thickness_mm=2.0, voxel_pitch=0.25)
+
+    assert len(remeshed.faces) * 10 < len(raw.faces)
+    assert remeshed.is_watertight
+    np.testing.assert_allclose(remeshed.volume, raw.volume, rtol=0.01)
+
+
+def test_thicken_walls_leaves_thick_mesh_unchanged() -> None:
+    mesh = _base_with_fin(4.0)
+    result = MeshOptimizer().thicken_walls(mesh, min_thickness_mm=2.0)
+
+    assert result is not mesh
+    np.testing.assert_array_equal(result.faces, mesh.faces)
+    np.testing.assert_allclose(result.vertices, mesh.vertices)
+
+
+def test_thicken_walls_caps_pitch_by_surface_budget() -> None:
+    mesh = trimesh.creation.box(extents=[30000.0, 30000.0, 30000.0])
+    pitch = MeshOptimizer()._thickening_pitch(mesh, 2.0, max_surface_voxels=1_000_000)
+    assert np.isclose(pitch, np.sqrt(mesh.area / 1_000_000))
+
+
+def test_thicken_walls_skips_when_budget_pitch_cannot_resolve_walls() -> None:
+    mesh = _base_with_fin(0.5)
+    result = MeshOptimizer().thicken_walls(mesh, min_thickness_mm=2.0, max_surface_voxels=100)
+
+    assert result is not mesh
+    np.testing.assert_array_equal(result.faces, mesh.faces)
+
+
+def test_validate_for_printing_accepts_deprecated_sample_count() -> None:
+    slab = trimesh.creation.box(extents=[10.0, 10.0, 2.0])
+
+    with pytest.warns(DeprecationWarning, match="sample_count"):
+        report = MeshOptimizer().validate_for_printing(slab, sample_count=250)
+
+    assert report["min_wall_thickness"] == pytest.approx(2.0)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.utils.topology import EdgeIndex  # noqa: E402
+from bimto3dprint.validators.mesh_validator import MeshValidator  # noqa: E402
+
+
+def _issues(report: dict) -> dict:
+    return {issue["type"]: issue for issue in report["issues"]}
+
+
+def test_validate_closed_mesh_matches_trimesh() -> None:
+    sphere = trimesh.creation.icosphere(subdivisions=3)
+
+    report = MeshValidator().validate(sphere)
+
+    assert report["valid"]
+    assert report["issues"] == []
+    assert report["is_watertight"] and report["is_winding_consistent"] and report["is_volume"]
+    assert np.isclose(report["volume"], sphere.volume)
+    assert report["shells"] == 1 and report["holes"] == 0
+
+
+def test_validate_reports_issue_locations() -> None:
+    sphere = trimesh.creation.icosphere(subdivisions=2)
+    faces = sphere.faces.copy()
+    faces[3] = faces[3, ::-1]
+    open_sphere = trimesh.Trimesh(sphere.vertices, np.delete(faces, [10, 30], axis=0), process=False)
+    box = trimesh.creation.box(extents=[1.0, 1.0, 1.0])
+    box.apply_translation([5.0, 0.0, 0.0])
+    mesh = trimesh.util.concatenate([open_sphere, box])
+
+    report = MeshValidator(max_locations=2).validate(mesh)
+    issues = _issues(report)
+
+    assert not report["valid"]
+    assert issues["boundary_edges"]["count"] == 6
+    assert issues["inconsistent_winding"]["count"] == 3
+    assert issues["holes"]["count"] == 2 and issues["holes"]["sizes"] == [3, 3]
+    assert issues["disconnected_shells"]["severity"] == "warning"
+    assert np.allclose(issues["disconnected_shells"]["locations"][1], [5.0, 0.0, 0.0])
+    assert len(issues["boundary_edges"]["locations"]) == 2
+
+
+def test_edge_index_finds_non_manifold_edges() -> None:
+    # Three triangles hinged on the edge (0, 1).
+    faces = np.array([[0, 1, 2], [1, 0, 3], [0, 1, 4]])
+
+    index = EdgeIndex.build(faces)
+
+    assert index.edges[index.non_manifold_edges()].tolist() == [[0, 1]]
+    assert len(index.boundary_edges()) == 6
+    assert len(np.unique(index.shells())) == 1
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+from shapely.geometry import Polygon
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.planar_remesh import remesh_planar_regions  # noqa: E402
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid  # noqa: E402
+from bimto3dprint.utils.topology import EdgeIndex  # noqa: E402
+
+
+def test_planar_remesh_flattens_voxel_envelope_exactly() -> None:
+    grid = SparseVoxelGrid(1.0)
+    grid.add_mesh(trimesh.creation.box(extents=[11.0, 24.0, 37.0]))
+    envelope = grid.envelope()
+
+    remeshed = remesh_planar_regions(envelope, max_distance=0.1)
+
+    assert len(remeshed.faces) < len(envelope.faces) // 20
+    assert remeshed.volume == pytest.approx(envelope.volume)
+    assert remeshed.is_watertight and remeshed.is_winding_consistent
+    assert remeshed.area_faces.min() > 0
+    _, distances, _ = trimesh.proximity.closest_point(envelope, remeshed.vertices)
+    assert distances.max() < 1e-9
+    with pytest.raises(ValueError, match="max_distance"):
+        remesh_planar_regions(envelope, max_distance=-1.0)
+
+
+def test_planar_remesh_merges_faces_within_tolerance_only() -> None:
+    box = trimesh.creation.box(extents=[4.0, 4.0, 4.0]).subdivide().subdivide()
+    top = np.flatnonzero(np.isclose(box.vertices[:, 2], 2.0) & (np.abs(box.vertices[:, :2]).max(axis=1) < 1.5))
+    box.vertices[top[0], 2] += 0.05
+
+    exact = remesh_planar_regions(box, max_distance=0.0)
+    merged = remesh_planar_regions(box, max_distance=0.1)
+
+    assert len(merged.faces) < len(exact.faces)
+    assert merged.is_watertight
+    assert merged.volume == pytest.approx(box.volume, rel=0.01)
+    assert np.abs(merged.vertices).max() <= 2.0 + 1e-9
+
+
+def test_planar_remesh_handles_region_touching_itself() -> None:
+    # The triangular hole touches the outer square at a corner, so both caps pass that vertex twice.
+    outline = Polygon([(0, 0), (4, 0), (4, 4), (0, 4)], [[(2, 3), (3, 2), (4, 4)]])
+    prism = trimesh.creation.extrude_polygon(outline, 1.0).subdivide().subdivide()
+    prism.merge_vertices()
+
+    remeshed = remesh_planar_regions(prism, max_distance=0.0)
+    before, after = EdgeIndex.build(prism.faces), EdgeIndex.build(remeshed.faces)
+
+    assert len(remeshed.faces) < len(prism.faces) // 5
+    assert remeshed.volume == pytest.approx(prism.volume)
+    assert remeshed.area_faces.min() > 0
+    assert len(after.boundary_edges()) == 0
+    assert len(after.non_manifold_edges()) == len(before.non_manifold_edges())
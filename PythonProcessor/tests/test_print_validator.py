@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.validators.print_validator import PrintSettings, PrintValidator  # noqa: E402
+
+
+def _box(extents: list[float], center: list[float]) -> trimesh.Trimesh:
+    box = trimesh.creation.box(extents=extents)
+    box.apply_translation(center)
+    return box
+
+
+def _issues(report: dict) -> dict:
+    return {issue["type"]: issue for issue in report["issues"]}
+
+
+def test_validate_reports_cantilever_and_floating_part() -> None:
+    post = _box([5.0, 5.0, 30.0], [0.0, 0.0, 15.0])
+    # The eave sticks out 22.5 mm from the post, beyond half of the 10 mm bridge limit.
+    eave = _box([30.0, 5.0, 2.0], [-10.0, 0.0, 29.0])
+    floating = _box([5.0, 5.0, 5.0], [20.0, 0.0, 20.0])
+    resting = _box([2.0, 2.0, 2.0], [0.0, 0.0, 31.0])
+    mesh = trimesh.util.concatenate([trimesh.boolean.union([post, eave]), floating, resting])
+
+    report = PrintValidator(PrintSettings(min_gap_mm=0.0)).validate(mesh)
+    issues = _issues(report)
+
+    assert not report["printable"]
+    assert issues["unsupported_spans"]["count"] == 2
+    assert issues["unsupported_spans"]["reach_mm"][0] == pytest.approx(22.5)
+    assert issues["floating_islands"]["count"] == 1
+    assert issues["floating_islands"]["locations"][0] == pytest.approx([20.0, 0.0, 20.0])
+    assert "overhangs" not in issues
+
+
+def test_validate_reports_thin_features_gaps_and_build_volume() -> None:
+    base = _box([60.0, 20.0, 2.0], [0.0, 0.0, 1.0])
+    fin = _box([0.4, 10.0, 8.0], [-20.0, 0.0, 6.0])
+    pair = [_box([5.0, 5.0, 10.0], [0.0, 0.0, 7.0]), _box([5.0, 5.0, 10.0], [5.2, 0.0, 7.0])]
+    mesh = trimesh.boolean.union([base, fin, *pair])
+
+    report = PrintValidator(PrintSettings(build_volume_mm=(50.0, 50.0, 50.0))).validate(mesh)
+    issues = _issues(report)
+
+    assert issues["thin_features"]["values_mm"][0] == pytest.approx(0.4)
+    assert issues["narrow_gaps"]["values_mm"][0] == pytest.approx(0.2)
+    assert issues["exceeds_build_volume"]["scale_to_fit"] == pytest.approx(50.0 / 60.0)
+    assert not report["printable"]
+
+
+def test_print_settings_from_config() -> None:
+    settings = PrintSettings.from_config({"printer": {"max_bridge_mm": 5, "build_volume_mm": None}})
+
+    assert settings.max_bridge_mm == 5
+    assert settings.build_volume_mm is None
+    with pytest.raises(ValueError, match="nozzle"):
+        PrintSettings.from_config({"printer": {"nozzle": 0.4}})
+    with pytest.raises(ValueError):
+        PrintSettings(max_overhang_deg=90.0)
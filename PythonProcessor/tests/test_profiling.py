@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.utils.profiling import StageProfiler  # noqa: E402
+
+
+def test_stage_profiler_records_mesh_sizes_and_dumps(tmp_path: Path) -> None:
+    profiler = StageProfiler(dump_prefix=tmp_path / "model")
+    mesh = trimesh.creation.box()
+
+    with profiler.stage("subdivide", mesh) as record:
+        mesh = mesh.subdivide()
+        record.output(mesh)
+    with pytest.raises(RuntimeError):
+        with profiler.stage("export", mesh):
+            raise RuntimeError("disk full")
+    profiler.write(tmp_path / "model.profile.json")
+
+    report = json.loads((tmp_path / "model.profile.json").read_text(encoding="utf-8"))
+    subdivide, export = report["stages"]
+    assert (subdivide["faces_in"], subdivide["faces_out"]) == (12, 48)
+    assert subdivide["wall_seconds"] >= 0.0
+    assert Path(subdivide["profile_path"]).exists()
+    assert export["error"] == "RuntimeError: disk full"
+    assert export["faces_out"] == 48
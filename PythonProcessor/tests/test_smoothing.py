@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.mesh_optimizer import MeshOptimizer  # noqa: E402
+from bimto3dprint.processors.planar_remesh import remesh_planar_regions  # noqa: E402
+from bimto3dprint.processors.smoothing import SurfaceSmoother, staircase_mask  # noqa: E402
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid  # noqa: E402
+
+SLOPE = np.radians(20.0)
+
+
+def _staircase() -> trimesh.Trimesh:
+    slab = trimesh.creation.box(extents=[12.0, 6.0, 1.0])
+    slab.apply_transform(trimesh.transformations.rotation_matrix(SLOPE, [0.0, 1.0, 0.0]))
+    grid = SparseVoxelGrid(0.1)
+    grid.add_mesh(slab)
+    return grid.envelope()
+
+
+def _top_roughness(mesh: trimesh.Trimesh) -> float:
+    normal = np.array([np.sin(SLOPE), 0.0, np.cos(SLOPE)])
+    heights = mesh.vertices @ normal
+    top = (heights > 0.2) & (np.abs(mesh.vertices[:, 0]) < 4.0) & (np.abs(mesh.vertices[:, 1]) < 2.0)
+    return float(heights[top].std())
+
+
+def test_taubin_smooths_staircase_in_place_without_shrinking() -> None:
+    envelope = _staircase()
+    roughness, volume = _top_roughness(envelope), envelope.volume
+
+    taubin = envelope.copy()
+    assert SurfaceSmoother(iterations=10).smooth(taubin) is taubin
+    laplacian = SurfaceSmoother(iterations=10, method="laplacian").smooth(envelope.copy())
+
+    assert _top_roughness(taubin) < 0.6 * roughness
+    assert taubin.volume == pytest.approx(volume, rel=0.002)
+    assert laplacian.volume < 0.99 * volume
+    with pytest.raises(ValueError, match="mu"):
+        SurfaceSmoother(mu=-0.4)
+
+
+def test_feature_edges_and_mask_pin_vertices() -> None:
+    box = trimesh.creation.box(extents=[4.0, 4.0, 4.0]).subdivide().subdivide()
+    pinned = SurfaceSmoother(iterations=5).smooth(box.copy())
+    rounded = SurfaceSmoother(iterations=5, feature_angle=None).smooth(box.copy())
+    np.testing.assert_allclose(pinned.vertices, box.vertices)
+    assert not np.allclose(rounded.vertices, box.vertices)
+
+    mask = np.zeros(len(box.vertices), dtype=bool)
+    mask[0] = True
+    masked = SurfaceSmoother(iterations=5, feature_angle=None).smooth(box.copy(), mask=mask)
+    assert np.count_nonzero(np.any(masked.vertices != box.vertices, axis=1)) <= 1
+
+
+def test_staircase_mask_keeps_remeshed_corners() -> None:
+    grid = SparseVoxelGrid(0.1)
+    grid.add_mesh(trimesh.creation.box(extents=[5.0, 6.0, 7.0]))
+    remeshed = remesh_planar_regions(grid.envelope(), max_distance=0.01)
+    bounds = remeshed.bounds.copy()
+
+    assert not staircase_mask(remeshed, 0.1).any()
+    MeshOptimizer().smooth_surface(remeshed, voxel_pitch=0.1)
+    np.testing.assert_allclose(remeshed.bounds, bounds)
+    assert staircase_mask(_staircase(), 0.1).all()
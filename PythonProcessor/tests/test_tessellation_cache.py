@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.tessellation_cache import TessellationCache  # noqa: E402
+
+
+def _box_arrays() -> tuple[np.ndarray, np.ndarray]:
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+    faces = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]], dtype=np.int64)
+    return vertices, faces
+
+
+def test_cache_roundtrip_counts_hits_and_misses(tmp_path: Path) -> None:
+    cache = TessellationCache(tmp_path)
+    vertices, faces = _box_arrays()
+
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, vertices, faces)
+    cached = cache.get("ab" * 32)
+
+    assert cached is not None
+    np.testing.assert_allclose(cached[0], vertices)
+    np.testing.assert_array_equal(cached[1], faces)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    vertices, faces = _box_arrays()
+    cache = TessellationCache(tmp_path)
+    keys = [f"{index:02d}" * 32 for index in range(3)]
+    for age, key in enumerate(keys):
+        cache.put(key, vertices, faces)
+        path = tmp_path / key[:2] / f"{key}.npz"
+        os.utime(path, (1000 + age, 1000 + age))
+
+    entry_size = (tmp_path / keys[0][:2] / f"{keys[0]}.npz").stat().st_size
+    small_cache = TessellationCache(tmp_path, max_size_mb=2.5 * entry_size / 1024 / 1024)
+    assert small_cache.evict() == 1
+    assert small_cache.get(keys[0]) is None
+    assert small_cache.get(keys[2]) is not None
+
+
+def test_overwriting_entry_does_not_grow_tracked_size(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    vertices, faces = _box_arrays()
+    TessellationCache(tmp_path).put("ab" * 32, vertices, faces)
+    entry_size = (tmp_path / "ab" / f"{'ab' * 32}.npz").stat().st_size
+    cache = TessellationCache(tmp_path, max_size_mb=1.5 * entry_size / 1024 / 1024)
+    evictions: list[int] = []
+    monkeypatch.setattr(TessellationCache, "evict", lambda self: evictions.append(1) or 0)
+
+    for _ in range(3):
+        cache.put("ab" * 32, vertices, faces)
+
+    assert evictions == []
+    assert cache._current_size() == entry_size
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import ifcopenshell
+import ifcopenshell.api
+import numpy as np
+from loguru import logger
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.tessellator import Tessellator  # noqa: E402
+
+
+def _build_model(wall_count: int, column_count: int = 0) -> ifcopenshell.file:
+    model = ifcopenshell.api.run("project.create_file", version="IFC4")
+    project = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcProject", name="Test")
+    ifcopenshell.api.run("unit.assign_unit", model)
+    context = ifcopenshell.api.run("context.add_context", model, context_type="Model")
+    body = ifcopenshell.api.run(
+        "context.add_context",
+        model,
+        context_type="Model",
+        context_identifier="Body",
+        target_view="MODEL_VIEW",
+        parent=context,
+    )
+    storey = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcBuildingStorey", name="L0")
+    ifcopenshell.api.run("aggregate.assign_object", model, relating_object=project, products=[storey])
+    for index in range(wall_count):
+        wall = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcWall", name=f"W{index}")
+        representation = ifcopenshell.api.run(
+            "geometry.add_wall_representation",
+            model,
+            context=body,
+            length=4.0 + index,
+            height=3.0,
+            thickness=0.2,
+        )
+        ifcopenshell.api.run("geometry.assign_representation", model, product=wall, representation=representation)
+        matrix = np.eye(4)
+        matrix[1, 3] = 2.0 * index
+        ifcopenshell.api.run("geometry.edit_object_placement", model, product=wall, matrix=matrix)
+        ifcopenshell.api.run("spatial.assign_container", model, relating_structure=storey, products=[wall])
+
+    if column_count:
+        column_type = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcColumnType", name="C")
+        profile = model.createIfcRectangleProfileDef("AREA", None, None, 0.3, 0.3)
+        representation = ifcopenshell.api.run(
+            "geometry.add_profile_representation",
+            model,
+            context=body,
+            profile=profile,
+            depth=3.0,
+        )
+        ifcopenshell.api.run(
+            "geometry.assign_representation",
+            model,
+            product=column_type,
+            representation=representation,
+        )
+    for index in range(column_count):
+        column = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcColumn", name=f"C{index}")
+        ifcopenshell.api.run("type.assign_type", model, related_objects=[column], relating_type=column_type)
+        angle = np.pi / 6 * index
+        matrix = np.eye(4)
+        matrix[:2, :2] = [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+        matrix[:3, 3] = [1.5 * index, -3.0, 0.0]
+        ifcopenshell.api.run("geometry.edit_object_placement", model, product=column, matrix=matrix)
+        ifcopenshell.api.run("spatial.assign_container", model, relating_structure=storey, products=[column])
+    return model
+
+
+def test_tessellate_preserves_element_order() -> None:
+    model = _build_model(6)
+    walls = list(reversed(model.by_type("IfcWall")))
+
+    meshes = Tessellator(threads=4).tessellate(model, walls)
+
+    assert [mesh.global_id for mesh in meshes] == [wall.GlobalId for wall in walls]
+    assert all(mesh.ifc_class == "IfcWall" for mesh in meshes)
+
+
+def test_tessellate_matches_sequential_result() -> None:
+    model = _build_model(4)
+    walls = model.by_type("IfcWall")
+
+    parallel = Tessellator(threads=4).tessellate(model, walls)
+    sequential = Tessellator(threads=1).tessellate(model, walls)
+
+    for left, right in zip(parallel, sequential):
+        np.testing.assert_allclose(left.vertices, right.vertices)
+        np.testing.assert_array_equal(left.faces, right.faces)
+
+
+def test_instanced_columns_match_individual_tessellation() -> None:
+    model = _build_model(1, column_count=5)
+    elements = model.by_type("IfcColumn") + model.by_type("IfcWall")
+
+    instanced = Tessellator(instancing=True).tessellate(model, elements)
+    individual = Tessellator(instancing=False).tessellate(model, elements)
+
+    assert [mesh.global_id for mesh in instanced] == [mesh.global_id for mesh in individual]
+    for left, right in zip(instanced, individual):
+        np.testing.assert_allclose(left.vertices, right.vertices, atol=1e-6)
+        np.testing.assert_array_equal(left.faces, right.faces)
+
+
+def test_failed_element_warning_includes_error() -> None:
+    model = _build_model(2)
+    broken = ifcopenshell.api.run("root.create_entity", model, ifc_class="IfcWall", name="Broken")
+    messages: list[str] = []
+    handler = logger.add(messages.append, level="WARNING", format="{message}")
+    try:
+        meshes = Tessellator(threads=2).tessellate(model, model.by_type("IfcWall"))
+    finally:
+        logger.remove(handler)
+
+    assert len(meshes) == 2
+    failures = [message for message in messages if broken.GlobalId in message]
+    assert len(failures) == 1 and failures[0].strip().split(": ", 1)[1]
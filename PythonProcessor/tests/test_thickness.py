@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.thickness import ThicknessAnalyzer, stratified_barycentric  # noqa: E402
+from bimto3dprint.utils.bvh import TriangleBVH, ray_triangle_distances  # noqa: E402
+
+
+def test_bvh_matches_brute_force_closest_hits() -> None:
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    inner = mesh.copy()
+    inner.apply_scale(0.4)
+    mesh = trimesh.util.concatenate([mesh, inner])
+    rng = np.random.default_rng(7)
+    origins = rng.uniform(-1.5, 1.5, size=(300, 3))
+    directions = rng.normal(size=(300, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+
+    distances, faces = TriangleBVH.build(mesh.triangles, leaf_size=4).intersect(origins, directions, batch_size=64)
+
+    pairs = np.repeat(np.arange(len(origins)), len(mesh.faces))
+    triangles = np.tile(mesh.triangles, (len(origins), 1, 1))
+    brute = ray_triangle_distances(origins[pairs], directions[pairs], triangles).reshape(len(origins), -1)
+    np.testing.assert_allclose(distances, brute.min(axis=1))
+    hit = np.isfinite(distances)
+    np.testing.assert_array_equal(faces[hit], brute.argmin(axis=1)[hit])
+    assert np.all(faces[~hit] == -1)
+
+
+def test_bvh_closest_matches_brute_force() -> None:
+    mesh = trimesh.util.concatenate(
+        [trimesh.creation.icosphere(subdivisions=3), trimesh.creation.box(extents=[4.0, 0.5, 0.5])]
+    )
+    points = np.random.default_rng(3).uniform(-3.0, 3.0, size=(200, 3))
+
+    distances, faces = TriangleBVH.build(mesh.triangles, leaf_size=4).closest(points, batch_size=64)
+
+    pairs = np.repeat(points, len(mesh.faces), axis=0)
+    closest = trimesh.triangles.closest_point(np.tile(mesh.triangles, (len(points), 1, 1)), pairs)
+    brute = np.linalg.norm(closest - pairs, axis=1).reshape(len(points), -1)
+    np.testing.assert_allclose(distances, brute.min(axis=1))
+    np.testing.assert_allclose(brute[np.arange(len(points)), faces], distances)
+
+
+def test_thickness_per_face_on_slab() -> None:
+    slab = trimesh.creation.box(extents=[10.0, 10.0, 2.0])
+    analysis = ThicknessAnalyzer(engine="numpy", samples_per_face=4).analyze(slab)
+
+    horizontal = np.abs(slab.face_normals[:, 2]) > 0.5
+    np.testing.assert_allclose(analysis.face_thickness[horizontal], 2.0)
+    np.testing.assert_allclose(analysis.face_thickness[~horizontal], 10.0)
+    assert analysis.minimum == pytest.approx(2.0)
+    # Top and bottom hold 200 of 280 area units, so low percentiles are the slab thickness.
+    assert analysis.percentiles((5.0, 90.0)) == {"p5": pytest.approx(2.0), "p90": pytest.approx(10.0)}
+    assert analysis.to_dict(min_thickness=2.5)["thin_faces"] == int(horizontal.sum())
+
+
+def test_thickness_engines_agree() -> None:
+    if not trimesh.ray.has_embree:
+        pytest.skip("Embree is not installed")
+    mesh = trimesh.creation.torus(major_radius=3.0, minor_radius=0.5)
+    numpy_result = ThicknessAnalyzer(engine="numpy").analyze(mesh)
+    embree_result = ThicknessAnalyzer(engine="embree").analyze(mesh)
+    np.testing.assert_allclose(numpy_result.face_thickness, embree_result.face_thickness, rtol=1e-4)
+
+
+def test_thickness_exports_heatmap_and_array(tmp_path: Path) -> None:
+    slab = trimesh.creation.box(extents=[10.0, 10.0, 1.0])
+    analysis = ThicknessAnalyzer(engine="numpy").analyze(slab)
+
+    analysis.save(tmp_path / "slab.thickness.npy")
+    analysis.export_ply(slab, tmp_path / "slab.thickness.ply", min_thickness=2.0)
+
+    np.testing.assert_allclose(np.load(tmp_path / "slab.thickness.npy"), analysis.face_thickness)
+    heatmap = trimesh.load(tmp_path / "slab.thickness.ply", process=False)
+    colors = heatmap.visual.face_colors
+    thin = analysis.face_thickness < 2.0
+    assert np.all(colors[thin, 0] > colors[thin, 1])
+    assert np.all(colors[~thin, 1] > colors[~thin, 0])
+
+
+def test_stratified_samples_cover_subtriangles() -> None:
+    weights = stratified_barycentric(16)
+    assert weights.shape == (16, 3)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    np.testing.assert_allclose(weights.mean(axis=0), 1.0 / 3.0)
+    with pytest.raises(ValueError):
+        ThicknessAnalyzer(samples_per_face=3)
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from bimto3dprint.processors.voxel_engine import SparseVoxelGrid  # noqa: E402
+
+
+def _slab_and_tower() -> tuple[trimesh.Trimesh, trimesh.Trimesh]:
+    slab = trimesh.creation.box(extents=[10.0, 6.0, 0.4])
+    tower = trimesh.creation.box(extents=[3.0, 3.0, 9.0])
+    tower.apply_translation([6.0, 2.0, 4.5])
+    return slab, tower
+
+
+def test_chunked_voxelization_matches_whole_mesh() -> None:
+    slab, tower = _slab_and_tower()
+    pitch = 0.5
+
+    chunked = SparseVoxelGrid(pitch, block_size=8)
+    chunked.add_mesh(slab)
+    chunked.add_mesh(tower)
+    whole = SparseVoxelGrid(pitch, block_size=8)
+    whole.add_mesh(trimesh.util.concatenate([slab, tower]))
+
+    np.testing.assert_array_equal(chunked.indices, whole.indices)
+
+
+def test_sparse_envelope_matches_dense_fill_and_is_block_independent() -> None:
+    slab, tower = _slab_and_tower()
+    mesh = trimesh.util.concatenate([slab, tower])
+    pitch = 0.25
+    dense = mesh.voxelized(pitch).fill().marching_cubes
+
+    envelopes = []
+    for block_size in (4, 32):
+        grid = SparseVoxelGrid(pitch, block_size=block_size)
+        grid.add_mesh(mesh)
+        envelopes.append(grid.envelope())
+
+    for envelope in envelopes:
+        assert envelope.is_watertight
+        assert np.isclose(envelope.volume, dense.volume * pitch**3)
+        # World coordinates: the envelope wraps the input bounds within one voxel.
+        np.testing.assert_allclose(envelope.bounds, mesh.bounds, atol=pitch)
+    assert len(envelopes[0].faces) == len(envelopes[1].faces)
+
+
+def test_sparse_envelope_keeps_open_courtyard_and_fills_closed_rooms() -> None:
+    walls = []
+    for extents, center in [
+        ((10.0, 0.4, 3.0), (0.0, -5.0, 1.5)),
+        ((10.0, 0.4, 3.0), (0.0, 5.0, 1.5)),
+        ((0.4, 10.0, 3.0), (-5.0, 0.0, 1.5)),
+        ((0.4, 10.0, 3.0), (5.0, 0.0, 1.5)),
+    ]:
+        wall = trimesh.creation.box(extents=extents)
+        wall.apply_translation(center)
+        walls.append(wall)
+    courtyard = trimesh.util.concatenate(walls)
+    roof = trimesh.creation.box(extents=(10.4, 10.4, 0.4))
+    roof.apply_translation((0.0, 0.0, 3.2))
+    floor = roof.copy()
+    floor.apply_translation((0.0, 0.0, -3.4))
+
+    open_grid = SparseVoxelGrid(0.25, block_size=8)
+    open_grid.add_mesh(courtyard)
+    closed_grid = SparseVoxelGrid(0.25, block_size=8)
+    closed_grid.add_mesh(trimesh.util.concatenate([courtyard, roof, floor]))
+
+    open_volume = open_grid.envelope().volume
+    closed_volume = closed_grid.envelope().volume
+    assert open_volume < 0.3 * 10.4 * 10.4 * 3.0
+    assert closed_volume > 10.0 * 10.0 * 3.0
+
+
+def _ring(size: float, height: float, z: float = 0.0) -> list[trimesh.Trimesh]:
+    walls = []
+    half = size / 2.0
+    for extents, center in [
+        ((size, 0.4, height), (0.0, -half, z + height / 2.0)),
+        ((size, 0.4, height), (0.0, half, z + height / 2.0)),
+        ((0.4, size, height), (-half, 0.0, z + height / 2.0)),
+        ((0.4, size, height), (half, 0.0, z + height / 2.0)),
+    ]:
+        wall = trimesh.creation.box(extents=extents)
+        wall.apply_translation(center)
+        walls.append(wall)
+    return walls
+
+
+def _slab(size: float, z: float) -> trimesh.Trimesh:
+    slab = trimesh.creation.box(extents=(size + 0.4, size + 0.4, 0.4))
+    slab.apply_translation((0.0, 0.0, z))
+    return slab
+
+
+def test_fill_courtyards_solidifies_space_enclosed_in_plan_only() -> None:
+    courtyard = trimesh.util.concatenate(_ring(10.0, 3.0))
+    u_shape = trimesh.util.concatenate(_ring(10.0, 3.0)[1:])
+
+    volumes = {}
+    for name, mesh in (("courtyard", courtyard), ("u_shape", u_shape)):
+        for fill in (False, True):
+            grid = SparseVoxelGrid(0.25, block_size=8)
+            grid.add_mesh(mesh)
+            envelope = grid.envelope(fill_courtyards=fill)
+            assert envelope.is_watertight
+            volumes[name, fill] = envelope.volume
+
+    assert volumes["courtyard", True] > 10.0 * 10.0 * 3.0
+    assert volumes["courtyard", False] < 0.3 * volumes["courtyard", True]
+    assert np.isclose(volumes["u_shape", True], volumes["u_shape", False])
+
+
+def test_min_void_volume_keeps_large_enclosed_voids_hollow() -> None:
+    # Closed 20 x 20 x 12 building containing a closed 8 x 8 x 8 atrium.
+    building = _ring(20.0, 12.0) + [_slab(20.0, 0.0), _slab(20.0, 12.0)]
+    atrium = _ring(8.0, 8.0, z=2.0) + [_slab(8.0, 2.0), _slab(8.0, 10.0)]
+    mesh = trimesh.util.concatenate(building + atrium)
+
+    volumes = {}
+    for block_size in (4, 32):
+        for min_void_volume in (None, 1000.0, 100.0):
+            grid = SparseVoxelGrid(0.25, block_size=block_size)
+            grid.add_mesh(mesh)
+            envelope = grid.envelope(min_void_volume=min_void_volume)
+            assert envelope.is_watertight
+            volumes[block_size, min_void_volume] = envelope.volume
+
+    for min_void_volume in (None, 1000.0, 100.0):
+        assert np.isclose(volumes[4, min_void_volume], volumes[32, min_void_volume])
+    solid, outer_void_kept, all_voids_kept = volumes[32, None], volumes[32, 1000.0], volumes[32, 100.0]
+    # Only the ~4000 m³ space around the atrium exceeds 1000 m³; the atrium stays solid.
+    assert 300.0 < outer_void_kept - all_voids_kept < 8.0**3
+    assert solid - outer_void_kept > 3000.0
+
+
+def test_thicken_is_block_independent_and_none_without_thin_parts() -> None:
+    base = trimesh.creation.box(extents=[8.0, 8.0, 4.0])
+    fin = trimesh.creation.box(extents=[0.5, 4.0, 3.0])
+    fin.apply_translation([0.0, 0.0, 3.5])
+
+    volumes = []
+    for block_size in (8, 32):
+        grid = SparseVoxelGrid(0.5, block_size=block_size)
+        grid.add_mesh(trimesh.util.concatenate([base, fin]))
+        thickened = grid.thicken(2.0)
+        assert thickened is not None and thickened.is_watertight
+        volumes.append(thickened.volume)
+        assert thickened.volume > grid.envelope().volume
+    assert np.isclose(volumes[0], volumes[1])
+
+    grid = SparseVoxelGrid(0.5, block_size=8)
+    grid.add_mesh(base)
+    assert grid.thicken(2.0) is None